@@ -0,0 +1,62 @@
+"""
+Compara dois relatórios do http_load (antes/depois) e aponta regressões.
+
+    python -m benchmarks.compare base.json novo.json --threshold 10
+"""
+
+import argparse
+import json
+import sys
+
+METRICS = ('p50', 'p90', 'p95', 'p99')
+
+
+def _load(path: str) -> dict:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(base: dict, new: dict, threshold: float) -> tuple[list, bool]:
+    """
+    Linhas (métrica, antes, depois, variação %) e se alguma latência
+    piorou mais que `threshold`% (ou a vazão caiu mais que isso).
+    """
+    rows, regressed = [], False
+    for metric in METRICS:
+        before = base['latency_ms'][metric]
+        after = new['latency_ms'][metric]
+        change = (after - before) / before * 100 if before else 0.0
+        regressed |= change > threshold
+        rows.append((f'{metric} (ms)', before, after, change))
+    change = (
+        (new['rps'] - base['rps']) / base['rps'] * 100 if base['rps'] else 0
+    )
+    regressed |= change < -threshold
+    rows.append(('rps', base['rps'], new['rps'], change))
+    return rows, regressed
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('base')
+    parser.add_argument('new')
+    parser.add_argument('--threshold', type=float, default=10)
+    args = parser.parse_args(argv)
+
+    base, new = _load(args.base), _load(args.new)
+    rows, regressed = compare(base, new, args.threshold)
+    sys.stdout.write(
+        f'{base["scenario"]}: {base["meta"]["git_commit"]} -> '
+        f'{new["meta"]["git_commit"]}\n'
+    )
+    for name, before, after, change in rows:
+        sys.stdout.write(
+            f'  {name:<10} {before:>10.2f} {after:>10.2f} {change:>+8.1f}%\n'
+        )
+    if regressed:
+        sys.stdout.write(f'Regressão acima de {args.threshold}%\n')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+import os
+from types import SimpleNamespace
+
+# Settings obrigatórias, antes de importar o smartsales
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+os.environ.setdefault('ALGORITHM', 'HS256')
+os.environ.setdefault('ACCESS_TOKEN_EXPIRE_MINUTES', '30')
+os.environ.setdefault('GROQ_API_KEY', '')
+os.environ.setdefault('SQL_STATS_ENABLED', 'false')
+
+import pytest  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from smartsales.models import table_registry  # noqa: E402
+from smartsales.models.auth import UserRole  # noqa: E402
+from smartsales.tools.datagen import SCALES, seed_database  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def bench_engine(tmp_path_factory):
+    """
+    Banco populado na escala BENCH_SCALE (padrão: small). Por padrão um
+    SQLite temporário; BENCH_DATABASE_URL aponta para um PostgreSQL
+    local descartável (as tabelas são recriadas).
+    """
+    url = os.environ.get('BENCH_DATABASE_URL') or (
+        f'sqlite:///{tmp_path_factory.mktemp("bench") / "bench.db"}'
+    )
+    engine = create_engine(url)
+    table_registry.metadata.drop_all(engine)
+    table_registry.metadata.create_all(engine)
+    scale = SCALES[os.environ.get('BENCH_SCALE', 'small')]
+    seed_database(engine, scale, password_hash='benchmark')
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(bench_engine):
+    with Session(bench_engine) as session:
+        yield session
+
+
+@pytest.fixture
+def admin():
+    return SimpleNamespace(id=1, role=UserRole.ADMIN)
+
+
+@pytest.fixture
+def user():
+    return SimpleNamespace(id=2, role=UserRole.USER)
@@ -0,0 +1,236 @@
+"""
+Gerador de carga HTTP (asyncio + httpx) com relatório em JSON.
+
+Sem --url, a aplicação roda no próprio processo (ASGITransport), sobre o
+banco de DATABASE_URL, e o LLM da busca é substituído por uma resposta
+fixa com latência simulada. Com --url, mede um servidor já em execução.
+
+    python -m benchmarks.http_load --scenario list-products \
+        --concurrency 20 --duration 30 --out benchmarks/results/a.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+import httpx
+
+PASSWORD = 'benchmark'
+SCENARIOS = (
+    'list-products', 'list-orders', 'get-product', 'create-order', 'search',
+)  # fmt: skip
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Percentil por interpolação linear (values já ordenados)."""
+    if not values:
+        return 0.0
+    rank = (len(values) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _request_factory(scenario: str, rng: random.Random, args):
+    """Devolve uma função que sorteia (método, caminho, corpo)."""
+
+    def list_products():
+        return 'GET', f'/api/products/?skip={rng.randint(0, 20) * 10}', None
+
+    def list_orders():
+        return 'GET', f'/api/orders/?skip={rng.randint(0, 20) * 10}', None
+
+    def get_product():
+        return 'GET', f'/api/products/{rng.randint(1, args.products)}', None
+
+    def create_order():
+        product_ids = rng.sample(range(1, args.products + 1), k=2)
+        return (
+            'POST',
+            '/api/orders/',
+            {
+                'client_id': rng.randint(1, args.clients),
+                'items': [
+                    {'product_id': pid, 'quantity': 1} for pid in product_ids
+                ],
+            },
+        )
+
+    def search():
+        return (
+            'GET',
+            f'/api/search/?q=produtos+da+secao+{rng.randint(1, 50)}',
+            None,
+        )
+
+    return {
+        'list-products': list_products,
+        'list-orders': list_orders,
+        'get-product': get_product,
+        'create-order': create_order,
+        'search': search,
+    }[scenario]
+
+
+async def _worker(client, next_request, deadline, warmup_until, samples):
+    while (now := time.perf_counter()) < deadline:
+        method, path, body = next_request()
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, path, json=body)
+            status = response.status_code
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        if now >= warmup_until:
+            samples.append((time.perf_counter() - started, status))
+
+
+def _in_process_app(llm_latency: float):
+    """App local com o LLM da busca substituído por um atraso fixo."""
+    from smartsales.controllers import search_controller  # noqa: PLC0415
+    from smartsales.core.app import app  # noqa: PLC0415
+
+    def fake_answer(q: str) -> str:
+        time.sleep(llm_latency)
+        return f'Resposta simulada para: {q}'
+
+    search_controller.answer_from_rules = fake_answer
+    return app
+
+
+def _prepare_stock(quantity: int = 1_000_000) -> None:
+    """Evita que create-order passe a medir apenas 'estoque insuficiente'."""
+    from sqlalchemy import update  # noqa: PLC0415
+    from sqlalchemy.orm import Session  # noqa: PLC0415
+
+    from smartsales.core.database import engine  # noqa: PLC0415
+    from smartsales.models.products import Product  # noqa: PLC0415
+
+    with Session(engine) as session:
+        session.execute(update(Product).values(stock=quantity))
+        session.commit()
+
+
+async def run(args) -> dict:
+    if args.url:
+        transport, base_url = None, args.url
+    else:
+        if args.scenario == 'create-order':
+            _prepare_stock()
+        transport = httpx.ASGITransport(app=_in_process_app(args.llm_latency))
+        base_url = 'http://bench'
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        transport=transport, base_url=base_url, limits=limits, timeout=30
+    ) as client:
+        login = await client.post(
+            '/api/token/login',
+            json={'email': args.email, 'password': PASSWORD},
+        )
+        login.raise_for_status()
+        client.headers['Authorization'] = (
+            f'Bearer {login.json()["access_token"]}'
+        )
+
+        samples: list[tuple[float, int | str]] = []
+        started = time.perf_counter()
+        warmup_until = started + args.warmup
+        deadline = warmup_until + args.duration
+        await asyncio.gather(
+            *(
+                _worker(
+                    client,
+                    _request_factory(args.scenario, random.Random(n), args),
+                    deadline,
+                    warmup_until,
+                    samples,
+                )
+                for n in range(args.concurrency)
+            )
+        )
+
+    latencies = sorted(latency * 1000 for latency, _ in samples)
+    return {
+        'scenario': args.scenario,
+        'concurrency': args.concurrency,
+        'duration_s': args.duration,
+        'warmup_s': args.warmup,
+        'requests': len(samples),
+        'rps': round(len(samples) / args.duration, 2),
+        'status_codes': dict(Counter(str(status) for _, status in samples)),
+        'latency_ms': {
+            'mean': round(statistics.fmean(latencies), 3) if latencies else 0,
+            **{
+                f'p{pct}': round(percentile(latencies, pct), 3)
+                for pct in (50, 90, 95, 99)
+            },
+            'max': round(latencies[-1], 3) if latencies else 0,
+        },
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'target': args.url or 'in-process',
+            # sem credenciais: apenas host/banco
+            'database': (
+                None
+                if args.url
+                else os.environ.get('DATABASE_URL', '').split('@')[-1]
+            ),
+            'scale': os.environ.get('BENCH_SCALE'),
+        },
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--scenario', choices=SCENARIOS, required=True)
+    parser.add_argument('--url', help='servidor alvo (padrão: in-process)')
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--warmup', type=float, default=3)
+    parser.add_argument('--email', default='user1@example.com')
+    parser.add_argument('--products', type=int, default=100)
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument(
+        '--llm-latency',
+        type=float,
+        default=0.3,
+        help='atraso (s) do LLM simulado no modo in-process',
+    )
+    parser.add_argument('--out', help='arquivo JSON do relatório')
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or '.', exist_ok=True)
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    sys.stdout.write(output + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Micro-benchmarks dos serviços e serializadores (pytest-benchmark).
+
+    pytest benchmarks --benchmark-json=benchmarks/results/services.json
+"""
+
+from datetime import datetime
+
+import pytest
+from jwt import decode
+from sqlalchemy import select
+
+from smartsales.core.security import create_access_token, settings
+from smartsales.models.orders import Order
+from smartsales.models.products import Product
+from smartsales.schemas.orders_schema import OrderResponse
+from smartsales.schemas.products_schema import ProductResponse
+from smartsales.services.orders_service import list_orders_service
+from smartsales.services.products_service import (
+    get_product_view_service,
+    get_products_service,
+)
+from smartsales.services.reports_service import (
+    revenue_over_time_service,
+    top_clients_service,
+)
+from smartsales.utils.result_summary import compact_result
+
+pytestmark = pytest.mark.benchmark(group='services')
+
+
+def test_listar_produtos(benchmark, db, user):
+    _, items = benchmark(get_products_service, db, user, 0, 50)
+    assert len(items) <= 50  # noqa: PLR2004
+
+
+def test_listar_pedidos(benchmark, db, user):
+    benchmark(list_orders_service, db, user, 0, 50)
+
+
+def test_produto_por_id_com_cache(benchmark, db, admin):
+    data = benchmark(get_product_view_service, db, 1, admin)
+    assert data['id'] == 1
+
+
+def test_receita_por_dia_via_agregados(benchmark, db, admin):
+    benchmark(revenue_over_time_service, db, admin, 'day')
+
+
+def test_top_clientes_via_pedidos(benchmark, db, admin):
+    benchmark(top_clients_service, db, admin, 10)
+
+
+@pytest.mark.benchmark(group='serializers')
+def test_serializar_produtos(benchmark, db):
+    products = db.scalars(select(Product).limit(100)).all()
+    benchmark(lambda: [ProductResponse.model_validate(p) for p in products])
+
+
+@pytest.mark.benchmark(group='serializers')
+def test_serializar_pedidos(benchmark, db):
+    orders = db.scalars(select(Order).limit(100)).unique().all()
+    benchmark(lambda: [OrderResponse.model_validate(o) for o in orders])
+
+
+@pytest.mark.benchmark(group='serializers')
+def test_resumo_de_resultado_para_llm(benchmark):
+    columns = ['section', 'title', 'total', 'created_at']
+    rows = [
+        (f'Secao {i % 7}', f'Produto {i}', i * 1.5, datetime(2025, 1, 1))
+        for i in range(1_000)
+    ]
+    benchmark(compact_result, columns, rows, False, 2000, 5, 5)
+
+
+@pytest.mark.benchmark(group='auth')
+def test_jwt_emitir_e_validar(benchmark):
+    def roundtrip():
+        token = create_access_token({'sub': 'user1@example.com'})
+        return decode(
+            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
+        )
+
+    assert benchmark(roundtrip)['sub'] == 'user1@example.com'
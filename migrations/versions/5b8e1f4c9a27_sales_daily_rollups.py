@@ -0,0 +1,89 @@
+"""sales daily rollups
+
+Revision ID: 5b8e1f4c9a27
+Revises: d7ba4d32892b
+Create Date: 2025-06-20 14:05:52.118304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e1f4c9a27'
+down_revision: Union[str, None] = 'd7ba4d32892b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sales_daily',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('orders', sa.Integer(), nullable=False),
+    sa.Column('items', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.DECIMAL(precision=14, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['auth.id'], ),
+    sa.PrimaryKeyConstraint('day', 'owner_id')
+    )
+    op.create_table('product_sales_daily',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.DECIMAL(precision=14, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['auth.id'], ),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('day', 'owner_id', 'product_id')
+    )
+    op.create_table('section_sales_daily',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('section', sa.String(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.DECIMAL(precision=14, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['auth.id'], ),
+    sa.PrimaryKeyConstraint('day', 'owner_id', 'section')
+    )
+
+    # carga inicial a partir dos pedidos existentes (sem os cancelados)
+    op.execute(
+        "INSERT INTO sales_daily (day, owner_id, orders, items, revenue) "
+        "SELECT date(o.created_at), o.owner_id, count(o.id), "
+        "coalesce(sum(i.item_count), 0), sum(o.total_value) "
+        "FROM orders o LEFT JOIN ("
+        "  SELECT order_id, sum(quantity) AS item_count "
+        "  FROM order_items GROUP BY order_id"
+        ") i ON i.order_id = o.id "
+        "WHERE o.status != 'canceled' "
+        "GROUP BY date(o.created_at), o.owner_id"
+    )
+    op.execute(
+        "INSERT INTO product_sales_daily "
+        "(day, owner_id, product_id, quantity, revenue) "
+        "SELECT date(o.created_at), o.owner_id, oi.product_id, "
+        "sum(oi.quantity), sum(oi.total_price) "
+        "FROM order_items oi JOIN orders o ON o.id = oi.order_id "
+        "WHERE o.status != 'canceled' "
+        "GROUP BY date(o.created_at), o.owner_id, oi.product_id"
+    )
+    op.execute(
+        "INSERT INTO section_sales_daily "
+        "(day, owner_id, section, quantity, revenue) "
+        "SELECT date(o.created_at), o.owner_id, p.section, "
+        "sum(oi.quantity), sum(oi.total_price) "
+        "FROM order_items oi JOIN orders o ON o.id = oi.order_id "
+        "JOIN products p ON p.id = oi.product_id "
+        "WHERE o.status != 'canceled' "
+        "GROUP BY date(o.created_at), o.owner_id, p.section"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('section_sales_daily')
+    op.drop_table('product_sales_daily')
+    op.drop_table('sales_daily')
@@ -0,0 +1,37 @@
+"""search history indexes, latency and cache columns
+
+Revision ID: c3215d022856
+Revises: 0d7192680dfb
+Create Date: 2025-06-16 10:12:41.381920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3215d022856'
+down_revision: Union[str, None] = '0d7192680dfb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('searches', sa.Column('latency_ms', sa.Integer(), nullable=True))
+    op.add_column('searches', sa.Column('cached', sa.Boolean(), server_default=sa.false(), nullable=False))
+    op.create_index('ix_searches_owner_id_created_at', 'searches', ['owner_id', 'created_at'], unique=False)
+    op.execute(
+        "CREATE INDEX ix_searches_fts ON searches "
+        "USING gin (to_tsvector('portuguese', query || ' ' || response))"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_searches_fts', table_name='searches')
+    op.drop_index('ix_searches_owner_id_created_at', table_name='searches')
+    op.drop_column('searches', 'cached')
+    op.drop_column('searches', 'latency_ms')
@@ -0,0 +1,36 @@
+"""order item section
+
+Revision ID: f1c4a8e2d936
+Revises: e5b1d9f3a720
+Create Date: 2025-06-30 09:12:40.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c4a8e2d936'
+down_revision: Union[str, None] = 'e5b1d9f3a720'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('order_items', sa.Column('section', sa.String(), nullable=True))
+    # itens existentes: a melhor informação disponível é a seção atual
+    op.execute(
+        "UPDATE order_items SET section = ("
+        "  SELECT p.section FROM products p WHERE p.id = order_items.product_id"
+        ")"
+    )
+    with op.batch_alter_table('order_items') as batch_op:
+        batch_op.alter_column('section', existing_type=sa.String(), nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('order_items', 'section')
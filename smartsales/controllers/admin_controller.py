@@ -0,0 +1,87 @@
+import asyncio
+from datetime import datetime
+from http import HTTPStatus
+from typing import Literal
+
+from fastapi import Depends, HTTPException, Query
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+from smartsales.core.profiler import (
+    ProfilerBusyError,
+    SamplingProfiler,
+    profile_store,
+)
+from smartsales.core.security import get_current_admin
+from smartsales.core.settings import Settings
+
+settings = Settings()
+
+
+def _ensure_enabled() -> None:
+    if not settings.PROFILING_ENABLED:
+        raise HTTPException(HTTPStatus.NOT_FOUND, 'Profiling is disabled')
+
+
+async def profile_process(
+    seconds: float = Query(10, gt=0),
+    format: Literal['speedscope', 'collapsed'] = 'speedscope',
+    current_user=Depends(get_current_admin),
+):
+    """
+    Amostra o processo (este worker) por `seconds` segundos, sem
+    bloquear o event loop, e devolve o perfil para download: JSON do
+    speedscope (https://www.speedscope.app) ou pilhas colapsadas para
+    flamegraph.pl.
+    """
+    _ensure_enabled()
+    if seconds > settings.PROFILING_MAX_SECONDS:
+        raise HTTPException(
+            HTTPStatus.BAD_REQUEST,
+            f'seconds must be <= {settings.PROFILING_MAX_SECONDS}',
+        )
+    try:
+        profiler = SamplingProfiler(settings.PROFILING_INTERVAL_MS / 1000)
+        profiler.start()
+    except ProfilerBusyError as e:
+        raise HTTPException(HTTPStatus.CONFLICT, str(e))
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profiler.stop()
+
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    if format == 'collapsed':
+        return PlainTextResponse(
+            profiler.collapsed(),
+            headers={
+                'Content-Disposition': (
+                    f'attachment; filename="profile-{stamp}.txt"'
+                )
+            },
+        )
+    return JSONResponse(
+        profiler.speedscope(f'smartsales {stamp}'),
+        headers={
+            'Content-Disposition': (
+                f'attachment; filename="profile-{stamp}.speedscope.json"'
+            )
+        },
+    )
+
+
+async def get_request_profile(
+    profile_id: str, current_user=Depends(get_current_admin)
+):
+    """Perfil de uma requisição feita com `X-Profile: 1`."""
+    _ensure_enabled()
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(HTTPStatus.NOT_FOUND, 'Profile not found')
+    return JSONResponse(
+        profile,
+        headers={
+            'Content-Disposition': (
+                f'attachment; filename="{profile_id}.speedscope.json"'
+            )
+        },
+    )
@@ -0,0 +1,19 @@
+from typing import Optional
+
+from fastapi import Depends, Query
+from sqlalchemy.orm import Session
+
+from smartsales.core.database import get_session
+from smartsales.core.security import get_current_user
+from smartsales.schemas.alerts_schema import AlertsResponse
+from smartsales.services.alerts_service import alerts_service
+
+
+async def list_alerts(
+    threshold: Optional[int] = Query(None, ge=0),
+    days: Optional[int] = Query(None, ge=0, le=365),
+    db: Session = Depends(get_session),
+    current_user=Depends(get_current_user),
+) -> AlertsResponse:
+    data = alerts_service(db, current_user, threshold, days)
+    return AlertsResponse(**data)
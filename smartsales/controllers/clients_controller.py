@@ -1,10 +1,16 @@
 from typing import Optional
 
-from fastapi import Depends
+from fastapi import Depends, Request, Response
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
 from smartsales.core.database import get_session
+from smartsales.core.http_cache import (
+    etag_matches,
+    not_modified,
+    set_etag,
+    weak_etag,
+)
 from smartsales.core.security import get_current_user
 from smartsales.schemas.clients_schema import (
     ClientCreate,
@@ -17,6 +23,7 @@ from smartsales.services.clients_service import (
     delete_client_service,
     get_client_service,
     get_clients_service,
+    get_clients_version_service,
     update_client_service,
 )
 
@@ -24,6 +31,8 @@ router_auth = OAuth2PasswordBearer(tokenUrl='/token/login')
 
 
 async def list_clients(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 10,
     name: Optional[str] = None,
@@ -31,18 +40,32 @@ async def list_clients(
     db: Session = Depends(get_session),
     current_user=Depends(get_current_user),
 ) -> ClientListResponse:
+    version = get_clients_version_service(db, current_user, name, email)
+    etag = weak_etag(
+        'clients', current_user.id, skip, limit, name, email, *version
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
     total, items = get_clients_service(
         db, current_user, skip, limit, name, email
     )
+    set_etag(response, etag)
     return ClientListResponse(total=total, items=items)
 
 
 async def retrieve_client(
     id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_session),
     current_user=Depends(get_current_user),
 ) -> ClientResponse:
     client = get_client_service(db, id, current_user)
+    etag = weak_etag('client', client.id, client.updated_at)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return ClientResponse.from_orm(client)
 
 
@@ -0,0 +1,33 @@
+from typing import Literal, Optional
+
+from fastapi import Depends, Query
+from sqlalchemy.orm import Session
+
+from smartsales.core.database import get_session
+from smartsales.core.security import get_current_user
+from smartsales.schemas.events_schema import EventFeedResponse, EventResponse
+from smartsales.services.outbox_service import list_events_service
+
+
+async def list_events(
+    since: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    aggregate: Optional[Literal['order', 'product']] = None,
+    db: Session = Depends(get_session),
+    current_user=Depends(get_current_user),
+) -> EventFeedResponse:
+    """
+    Feed de mudanças a partir do cursor `since` (id do último evento
+    recebido). Lista vazia: nada novo; repetir depois com o mesmo cursor.
+    """
+    eventos = list_events_service(
+        db=db,
+        current_user=current_user,
+        since=since,
+        limit=limit,
+        aggregate=aggregate,
+    )
+    return EventFeedResponse(
+        events=[EventResponse.from_orm(e) for e in eventos],
+        next_cursor=eventos[-1].id if eventos else since,
+    )
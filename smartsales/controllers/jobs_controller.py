@@ -0,0 +1,16 @@
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
+from smartsales.core.database import get_session
+from smartsales.core.security import get_current_user
+from smartsales.schemas.jobs_schema import JobResponse
+from smartsales.services.jobs_service import get_job_service
+
+
+async def retrieve_job(
+    job_id: int,
+    db: Session = Depends(get_session),
+    current_user=Depends(get_current_user),
+) -> JobResponse:
+    job = get_job_service(db, job_id, current_user)
+    return JobResponse.from_orm(job)
@@ -1,28 +1,51 @@
 from datetime import datetime
+from http import HTTPStatus
 from typing import List, Optional
 
-from fastapi import Depends
+from fastapi import Depends, Header, HTTPException, Request, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from smartsales.core.database import get_session
+from smartsales.core.http_cache import (
+    etag_matches,
+    not_modified,
+    require_if_match,
+    set_etag,
+    version_etag,
+    weak_etag,
+)
 from smartsales.core.security import get_current_user
 from smartsales.schemas.orders_schema import (
     OrderCreate,
     OrderListItem,
     OrderListResponse,
     OrderResponse,
+    OrderStatusBulkResult,
+    OrderStatusBulkUpdate,
     OrderUpdate,
 )
+from smartsales.services.idempotency_service import (
+    find_idempotency_key,
+    new_idempotency_key,
+    request_fingerprint,
+    save_idempotent_response,
+)
 from smartsales.services.orders_service import (
+    bulk_transition_status_service,
     create_order_service,
     delete_order_service,
     get_order_service,
     list_orders_service,
+    list_orders_version_service,
     update_order_service,
 )
 
 
-async def list_orders(
+async def list_orders(  # noqa: PLR0913, PLR0917
+    request: Request,
+    response: Response,
     limit: int = 10,
     client_id: Optional[int] = None,
     id_order: Optional[int] = None,
@@ -38,6 +61,23 @@ async def list_orders(
     Internamente, passamos skip=0 e deixamos
     status/date_from/date_to/section como None.
     """
+    version = list_orders_version_service(
+        db=db,
+        current_user=current_user,
+        client_id=client_id,
+        status=status,
+        since=since,
+        until=until,
+        section=section,
+        id_order=id_order,
+    )
+    etag = weak_etag(
+        'orders', current_user.id, limit, client_id, id_order,
+        status, since, until, section, *version,
+    )  # fmt: skip
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
     total, pedidos = list_orders_service(
         db=db,
         current_user=current_user,
@@ -52,50 +92,134 @@ async def list_orders(
     )
 
     items: List[OrderListItem] = [OrderListItem.from_orm(o) for o in pedidos]
+    set_etag(response, etag)
     return OrderListResponse(total=total, items=items)
 
 
 async def retrieve_order(
     order_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_session),
     current_user=Depends(get_current_user),
 ) -> OrderResponse:
     pedido = get_order_service(
         db=db, order_id=order_id, current_user=current_user
     )
+    etag = version_etag(pedido.version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     return OrderResponse.from_orm(pedido)
 
 
+def _replay_order(db: Session, record, current_user) -> JSONResponse:
+    body, status_code = record.response, record.status_code
+    if body is None:
+        # pedido gravado, mas a resposta não chegou a ser guardada
+        if record.order_id is None:
+            raise HTTPException(
+                HTTPStatus.CONFLICT,
+                detail='Requisição com esta Idempotency-Key sem resposta.',
+            )
+        pedido = get_order_service(
+            db=db, order_id=record.order_id, current_user=current_user
+        )
+        body = OrderResponse.from_orm(pedido).model_dump(mode='json')
+        status_code = HTTPStatus.CREATED
+    return JSONResponse(
+        body, status_code=status_code, headers={'Idempotent-Replayed': 'true'}
+    )
+
+
 async def create_order(
     payload: OrderCreate,
+    request: Request,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
     db: Session = Depends(get_session),
     current_user=Depends(get_current_user),
 ) -> OrderResponse:
-    novo = create_order_service(db=db, data=payload, current_user=current_user)
-    return OrderResponse.from_orm(novo)
+    if idempotency_key is None:
+        novo = create_order_service(
+            db=db, data=payload, current_user=current_user
+        )
+        return OrderResponse.from_orm(novo)
+
+    # retentativa com a mesma Idempotency-Key: devolve a resposta
+    # guardada em vez de criar (e baixar estoque) de novo
+    fingerprint = request_fingerprint(
+        request.method, request.url.path, payload
+    )
+    record = find_idempotency_key(
+        db, current_user, idempotency_key, fingerprint
+    )
+    if record is not None:
+        return _replay_order(db, record, current_user)
+
+    record = new_idempotency_key(current_user, idempotency_key, fingerprint)
+    try:
+        novo = create_order_service(
+            db=db, data=payload, current_user=current_user, idempotency=record
+        )
+    except IntegrityError:
+        # requisição concorrente com a mesma chave gravou antes
+        db.rollback()
+        record = find_idempotency_key(
+            db, current_user, idempotency_key, fingerprint
+        )
+        if record is None:
+            raise
+        return _replay_order(db, record, current_user)
+
+    body = OrderResponse.from_orm(novo)
+    save_idempotent_response(
+        db, record, HTTPStatus.CREATED, body.model_dump(mode='json')
+    )
+    return body
 
 
 async def update_order(
     order_id: int,
     payload: OrderUpdate,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_session),
     current_user=Depends(get_current_user),
 ) -> OrderResponse:
     pedido = get_order_service(
         db=db, order_id=order_id, current_user=current_user
     )
+    # If-Match com a versão lida pelo cliente (412 se já mudou)
+    require_if_match(request, version_etag(pedido.version))
     atualizado = update_order_service(
         db=db, order_obj=pedido, data=payload, current_user=current_user
     )
+    response.headers['etag'] = version_etag(atualizado.version)
     return OrderResponse.from_orm(atualizado)
 
 
 async def delete_order(
     order_id: int,
+    request: Request,
     db: Session = Depends(get_session),
     current_user=Depends(get_current_user),
 ) -> None:
     pedido = get_order_service(
         db=db, order_id=order_id, current_user=current_user
     )
+    require_if_match(request, version_etag(pedido.version))
     delete_order_service(db=db, order_obj=pedido, current_user=current_user)
+
+
+async def bulk_transition_status(
+    payload: OrderStatusBulkUpdate,
+    db: Session = Depends(get_session),
+    current_user=Depends(get_current_user),
+) -> OrderStatusBulkResult:
+    atualizados, falhas = bulk_transition_status_service(
+        db=db,
+        ids=payload.ids,
+        status=payload.status,
+        current_user=current_user,
+    )
+    return OrderStatusBulkResult(updated=atualizados, failed=falhas)
@@ -1,26 +1,60 @@
 from typing import List, Optional
 
-from fastapi import Depends, File, UploadFile
+from fastapi import (
+    Depends,
+    File,
+    Request,
+    Response,
+    UploadFile,
+)
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from smartsales.core.database import get_session
+from smartsales.core.http_cache import (
+    etag_matches,
+    not_modified,
+    require_if_match,
+    set_etag,
+    version_etag,
+    weak_etag,
+)
 from smartsales.core.security import get_current_user
 from smartsales.schemas.products_schema import (
+    ImageConfirmRequest,
+    ImageUploadRequest,
+    PresignedUploadResponse,
     ProductCreate,
     ProductListResponse,
     ProductResponse,
     ProductUpdate,
 )
+from smartsales.services.images_service import (
+    confirm_image_upload,
+    presign_image_upload,
+    save_images,
+)
 from smartsales.services.products_service import (
+    add_product_image_service,
     create_product_service,
     delete_product_service,
     get_product_service,
+    get_product_view_service,
     get_products_service,
+    get_products_version_service,
     update_product_service,
 )
 
 
+def _product_response(p, job) -> ProductResponse:
+    data = ProductResponse.from_orm(p)
+    data.variants_job_id = job.id if job else None
+    return data
+
+
 async def list_products(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 10,
     section: Optional[str] = None,
@@ -30,19 +64,38 @@ async def list_products(
     db: Session = Depends(get_session),
     current_user=Depends(get_current_user),
 ) -> ProductListResponse:
+    # ETag da página: filtros + (total, maior updated_at, soma das
+    # versões) em uma consulta
+    version = get_products_version_service(
+        db, current_user, section, price_min, price_max, available
+    )
+    etag = weak_etag(
+        'products', current_user.id, skip, limit,
+        section, price_min, price_max, available, *version,
+    )  # fmt: skip
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
     total, items = get_products_service(
         db, current_user, skip, limit, section, price_min, price_max, available
     )
+    set_etag(response, etag)
     return ProductListResponse(total=total, items=items)
 
 
 async def retrieve_product(
     product_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_session),
     current_user=Depends(get_current_user),
 ) -> ProductResponse:
-    p = get_product_service(db, product_id, current_user)
-    return ProductResponse.from_orm(p)
+    data = get_product_view_service(db, product_id, current_user)
+    etag = version_etag(data['version'])
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    return ProductResponse(**data)
 
 
 async def create_product(
@@ -51,46 +104,70 @@ async def create_product(
     db: Session = Depends(get_session),
     current_user=Depends(get_current_user),
 ) -> ProductResponse:
-    # 1) Salvar os arquivos físicos (se houver)
-    image_paths: List[str] = []
-    if images:
-        for img in images:
-            file_location = f'smartsales/static/uploads/{img.filename}'
-            with open(file_location, 'wb+') as f:
-                f.write(img.file.read())
-            image_paths.append(file_location)
+    # 1) Salvar os arquivos físicos (se houver), em paralelo e por hash
+    image_paths: List[str] = await save_images(images) if images else []
 
     # 2) “injetar” os paths no objeto ProductCreate
     body.images = image_paths
 
-    # 3) Chamar o service passando o ProductCreate (que já tem body.images)
-    p = create_product_service(db, body, current_user)
-    return ProductResponse.from_orm(p)
+    # 3) Chamar o service passando o ProductCreate (que já tem body.images);
+    # ele enfileira na mesma transação as miniaturas/WebP (tarefa em
+    # background, acompanhada por variants_job_id)
+    p, job = create_product_service(db, body, current_user)
+    return _product_response(p, job)
 
 
 async def update_product(
     product_id: int,
+    request: Request,
+    response: Response,
     body: ProductUpdate = Depends(ProductUpdate.as_form),
     images: Optional[List[UploadFile]] = File(None),
     db: Session = Depends(get_session),
     current_user=Depends(get_current_user),
 ) -> ProductResponse:
+    # If-Match com a versão lida pelo cliente (412 se já mudou)
+    current = get_product_service(db, product_id, current_user)
+    require_if_match(request, version_etag(current.version))
     if images:
-        image_paths: List[str] = []
-        for img in images:
-            file_location = f'smartsales/static/uploads/{img.filename}'
-            with open(file_location, 'wb+') as f:
-                f.write(img.file.read())
-            image_paths.append(file_location)
-        body.images = image_paths  # sobrescreve as imagens
+        body.images = await save_images(images)  # sobrescreve as imagens
 
-    p = update_product_service(db, product_id, body, current_user)
-    return ProductResponse.from_orm(p)
+    p, job = update_product_service(db, product_id, body, current_user)
+    response.headers['etag'] = version_etag(p.version)
+    return _product_response(p, job)
 
 
 async def delete_product(
     product_id: int,
+    request: Request,
     db: Session = Depends(get_session),
     current_user=Depends(get_current_user),
 ) -> None:
+    current = get_product_service(db, product_id, current_user)
+    require_if_match(request, version_etag(current.version))
     delete_product_service(db, product_id, current_user)
+
+
+async def presign_product_image(
+    product_id: int,
+    body: ImageUploadRequest,
+    db: Session = Depends(get_session),
+    current_user=Depends(get_current_user),
+) -> PresignedUploadResponse:
+    # 1) Só quem pode alterar o produto recebe a URL de upload
+    get_product_service(db, product_id, current_user)
+    data = presign_image_upload(body.content_type, body.size)
+    return PresignedUploadResponse(**data)
+
+
+async def confirm_product_image(
+    product_id: int,
+    body: ImageConfirmRequest,
+    db: Session = Depends(get_session),
+    current_user=Depends(get_current_user),
+) -> ProductResponse:
+    # 2) Depois do upload direto, associa a imagem ao produto
+    get_product_service(db, product_id, current_user)
+    ref = await run_in_threadpool(confirm_image_upload, body.key)
+    p, job = add_product_image_service(db, product_id, ref, current_user)
+    return _product_response(p, job)
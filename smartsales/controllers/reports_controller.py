@@ -0,0 +1,81 @@
+from datetime import datetime
+from typing import List, Literal, Optional
+
+from fastapi import Depends, Query
+from sqlalchemy.orm import Session
+
+from smartsales.core.database import get_session
+from smartsales.core.security import get_current_user
+from smartsales.schemas.reports_schema import (
+    AverageBasketResponse,
+    RevenuePoint,
+    RevenueSeriesResponse,
+    SectionRevenue,
+    TopClient,
+    TopProduct,
+)
+from smartsales.services.reports_service import (
+    average_basket_service,
+    revenue_over_time_service,
+    sections_service,
+    top_clients_service,
+    top_products_service,
+)
+
+
+async def revenue_report(
+    granularity: Literal['day', 'week', 'month'] = 'day',
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    db: Session = Depends(get_session),
+    current_user=Depends(get_current_user),
+) -> RevenueSeriesResponse:
+    rows = revenue_over_time_service(
+        db, current_user, granularity, since, until
+    )
+    return RevenueSeriesResponse(
+        granularity=granularity,
+        items=[RevenuePoint(**r) for r in rows],
+    )
+
+
+async def top_products_report(
+    limit: int = Query(10, ge=1, le=100),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    db: Session = Depends(get_session),
+    current_user=Depends(get_current_user),
+) -> List[TopProduct]:
+    rows = top_products_service(db, current_user, limit, since, until)
+    return [TopProduct(**r) for r in rows]
+
+
+async def top_clients_report(
+    limit: int = Query(10, ge=1, le=100),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    db: Session = Depends(get_session),
+    current_user=Depends(get_current_user),
+) -> List[TopClient]:
+    rows = top_clients_service(db, current_user, limit, since, until)
+    return [TopClient(**r) for r in rows]
+
+
+async def sections_report(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    db: Session = Depends(get_session),
+    current_user=Depends(get_current_user),
+) -> List[SectionRevenue]:
+    rows = sections_service(db, current_user, since, until)
+    return [SectionRevenue(**r) for r in rows]
+
+
+async def average_basket_report(
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    db: Session = Depends(get_session),
+    current_user=Depends(get_current_user),
+) -> AverageBasketResponse:
+    data = average_basket_service(db, current_user, since, until)
+    return AverageBasketResponse(**data)
@@ -0,0 +1,41 @@
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
+from smartsales.core.database import get_session
+from smartsales.core.security import get_current_user
+from smartsales.schemas.reservations_schema import (
+    ReservationCreate,
+    ReservationResponse,
+)
+from smartsales.services.reservations_service import (
+    create_reservation_service,
+    get_reservation_service,
+    release_reservation_service,
+)
+
+
+async def create_reservation(
+    payload: ReservationCreate,
+    db: Session = Depends(get_session),
+    current_user=Depends(get_current_user),
+) -> ReservationResponse:
+    reserva = create_reservation_service(db, payload, current_user)
+    return ReservationResponse.from_orm(reserva)
+
+
+async def retrieve_reservation(
+    reservation_id: int,
+    db: Session = Depends(get_session),
+    current_user=Depends(get_current_user),
+) -> ReservationResponse:
+    reserva = get_reservation_service(db, reservation_id, current_user)
+    return ReservationResponse.from_orm(reserva)
+
+
+async def release_reservation(
+    reservation_id: int,
+    db: Session = Depends(get_session),
+    current_user=Depends(get_current_user),
+) -> None:
+    reserva = get_reservation_service(db, reservation_id, current_user)
+    release_reservation_service(db, reserva)
@@ -1,11 +1,13 @@
+import logging
 import re
+import time
+from typing import Optional
 
 from fastapi import Depends, HTTPException, Query, status
 from langchain.chains import create_sql_query_chain
 from langchain.prompts import ChatPromptTemplate
 from langchain_community.utilities import SQLDatabase
 from langchain_groq import ChatGroq
-from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from smartsales.core.database import get_session
@@ -14,11 +16,27 @@ from smartsales.core.security import (
 )
 from smartsales.core.settings import Settings
 from smartsales.schemas.auth_schema import UserInfo
-from smartsales.schemas.search_schema import SearchCreate, SearchOut
+from smartsales.schemas.search_schema import (
+    SearchCreate,
+    SearchHistoryItem,
+    SearchHistoryResponse,
+    SearchOut,
+    SearchStatsResponse,
+)
 from smartsales.services.search_service import SearchService
+from smartsales.utils.llm_gate import LLMBusyError, LLMGate, call_with_backoff
+from smartsales.utils.result_summary import compact_result
+from smartsales.utils.sql_sandbox import UnsafeQueryError, execute_sandboxed
 
+logger = logging.getLogger(__name__)
 settings = Settings()
 
+# Limite de chamadas simultâneas ao LLM neste processo
+llm_gate = LLMGate(
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    queue_timeout=settings.LLM_QUEUE_TIMEOUT,
+)
+
 # ─── 1) DEPENDÊNCIA OPCIONAL PARA LER O JWT ────────────────────────────────
 # – Se vier o Bearer token, decodifica e retorna um UserInfo; retorna None.
 # bearer_scheme = HTTPBearer(bearerFormat='JWT', auto_error=False)
@@ -106,7 +124,123 @@ def is_valid_sql(query: str) -> bool:
     return query.lower().strip().startswith(('select', 'with'))
 
 
-async def search_query(  # noqa: PLR0914
+def _invoke(runnable, payload):
+    return call_with_backoff(
+        runnable.invoke,
+        payload,
+        retries=settings.LLM_MAX_RETRIES,
+        base_delay=settings.LLM_RETRY_BASE_DELAY,
+    )
+
+
+def answer_from_database(q: str, engine) -> str:
+    """
+    Fluxo database=true: o LLM gera o SQL, a consulta roda no sandbox e
+    um segundo LLM explica o resultado. Erros viram texto de resposta.
+    """
+    try:
+        sql_db = SQLDatabase(engine)
+
+        # Gerar consulta SQL natural language
+        llm_sql = ChatGroq(
+            model='llama-3.3-70b-versatile',
+            api_key=settings.GROQ_API_KEY,
+            temperature=0,
+        )
+        chain = create_sql_query_chain(llm_sql, sql_db)
+        generated_text = _invoke(chain, {'question': q})
+
+        # Extrair e validar a consulta SQL
+        generated_query = extract_sql_query(generated_text)
+
+        if not is_valid_sql(generated_query):
+            raise ValueError(
+                f'Consulta SQL inválida gerada: {generated_query}'
+            )
+
+        # Executar consulta SQL em transação somente leitura,
+        # com timeout, LIMIT imposto e checagem de custo
+        try:
+            _, columns, rows, truncated = execute_sandboxed(
+                engine,
+                generated_query,
+                max_rows=settings.SEARCH_SQL_MAX_ROWS,
+                statement_timeout_ms=settings.SEARCH_SQL_STATEMENT_TIMEOUT_MS,
+                max_cost=settings.SEARCH_SQL_MAX_COST,
+            )
+            result_str = compact_result(
+                columns,
+                rows,
+                truncated=truncated,
+                token_budget=settings.SEARCH_RESULT_TOKEN_BUDGET,
+                top_k=settings.SEARCH_RESULT_TOP_K,
+            )
+        except UnsafeQueryError:
+            raise
+        except Exception as e:
+            raise RuntimeError(
+                f'Erro na execução da consulta: {str(e)}'
+            ) from e
+
+        # Interpretar resultados com LLM
+        prompt_template = ChatPromptTemplate.from_messages([
+            (
+                'system',
+                'Você é um especialista em SQL. Explique os resultados:',
+            ),
+            (
+                'human',
+                'Pergunta: {question}\nConsulta: {query}\nResultados:\n{result}',  # noqa: E501
+            ),
+        ])
+
+        llm_final = ChatGroq(
+            model='llama-3.3-70b-versatile',
+            api_key=settings.GROQ_API_KEY,
+            temperature=0.2,
+        )
+        logger.debug('SQL gerado: %s', generated_query)
+        logger.debug('Resultado do banco: %s', result_str)
+
+        chain_final = prompt_template | llm_final
+        response = _invoke(
+            chain_final,
+            {
+                'question': q,
+                'query': generated_query,
+                'result': result_str,
+            },
+        )
+        return response.content
+
+    except Exception as e:
+        return f'Erro na consulta ao banco: {str(e)}'
+
+
+def answer_from_rules(q: str) -> str:
+    """Fluxo padrão: responde com base no BUSINESS_RULES_TEMPLATE."""
+    system_message = BUSINESS_RULES_TEMPLATE.format(query=q)
+    try:
+        chat = ChatGroq(
+            model='llama-3.3-70b-versatile',
+            api_key=settings.GROQ_API_KEY,
+            temperature=0.2,
+        )
+        messages = [
+            {'role': 'system', 'content': system_message},
+            {'role': 'user', 'content': q},
+        ]
+        response = _invoke(chat, messages)
+        return response.content
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f'Erro ao processar busca: {e}',
+        )
+
+
+async def search_query(
     q: str = Query(
         ..., min_length=3, max_length=255, description='Texto de busca'
     ),
@@ -121,10 +255,14 @@ async def search_query(  # noqa: PLR0914
     2) Identifica se há user autenticado (current_user) ou não
     (owner_id = None).
     3) Monta o prompt com BUSINESS_RULES_TEMPLATE.format(query=q).
-    4) Chama o LLM (ChatGroq) para responder baseado nas regras de negócio.
-    5) Salva a pesquisa no banco (query + resposta + owner_id).
-    6) Retorna SearchOut (id, query, response, owner_id, created_at).
+    4) Chama o LLM (ChatGroq) via llm_gate: concorrência limitada e
+    perguntas idênticas em andamento compartilham a mesma chamada.
+    5) Enfileira a pesquisa para gravação em lote
+    (query + resposta + owner_id).
+    6) Retorna SearchOut (query, response, owner_id, created_at).
     """
+    started = time.perf_counter()
+
     # 1) Se database=True, usar fluxo de consulta direta ao banco
     if database:
         # Verificar se pacotes necessários estão instalados
@@ -133,103 +271,61 @@ async def search_query(  # noqa: PLR0914
                 status_code=status.HTTP_501_NOT_IMPLEMENTED,
                 detail='Requer instalação de langchain e langchain-community',
             )
-
-        try:
-            # Configurar conexão com o banco
-            engine = db.get_bind()
-            sql_db = SQLDatabase(engine)
-
-            # Gerar consulta SQL natural language
-            llm_sql = ChatGroq(
-                model='llama-3.3-70b-versatile',
-                api_key=settings.GROQ_API_KEY,
-                temperature=0,
-            )
-            chain = create_sql_query_chain(llm_sql, sql_db)
-            generated_text = chain.invoke({'question': q})
-
-            # Extrair e validar a consulta SQL
-            generated_query = extract_sql_query(generated_text)
-
-            if not is_valid_sql(generated_query):
-                raise ValueError(
-                    f'Consulta SQL inválida gerada: {generated_query}'
-                )
-
-            # Executar consulta SQL com transação segura
-            try:
-                result = db.execute(text(generated_query)).fetchall()
-                result_str = '\n'.join(str(row) for row in result)
-            except Exception as e:
-                db.rollback()  # Importante para limpar transações abortadas
-                raise RuntimeError(
-                    f'Erro na execução da consulta: {str(e)}'
-                ) from e
-
-            # Interpretar resultados com LLM
-            prompt_template = ChatPromptTemplate.from_messages([
-                (
-                    'system',
-                    'Você é um especialista em SQL. Explique os resultados:',
-                ),
-                (
-                    'human',
-                    'Pergunta: {question}\nConsulta: {query}\nResultados:\n{result}',  # noqa: E501
-                ),
-            ])
-
-            llm_final = ChatGroq(
-                model='llama-3.3-70b-versatile',
-                api_key=settings.GROQ_API_KEY,
-                temperature=0.2,
-            )
-            print(f'RESPOSTA Consultads no SQL:\n {generated_query}\n')
-            print(f'RESPOSTA DO DB:\n {result_str}\n')
-
-            chain_final = prompt_template | llm_final
-            response = chain_final.invoke({
-                'question': q,
-                'query': generated_query,
-                'result': result_str,
-            })
-
-            response_text = response.content
-
-        except Exception as e:
-            response_text = f'Erro na consulta ao banco: {str(e)}'
-            db.rollback()  # Garante limpeza da transação em caso de erro
-
+        answer, args = answer_from_database, (q, db.get_bind())
     # 2) Fluxo padrão (sem database=true)
     else:
-        system_message = BUSINESS_RULES_TEMPLATE.format(query=q)
-        try:
-            chat = ChatGroq(
-                model='llama-3.3-70b-versatile',
-                api_key=settings.GROQ_API_KEY,
-                temperature=0.2,
-            )
-            messages = [
-                {'role': 'system', 'content': system_message},
-                {'role': 'user', 'content': q},
-            ]
-            response = chat.invoke(messages)
-            response_text = response.content
-
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f'Erro ao processar busca: {e}',
-            )
-
-    print(f'REPOSTA TEXTO IA: \n{response_text}')
-    # Salvar no banco e retornar
+        answer, args = answer_from_rules, (q,)
+
+    try:
+        response_text, coalesced = await llm_gate.run(
+            (database, ' '.join(q.lower().split())), answer, *args
+        )
+    except LLMBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={'Retry-After': '1'},
+        )
+
+    logger.debug('Resposta do LLM: %s', response_text)
+    # Enfileirar a gravação e retornar
     search_in = SearchCreate(query=q, database=database)
     owner_id = current_user.id if current_user else None
 
-    saved = SearchService.create_search(
-        db=db,
+    saved = SearchService.enqueue_search(
         search_in=search_in,
         response=response_text,
         owner_id=owner_id,
+        latency_ms=int((time.perf_counter() - started) * 1000),
+        cached=coalesced,
     )
     return saved
+
+
+async def search_history_controller(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(
+        None, description='Cursor retornado em next_cursor'
+    ),
+    q: Optional[str] = Query(
+        None, min_length=3, description='Busca textual no histórico'
+    ),
+    current_user: UserInfo = Depends(get_current_user),
+    db: Session = Depends(get_session),
+) -> SearchHistoryResponse:
+    items, next_cursor = SearchService.list_history(
+        db, current_user, limit=limit, cursor=cursor, term=q
+    )
+    return SearchHistoryResponse(
+        items=[SearchHistoryItem.from_orm(s) for s in items],
+        next_cursor=next_cursor,
+    )
+
+
+async def search_stats_controller(
+    top: int = Query(10, ge=1, le=50),
+    current_user: UserInfo = Depends(get_current_user),
+    db: Session = Depends(get_session),
+) -> SearchStatsResponse:
+    stats = SearchService.search_stats(db, current_user, top=top)
+    return SearchStatsResponse(**stats)
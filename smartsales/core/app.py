@@ -1,29 +1,95 @@
+from contextlib import asynccontextmanager
 from http import HTTPStatus
 
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.openapi.models import SecuritySchemeType
 from fastapi.openapi.utils import get_openapi
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.security import HTTPBearer
-from fastapi.staticfiles import StaticFiles
-
+from sqlalchemy.orm.exc import StaleDataError
+
+from smartsales.core.database import engine
+from smartsales.core.metrics import MetricsMiddleware, registry
+from smartsales.core.profiler import RequestProfilerMiddleware
+from smartsales.core.query_stats import (
+    QueryStatsMiddleware,
+    shutdown_explainer,
+)
+from smartsales.core.settings import Settings
+from smartsales.core.static import CachedStaticFiles
+from smartsales.routers.admin_router import router as admin_router
+from smartsales.routers.alerts_router import router as alerts_router
 from smartsales.routers.auth_router import router as auth_router
 from smartsales.routers.clients_router import router as clients_router
+from smartsales.routers.events_router import router as events_router
+from smartsales.routers.jobs_router import router as jobs_router
 from smartsales.routers.orders_router import router as orders_router
 from smartsales.routers.products_router import router as products_router
+from smartsales.routers.reports_router import router as reports_router
+from smartsales.routers.reservations_router import (
+    router as reservations_router,
+)
 from smartsales.routers.search_router import router as search_router
+from smartsales.services.alerts_service import shutdown_alert_notifier
+from smartsales.services.images_service import shutdown_variant_pool
+from smartsales.services.jobs_service import job_runner
+from smartsales.services.maintenance_service import maintenance_sweeper
+from smartsales.services.outbox_service import outbox_dispatcher
+from smartsales.services.search_history_service import search_history
+
+settings = Settings()
 
 # define o scheme de Bearer (JWT) para o OpenAPI
 bearer_scheme = HTTPBearer(bearerFormat='JWT')
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # grava o histórico de pesquisas em lote durante a vida do worker
+    search_history.start()
+    # limpezas periódicas (ver maintenance_service)
+    maintenance_sweeper.start()
+    # entrega os eventos do outbox aos destinos registrados
+    outbox_dispatcher.start()
+    # tarefas em background (variantes de imagem...) fora da requisição
+    await job_runner.start()
+    yield
+    await job_runner.stop()
+    outbox_dispatcher.stop()
+    maintenance_sweeper.stop()
+    search_history.stop()
+    shutdown_variant_pool()
+    shutdown_alert_notifier()
+    shutdown_explainer()
+
+
 app = FastAPI(
     title='Project Smart Sales API',
     description='API',
     version='1.0.0',
+    lifespan=lifespan,
 )
 
-app.mount('/static', StaticFiles(directory='smartsales/static'), name='static')
+if settings.METRICS_ENABLED:
+    # latência/status por rota, exportados em /metrics
+    app.add_middleware(MetricsMiddleware, exclude_paths=('/metrics',))
+
+if settings.SQL_STATS_ENABLED:
+    # consultas SQL por requisição no cabeçalho Server-Timing
+    app.add_middleware(QueryStatsMiddleware)
+
+if settings.PROFILING_ENABLED:
+    # perfil por requisição com o cabeçalho X-Profile (somente admin)
+    app.add_middleware(
+        RequestProfilerMiddleware,
+        engine=engine,
+        interval=settings.PROFILING_INTERVAL_MS / 1000,
+    )
+
+app.mount(
+    '/static', CachedStaticFiles(directory='smartsales/static'), name='static'
+)
 
 # inclui seus routers normalmente
 app.include_router(auth_router, prefix='/api')
@@ -31,6 +97,12 @@ app.include_router(search_router, prefix='/api')
 app.include_router(clients_router, prefix='/api')
 app.include_router(products_router, prefix='/api')
 app.include_router(orders_router, prefix='/api')
+app.include_router(reports_router, prefix='/api')
+app.include_router(alerts_router, prefix='/api')
+app.include_router(reservations_router, prefix='/api')
+app.include_router(events_router, prefix='/api')
+app.include_router(jobs_router, prefix='/api')
+app.include_router(admin_router, prefix='/api')
 
 
 @app.get('/', status_code=HTTPStatus.OK)
@@ -38,6 +110,25 @@ def read_root():
     return {'message': 'Olá Mundo!'}
 
 
+@app.get('/metrics', include_in_schema=False)
+def metrics():
+    if not settings.METRICS_ENABLED:
+        return PlainTextResponse(status_code=HTTPStatus.NOT_FOUND)
+    return PlainTextResponse(
+        registry.render(), media_type='text/plain; version=0.0.4'
+    )
+
+
+# versão mudou entre a leitura e a escrita (outra transação gravou
+# antes): o cliente deve recarregar o recurso e tentar de novo
+@app.exception_handler(StaleDataError)
+async def stale_data_exception_handler(request: Request, exc: StaleDataError):
+    return JSONResponse(
+        status_code=HTTPStatus.CONFLICT,
+        content={'detail': 'Resource was modified concurrently; retry'},
+    )
+
+
 # handler para erros de validação (422) — retorna só {"message": ...}
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(
@@ -0,0 +1,111 @@
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Optional
+
+from smartsales.core.settings import Settings
+
+try:
+    import redis
+except ImportError:  # redis é opcional (extra "cache")
+    redis = None
+
+
+class CacheBackend(ABC):
+    """
+    Cache chave -> valor JSON-serializável, com expiração por TTL.
+    Falhas do backend não devem derrubar a requisição: quem usa trata
+    `None` como ausência.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]: ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None: ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+
+class MemoryLRUCache(CacheBackend):
+    """LRU em memória do processo (padrão; cada worker tem o seu)."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class RedisCache(CacheBackend):
+    """Cache compartilhado entre workers; valores gravados como JSON."""
+
+    def __init__(self, client, ttl: float = 300, prefix: str = 'smartsales:'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key: str, value: Any) -> None:
+        self.client.set(
+            self.prefix + key,
+            json.dumps(value, default=str),
+            ex=max(1, int(self.ttl)),
+        )
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(f'{self.prefix}*'):
+            self.client.delete(key)
+
+
+@lru_cache
+def get_cache() -> CacheBackend:
+    settings = Settings()
+    if settings.CACHE_BACKEND == 'redis':
+        if redis is None:
+            raise RuntimeError('CACHE_BACKEND=redis requer o pacote redis')
+        return RedisCache(
+            redis.Redis.from_url(settings.CACHE_REDIS_URL),
+            ttl=settings.CACHE_TTL,
+        )
+    return MemoryLRUCache(settings.CACHE_MAX_ENTRIES, settings.CACHE_TTL)
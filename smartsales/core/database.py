@@ -1,9 +1,17 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import Session
 
+from smartsales.core.query_stats import instrument_engine
 from smartsales.core.settings import Settings
 
-engine = create_engine(Settings().DATABASE_URL)
+settings = Settings()
+
+engine = create_engine(settings.DATABASE_URL)
+
+if settings.SQL_STATS_ENABLED:
+    instrument_engine(
+        engine, settings.SQL_SLOW_QUERY_MS, settings.SQL_EXPLAIN_SLOW
+    )
 
 
 def get_session():
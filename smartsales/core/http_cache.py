@@ -0,0 +1,69 @@
+import hashlib
+from http import HTTPStatus
+
+from fastapi import HTTPException, Request, Response
+
+# respostas dependem do usuário autenticado: só o cliente guarda, e
+# sempre revalida com If-None-Match
+PRIVATE_REVALIDATE = 'private, no-cache'
+
+
+def weak_etag(*parts) -> str:
+    """
+    ETag fraca a partir de valores que mudam junto com a representação,
+    ex.: ('product', id, updated_at) ou, em listas, os filtros mais
+    (total, max(updated_at)).
+    """
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=12)
+    return f'W/"{digest.hexdigest()}"'
+
+
+def version_etag(version: int) -> str:
+    """
+    ETag forte de um recurso versionado (coluna `version`, incrementada
+    a cada escrita); é a que o cliente devolve em If-Match.
+    """
+    return f'"{version}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Comparação fraca com o If-None-Match da requisição (RFC 9110)."""
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    opaque = etag.removeprefix('W/')
+    return any(
+        tag.strip().removeprefix('W/') == opaque for tag in header.split(',')
+    )
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=HTTPStatus.NOT_MODIFIED,
+        headers={'etag': etag, 'cache-control': PRIVATE_REVALIDATE},
+    )
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers['etag'] = etag
+    response.headers['cache-control'] = PRIVATE_REVALIDATE
+
+
+def require_if_match(request: Request, etag: str) -> None:
+    """
+    Pré-condição de escrita: se o cliente enviou If-Match e nenhuma tag
+    confere (comparação forte, RFC 9110), responde 412. Sem o
+    cabeçalho, a escrita segue e a versão ainda protege contra perda de
+    atualização concorrente (409).
+    """
+    header = request.headers.get('if-match')
+    if not header or header.strip() == '*':
+        return
+    if etag not in {tag.strip() for tag in header.split(',')}:
+        raise HTTPException(
+            HTTPStatus.PRECONDITION_FAILED,
+            detail='Resource has changed; reload it and retry',
+            headers={'etag': etag},
+        )
@@ -0,0 +1,203 @@
+import bisect
+import threading
+import time
+from collections import defaultdict
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# limites (segundos) dos buckets de latência
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)  # fmt: skip
+
+UNMATCHED_ROUTE = '<unmatched>'
+
+
+def _escape(value) -> str:
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('"', '\\"')
+        .replace('\n', '\\n')
+    )
+
+
+def _format_labels(names: tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ''
+    pairs = ','.join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values)
+    )
+    return '{' + pairs + '}'
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: dict[tuple, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] += amount
+
+    def render(self) -> list[str]:
+        lines = [
+            f'# HELP {self.name} {self.help}',
+            f'# TYPE {self.name} counter',
+        ]
+        with self._lock:
+            for values, total in sorted(self._values.items()):
+                labels = _format_labels(self.labels, values)
+                lines.append(f'{self.name}{labels} {total}')
+        return lines
+
+
+class Gauge(Counter):
+    def dec(self, *label_values, amount: float = 1) -> None:
+        self.inc(*label_values, amount=-amount)
+
+    def render(self) -> list[str]:
+        lines = super().render()
+        lines[1] = f'# TYPE {self.name} gauge'
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        # label_values -> [contagem por bucket..., +Inf], soma
+        self._counts: dict[tuple, list[int]] = {}
+        self._sums: dict[tuple, float] = defaultdict(float)
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(label_values)
+            if counts is None:
+                counts = self._counts[label_values] = [0] * (
+                    len(self.buckets) + 1
+                )
+            counts[index] += 1
+            self._sums[label_values] += value
+
+    def render(self) -> list[str]:
+        lines = [
+            f'# HELP {self.name} {self.help}',
+            f'# TYPE {self.name} histogram',
+        ]
+        names = (*self.labels, 'le')
+        with self._lock:
+            for values, counts in sorted(self._counts.items()):
+                cumulative = 0
+                for bound, count in zip(
+                    (*self.buckets, '+Inf'), counts, strict=True
+                ):
+                    cumulative += count
+                    labels = _format_labels(names, (*values, bound))
+                    lines.append(f'{self.name}_bucket{labels} {cumulative}')
+                labels = _format_labels(self.labels, values)
+                lines.extend((
+                    f'{self.name}_sum{labels} {self._sums[values]}',
+                    f'{self.name}_count{labels} {cumulative}',
+                ))
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: list = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+REQUEST_LATENCY = registry.register(
+    Histogram(
+        'http_request_duration_seconds',
+        'Latência das requisições HTTP por rota.',
+        ('method', 'route'),
+    )
+)
+REQUESTS_TOTAL = registry.register(
+    Counter(
+        'http_requests_total',
+        'Requisições HTTP por rota e status.',
+        ('method', 'route', 'status'),
+    )
+)
+REQUESTS_IN_FLIGHT = registry.register(
+    Gauge('http_requests_in_flight', 'Requisições HTTP em andamento.')
+)
+
+
+def route_label(scope: Scope) -> str:
+    """
+    Template da rota (ex.: /api/products/{product_id}), preenchido pelo
+    roteamento do FastAPI no scope. Usar o template, e não o caminho,
+    mantém a cardinalidade das séries limitada.
+    """
+    route = scope.get('route')
+    if route is not None:
+        return getattr(route, 'path', UNMATCHED_ROUTE)
+    # apps montadas (ex.: /static) deixam apenas o prefixo no root_path
+    return scope.get('root_path') or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que mede latência, status e requisições em
+    andamento. Os valores são do processo; com vários workers, cada um
+    expõe os seus em /metrics.
+    """
+
+    def __init__(self, app: ASGIApp, exclude_paths: tuple[str, ...] = ()):
+        self.app = app
+        self.exclude_paths = exclude_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http' or scope['path'] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            route = route_label(scope)
+            method = scope['method']
+            REQUEST_LATENCY.observe(
+                time.perf_counter() - started, method, route
+            )
+            REQUESTS_TOTAL.inc(method, route, status_code)
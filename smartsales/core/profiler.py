@@ -0,0 +1,230 @@
+import logging
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from smartsales.core.security import user_from_token
+from smartsales.models.auth import UserRole
+
+logger = logging.getLogger(__name__)
+
+SPEEDSCOPE_SCHEMA = 'https://www.speedscope.app/file-format-schema.json'
+# perfis por requisição guardados para download (/admin/profile/requests)
+MAX_STORED_PROFILES = 20
+
+
+class ProfilerBusyError(Exception):
+    """Já existe uma amostragem em andamento neste processo."""
+
+
+def _stack(frame) -> tuple:
+    """Quadros (função, arquivo, linha) da raiz até a folha."""
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+    return tuple(reversed(stack))
+
+
+class SamplingProfiler:
+    """
+    Profiler por amostragem sem dependências: uma thread lê as pilhas
+    de todas as threads (`sys._current_frames`) a cada `interval`
+    segundos e conta as pilhas iguais. O custo fica na thread de
+    amostragem, então pode rodar com o worker atendendo tráfego real.
+
+    Só uma amostragem por processo de cada vez (`ProfilerBusyError`).
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples: Counter[tuple] = Counter()
+        self.started = self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> 'SamplingProfiler':
+        if not SamplingProfiler._lock.acquire(blocking=False):
+            raise ProfilerBusyError('Profiling already in progress')
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._run, name='sampling-profiler', daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> 'SamplingProfiler':
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            self.elapsed = time.perf_counter() - self.started
+            SamplingProfiler._lock.release()
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                if thread_id not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                thread = (names.get(thread_id, str(thread_id)), '', 0)
+                # a thread entra como quadro raiz
+                self.samples[(thread, *_stack(frame))] += 1
+
+    @property
+    def total_samples(self) -> int:
+        return sum(self.samples.values())
+
+    def collapsed(self) -> str:
+        """Formato de pilhas colapsadas (flamegraph.pl, speedscope)."""
+        lines = []
+        for stack, count in self.samples.most_common():
+            frames = ';'.join(
+                f'{name} ({filename}:{line})' if filename else name
+                for name, filename, line in stack
+            )
+            lines.append(f'{frames} {count}')
+        return '\n'.join(lines) + '\n'
+
+    def speedscope(self, name: str = 'smartsales') -> dict:
+        """Perfil no formato de arquivo do speedscope (tipo 'sampled')."""
+        frames: list[dict] = []
+        index: dict[tuple, int] = {}
+        samples, weights = [], []
+        for stack, count in self.samples.items():
+            sample = []
+            for frame in stack:
+                if frame not in index:
+                    index[frame] = len(frames)
+                    func, filename, line = frame
+                    frames.append(
+                        {'name': func, 'file': filename, 'line': line}
+                        if filename
+                        else {'name': func}
+                    )
+                sample.append(index[frame])
+            samples.append(sample)
+            weights.append(count * self.interval)
+        return {
+            '$schema': SPEEDSCOPE_SCHEMA,
+            'name': name,
+            'exporter': 'smartsales',
+            'shared': {'frames': frames},
+            'profiles': [
+                {
+                    'type': 'sampled',
+                    'name': name,
+                    'unit': 'seconds',
+                    'startValue': 0,
+                    'endValue': sum(weights),
+                    'samples': samples,
+                    'weights': weights,
+                }
+            ],
+        }
+
+
+class ProfileStore:
+    """Últimos perfis de requisição, em memória do processo."""
+
+    def __init__(self, maxsize: int = MAX_STORED_PROFILES):
+        self.maxsize = maxsize
+        self._profiles: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, profile_id: str, profile: dict) -> None:
+        with self._lock:
+            self._profiles[profile_id] = profile
+            while len(self._profiles) > self.maxsize:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> dict | None:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+
+profile_store = ProfileStore()
+
+
+def _is_admin_token(engine, token: str) -> bool:
+    with Session(engine) as session:
+        user = user_from_token(session, token)
+        return user is not None and user.role == UserRole.ADMIN
+
+
+class RequestProfilerMiddleware:
+    """
+    Com o cabeçalho `X-Profile: 1` de um admin, amostra o processo
+    enquanto a requisição roda e devolve `X-Profile-Id`; o perfil fica
+    em GET /api/admin/profile/requests/{id}. Demais requisições (e
+    cabeçalhos de não-admins) passam sem custo extra.
+
+    As amostras cobrem o processo inteiro: requisições concorrentes no
+    mesmo worker também aparecem no perfil.
+    """
+
+    def __init__(self, app: ASGIApp, engine, interval: float = 0.005):
+        self.app = app
+        self.engine = engine
+        self.interval = interval
+
+    async def _wants_profile(self, scope: Scope) -> bool:
+        headers = Headers(scope=scope)
+        if headers.get('x-profile', '').lower() not in {'1', 'true'}:
+            return False
+        scheme, _, token = headers.get('authorization', '').partition(' ')
+        if scheme.lower() != 'bearer' or not token:
+            return False
+        return await run_in_threadpool(_is_admin_token, self.engine, token)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http' or not await self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            profiler = SamplingProfiler(self.interval).start()
+        except ProfilerBusyError:
+            await self.app(scope, receive, send)
+            return
+        profile_id = uuid.uuid4().hex
+
+        async def send_wrapper(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                MutableHeaders(scope=message).append(
+                    'X-Profile-Id', profile_id
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            name = f'{scope["method"]} {scope["path"]}'
+            profile_store.add(profile_id, profiler.speedscope(name))
+            logger.info(
+                'Perfil %s de %s: %d amostras',
+                profile_id,
+                name,
+                profiler.total_samples,
+            )
@@ -0,0 +1,168 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from smartsales.core.metrics import Histogram, registry, route_label
+
+logger = logging.getLogger(__name__)
+
+# opção de execução que marca as consultas do próprio EXPLAIN
+_EXPLAIN_OPTION = 'smartsales_explain'
+
+DB_QUERIES = registry.register(
+    Histogram(
+        'http_request_db_queries',
+        'Consultas SQL emitidas por requisição.',
+        ('method', 'route'),
+        buckets=(1, 2, 5, 10, 20, 50, 100, 250),
+    )
+)
+DB_DURATION = registry.register(
+    Histogram(
+        'http_request_db_duration_seconds',
+        'Tempo total em consultas SQL por requisição.',
+        ('method', 'route'),
+    )
+)
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    duration: float = 0.0
+
+
+_current: ContextVar[QueryStats | None] = ContextVar(
+    'query_stats', default=None
+)
+_explainer: ThreadPoolExecutor | None = None
+
+
+def current_query_stats() -> QueryStats | None:
+    return _current.get()
+
+
+def _explain(engine: Engine, statement: str, parameters) -> None:
+    prefix = (
+        'EXPLAIN QUERY PLAN '
+        if engine.dialect.name == 'sqlite'
+        else 'EXPLAIN '
+    )
+    try:
+        with engine.connect() as conn:
+            rows = (
+                conn.execution_options(**{_EXPLAIN_OPTION: True})
+                .exec_driver_sql(prefix + statement, parameters)
+                .all()
+            )
+    except Exception:
+        logger.exception('Falha no EXPLAIN da consulta lenta')
+        return
+    plan = '\n'.join(' '.join(str(col) for col in row) for row in rows)
+    logger.warning('Plano da consulta lenta:\n%s\n%s', statement, plan)
+
+
+def _get_explainer() -> ThreadPoolExecutor:
+    global _explainer  # noqa: PLW0603
+    if _explainer is None:
+        _explainer = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='sql-explain'
+        )
+    return _explainer
+
+
+def shutdown_explainer() -> None:
+    global _explainer  # noqa: PLW0603
+    if _explainer is not None:
+        _explainer.shutdown(wait=False, cancel_futures=True)
+        _explainer = None
+
+
+def instrument_engine(
+    engine: Engine, slow_query_ms: float, explain_slow: bool = True
+) -> None:
+    """
+    Registra os eventos que cronometram cada consulta, somam-na às
+    estatísticas da requisição atual e registram no log as que passam
+    de `slow_query_ms`. O EXPLAIN das consultas lentas roda depois, em
+    outra conexão, para não interferir na transação da requisição.
+    """
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['query_started'].pop()
+        if conn.get_execution_options().get(_EXPLAIN_OPTION):
+            return
+
+        stats = _current.get()
+        if stats is not None:
+            stats.count += 1
+            stats.duration += elapsed
+
+        if elapsed * 1000 < slow_query_ms:
+            return
+        logger.warning(
+            'Consulta lenta (%.1f ms): %s', elapsed * 1000, statement
+        )
+        if (
+            explain_slow
+            and not executemany
+            and statement.lstrip().upper().startswith(('SELECT', 'WITH'))
+        ):
+            _get_explainer().submit(_explain, engine, statement, parameters)
+
+    @event.listens_for(engine, 'handle_error')
+    def _on_error(context):
+        # a consulta falhou: descarta o início registrado
+        started = context.connection and context.connection.info.get(
+            'query_started'
+        )
+        if started:
+            started.pop()
+
+
+class QueryStatsMiddleware:
+    """
+    Abre o contador de consultas da requisição, devolve o resumo no
+    cabeçalho `Server-Timing` e alimenta os histogramas de /metrics.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    'Server-Timing',
+                    f'db;dur={stats.duration * 1000:.1f};'
+                    f'desc="{stats.count} queries"',
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            route = route_label(scope)
+            DB_QUERIES.observe(stats.count, scope['method'], route)
+            DB_DURATION.observe(stats.duration, scope['method'], route)
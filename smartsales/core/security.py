@@ -11,7 +11,7 @@ from sqlalchemy.orm import Session
 
 from smartsales.core.database import get_session
 from smartsales.core.settings import Settings
-from smartsales.models.auth import Auth
+from smartsales.models.auth import Auth, UserRole
 
 settings = Settings()
 pwd_context = PasswordHash.recommended()
@@ -45,30 +45,39 @@ def create_refresh_token(data: dict):
     return encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-    session: Session = Depends(get_session),
-) -> Auth:
-    token = credentials.credentials
-    credentials_exception = HTTPException(
-        status_code=HTTPStatus.UNAUTHORIZED,
-        detail='Could not validate credentials',
-        headers={'WWW-Authenticate': 'Bearer'},
-    )
-
+def user_from_token(session: Session, token: str) -> Auth | None:
+    """Usuário do access token, ou None se inválido/expirado."""
     try:
         payload = decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        subject_email = payload.get('sub')
-        if not subject_email:
-            raise credentials_exception
     except (DecodeError, ExpiredSignatureError):
-        raise credentials_exception
-
+        return None
+    subject_email = payload.get('sub')
+    if not subject_email:
+        return None
     # aqui é síncrono, sem await
-    user = session.scalar(select(Auth).where(Auth.email == subject_email))
+    return session.scalar(select(Auth).where(Auth.email == subject_email))
+
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    session: Session = Depends(get_session),
+) -> Auth:
+    user = user_from_token(session, credentials.credentials)
     if not user:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=HTTPStatus.UNAUTHORIZED,
+            detail='Could not validate credentials',
+            headers={'WWW-Authenticate': 'Bearer'},
+        )
 
     return user
+
+
+def get_current_admin(current_user: Auth = Depends(get_current_user)) -> Auth:
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=HTTPStatus.FORBIDDEN, detail='Admin access required'
+        )
+    return current_user
@@ -11,3 +11,109 @@ class Settings(BaseSettings):
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     GROQ_API_KEY: str
+
+    # Limites para o SQL gerado pelo LLM (/api/search?database=true)
+    SEARCH_SQL_MAX_ROWS: int = 200
+    SEARCH_SQL_STATEMENT_TIMEOUT_MS: int = 5000
+    SEARCH_SQL_MAX_COST: float = 100_000
+
+    # Orçamento do resultado enviado ao LLM para explicar a consulta
+    SEARCH_RESULT_TOKEN_BUDGET: int = 2000
+    SEARCH_RESULT_TOP_K: int = 5
+
+    # Gravação do histórico de pesquisas em lote
+    SEARCH_HISTORY_BATCH_SIZE: int = 50
+    SEARCH_HISTORY_FLUSH_MS: int = 500
+    SEARCH_HISTORY_FALLBACK_PATH: str = 'search_history.jsonl'
+
+    # Chamadas ao LLM (Groq): concorrência por processo e retentativas
+    LLM_MAX_CONCURRENCY: int = 4
+    LLM_QUEUE_TIMEOUT: float = 10
+    LLM_MAX_RETRIES: int = 3
+    LLM_RETRY_BASE_DELAY: float = 0.5
+
+    # Upload de imagens de produtos
+    UPLOAD_PREFIX: str = 'uploads'
+    UPLOAD_STAGING_PREFIX: str = 'staging'
+    UPLOAD_MAX_BYTES: int = 5 * 1024 * 1024
+    UPLOAD_CHUNK_SIZE: int = 256 * 1024
+
+    # Variantes (miniaturas WebP) das imagens de produtos
+    IMAGE_VARIANT_WIDTHS: list[int] = [160, 480, 960]
+    IMAGE_VARIANT_WORKERS: int = 2
+
+    # Storage das imagens: 'local' (servido em /static) ou 's3'
+    STORAGE_BACKEND: str = 'local'
+    STORAGE_LOCAL_ROOT: str = 'smartsales/static'
+    STORAGE_PRESIGN_EXPIRES: int = 900
+    S3_BUCKET: str = ''
+    S3_ENDPOINT_URL: str | None = None
+    S3_REGION: str | None = None
+    S3_ACCESS_KEY_ID: str | None = None
+    S3_SECRET_ACCESS_KEY: str | None = None
+    S3_PUBLIC_URL: str = ''
+
+    # Alertas de estoque baixo e validade próxima
+    ALERT_LOW_STOCK_THRESHOLD: int = 5
+    ALERT_EXPIRY_DAYS: int = 30
+    ALERT_MAX_ITEMS: int = 100
+    ALERT_CACHE_TTL: int = 60
+    ALERT_CACHE_MAX_ENTRIES: int = 256
+
+    # Notificações pela WhatsApp Cloud API (opcional)
+    WHATSAPP_TOKEN: str | None = None
+    WHATSAPP_PHONE_NUMBER_ID: str | None = None
+    WHATSAPP_ALERT_TO: str | None = None
+
+    # Cache de entidades (produtos): 'memory' (LRU por processo) ou 'redis'
+    CACHE_BACKEND: str = 'memory'
+    CACHE_REDIS_URL: str = 'redis://localhost:6379/0'
+    CACHE_MAX_ENTRIES: int = 1024
+    CACHE_TTL: int = 300
+
+    # Métricas Prometheus em /metrics
+    METRICS_ENABLED: bool = True
+
+    # Instrumentação SQL: contagem por requisição e log de consultas lentas
+    SQL_STATS_ENABLED: bool = True
+    SQL_SLOW_QUERY_MS: float = 200
+    SQL_EXPLAIN_SLOW: bool = True
+
+    # Profiler por amostragem (admin): /api/admin/profile e X-Profile
+    PROFILING_ENABLED: bool = False
+    PROFILING_MAX_SECONDS: int = 60
+    PROFILING_INTERVAL_MS: float = 5
+
+    # Reservas de estoque: validade padrão/máxima
+    RESERVATION_TTL_SECONDS: int = 900
+    RESERVATION_MAX_TTL_SECONDS: int = 3600
+
+    # Idempotency-Key do POST /api/orders/: por quanto tempo vale
+    IDEMPOTENCY_TTL_SECONDS: int = 86400
+
+    # Outbox de eventos (pedidos/produtos): entrega e feed /api/events
+    OUTBOX_DISPATCH_SECONDS: float = 1
+    OUTBOX_BATCH_SIZE: int = 500
+    OUTBOX_RETENTION_DAYS: int = 7
+    OUTBOX_MAX_ATTEMPTS: int = 5
+    OUTBOX_LEASE_SECONDS: float = 60
+    OUTBOX_FEED_SETTLE_SECONDS: float = 2
+    # destinos opcionais: arquivo JSON lines e tipos avisados no WhatsApp
+    OUTBOX_FILE_PATH: str = ''
+    OUTBOX_WHATSAPP_EVENTS: str = ''
+
+    # Tarefas em background: workers/fila por processo, busca no banco,
+    # tentativas (backoff exponencial) e prazo para retomar tarefas de
+    # um worker que caiu
+    JOB_WORKERS: int = 4
+    JOB_QUEUE_SIZE: int = 100
+    JOB_POLL_SECONDS: float = 1
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BASE_SECONDS: float = 5
+    JOB_LEASE_SECONDS: float = 300
+    JOB_SHUTDOWN_SECONDS: float = 30
+    JOB_RETENTION_DAYS: int = 7
+
+    # Intervalo das limpezas periódicas (reservas, chaves expiradas,
+    # eventos já entregues, tarefas concluídas)
+    MAINTENANCE_SWEEP_SECONDS: float = 30
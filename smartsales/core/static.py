@@ -0,0 +1,72 @@
+import os
+import re
+from mimetypes import guess_type
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+# <sha256>.<ext> ou <sha256>_w<largura>.webp (ver images_service)
+HASHED_NAME = re.compile(r'^(?P<digest>[0-9a-f]{64})(?:_w\d+)?\.\w+$')
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'public, no-cache'
+
+# extensão do arquivo pré-comprimido -> Content-Encoding
+PRECOMPRESSED = (('.br', 'br'), ('.gz', 'gzip'))
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles com cabeçalhos de cache:
+      - arquivos com nome = hash do conteúdo recebem ETag forte
+        (derivado do nome) e `Cache-Control: immutable` por um ano;
+      - demais arquivos são revalidados a cada uso (ETag de mtime/size);
+      - se existir `<arquivo>.br`/`.gz` e o cliente aceitar, ele é
+        servido com Content-Encoding correspondente.
+    Range requests continuam a cargo do FileResponse do Starlette.
+    """
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        name = os.path.basename(full_path)
+        match = HASHED_NAME.match(name)
+        headers = {
+            'cache-control': IMMUTABLE if match else REVALIDATE,
+            'vary': 'Accept-Encoding',
+        }
+
+        accepted = request_headers.get('accept-encoding', '')
+        media_type = None
+        for suffix, encoding in PRECOMPRESSED:
+            candidate = f'{full_path}{suffix}'
+            if encoding in accepted and os.path.isfile(candidate):
+                # tipo do arquivo original, não do .br/.gz
+                media_type = guess_type(name)[0] or 'application/octet-stream'
+                full_path, stat_result = candidate, os.stat(candidate)
+                headers['content-encoding'] = encoding
+                break
+
+        if match:
+            tag = match.group(0)
+            if 'content-encoding' in headers:
+                tag += f'-{headers["content-encoding"]}'
+            headers['etag'] = f'"{tag}"'
+
+        response = FileResponse(
+            full_path,
+            status_code=status_code,
+            headers=headers,
+            media_type=media_type,
+            stat_result=stat_result,
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,208 @@
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+
+from smartsales.core.settings import Settings
+from smartsales.core.static import IMMUTABLE
+
+try:
+    import boto3
+except ImportError:  # boto3 é opcional (extra "s3")
+    boto3 = None
+
+
+class BlobStorage(ABC):
+    """
+    Armazenamento das imagens de produtos. As chaves são relativas
+    (ex.: `uploads/<sha256>.png`); `ref()` devolve o valor gravado em
+    Product.images.
+    """
+
+    # diretório para arquivos temporários antes do `put_path`
+    staging_dir: Path
+
+    @abstractmethod
+    def put_path(self, key: str, path: Path, content_type: str) -> str:
+        """Move/envia o arquivo local `path` para `key` e retorna a ref."""
+
+    @abstractmethod
+    def promote(self, staged_key: str, key: str, content_type: str) -> str:
+        """
+        Move o objeto `staged_key` (upload direto já verificado) para a
+        chave definitiva `key` e retorna a ref. Se `key` já existe, o
+        conteúdo é o mesmo (chave por hash): só descarta o staged.
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    def exists(self, key: str) -> bool: ...
+
+    @abstractmethod
+    def ref(self, key: str) -> str: ...
+
+    @abstractmethod
+    def key_from_ref(self, ref: str) -> str: ...
+
+    @abstractmethod
+    @contextmanager
+    def local_copy(self, key: str) -> Iterator[Path]:
+        """Caminho local legível do objeto enquanto o contexto durar."""
+
+    def presign_upload(
+        self, key: str, content_type: str, max_bytes: int, expires: int
+    ) -> dict:
+        """
+        Dados para o cliente enviar o arquivo direto ao storage. `key`
+        deve ser uma chave de staging nova: o POST pode gravar qualquer
+        conteúdo nela.
+        """
+        raise NotImplementedError
+
+
+class LocalStorage(BlobStorage):
+    """Disco local, servido pelo mount /static."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self.staging_dir = self.root
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def put_path(self, key: str, path: Path, content_type: str) -> str:
+        target = self.root / key
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(path, target)  # atômico no mesmo sistema de arquivos
+        return self.ref(key)
+
+    def promote(self, staged_key: str, key: str, content_type: str) -> str:
+        if self.exists(key):
+            self.delete(staged_key)
+            return self.ref(key)
+        return self.put_path(key, self.root / staged_key, content_type)
+
+    def delete(self, key: str) -> None:
+        (self.root / key).unlink(missing_ok=True)
+
+    def exists(self, key: str) -> bool:
+        return (self.root / key).is_file()
+
+    def ref(self, key: str) -> str:
+        return (self.root / key).as_posix()
+
+    def key_from_ref(self, ref: str) -> str:
+        return Path(ref).relative_to(self.root).as_posix()
+
+    @contextmanager
+    def local_copy(self, key: str) -> Iterator[Path]:
+        yield self.root / key
+
+
+class S3Storage(BlobStorage):
+    """
+    Bucket S3 ou compatível (MinIO etc.). Os uploads usam o
+    `upload_file` do boto3 (multipart, em streaming a partir do disco).
+    """
+
+    def __init__(self, client, bucket: str, public_url: str):
+        self.client = client
+        self.bucket = bucket
+        self.public_url = public_url.rstrip('/')
+        self.staging_dir = Path(tempfile.gettempdir())
+
+    def put_path(self, key: str, path: Path, content_type: str) -> str:
+        try:
+            if not self.exists(key):
+                self.client.upload_file(
+                    str(path),
+                    self.bucket,
+                    key,
+                    ExtraArgs={
+                        'ContentType': content_type,
+                        'CacheControl': IMMUTABLE,
+                    },
+                )
+        finally:
+            os.unlink(path)
+        return self.ref(key)
+
+    def promote(self, staged_key: str, key: str, content_type: str) -> str:
+        try:
+            if not self.exists(key):
+                # cópia no próprio bucket: os bytes não passam pela API
+                self.client.copy_object(
+                    Bucket=self.bucket,
+                    Key=key,
+                    CopySource={'Bucket': self.bucket, 'Key': staged_key},
+                    ContentType=content_type,
+                    CacheControl=IMMUTABLE,
+                    MetadataDirective='REPLACE',
+                )
+        finally:
+            self.delete(staged_key)
+        return self.ref(key)
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+        except Exception as e:
+            code = getattr(e, 'response', {}).get('Error', {}).get('Code')
+            if code in {'404', 'NoSuchKey', 'NotFound'}:
+                return False
+            raise
+        return True
+
+    def ref(self, key: str) -> str:
+        return f'{self.public_url}/{key}'
+
+    def key_from_ref(self, ref: str) -> str:
+        return ref.removeprefix(f'{self.public_url}/')
+
+    @contextmanager
+    def local_copy(self, key: str) -> Iterator[Path]:
+        fd, name = tempfile.mkstemp(suffix=Path(key).suffix)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                self.client.download_fileobj(self.bucket, key, f)
+            yield Path(name)
+        finally:
+            os.unlink(name)
+
+    def presign_upload(
+        self, key: str, content_type: str, max_bytes: int, expires: int
+    ) -> dict:
+        return self.client.generate_presigned_post(
+            Bucket=self.bucket,
+            Key=key,
+            Fields={'Content-Type': content_type, 'Cache-Control': IMMUTABLE},
+            Conditions=[
+                {'Content-Type': content_type},
+                {'Cache-Control': IMMUTABLE},
+                ['content-length-range', 1, max_bytes],
+            ],
+            ExpiresIn=expires,
+        )
+
+
+@lru_cache
+def get_storage() -> BlobStorage:
+    settings = Settings()
+    if settings.STORAGE_BACKEND == 's3':
+        if boto3 is None:
+            raise RuntimeError('STORAGE_BACKEND=s3 requer o pacote boto3')
+        client = boto3.client(
+            's3',
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            region_name=settings.S3_REGION,
+            aws_access_key_id=settings.S3_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+        )
+        return S3Storage(client, settings.S3_BUCKET, settings.S3_PUBLIC_URL)
+    return LocalStorage(settings.STORAGE_LOCAL_ROOT)
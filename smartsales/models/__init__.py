@@ -9,4 +9,9 @@ from smartsales.models import auth
 from smartsales.models import clients
 from smartsales.models import products
 from smartsales.models import orders
-from smartsales.models import search
\ No newline at end of file
+from smartsales.models import search
+from smartsales.models import rollups
+from smartsales.models import reservations
+from smartsales.models import idempotency
+from smartsales.models import outbox
+from smartsales.models import jobs
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, String, func
+from sqlalchemy import ForeignKey, Integer, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from smartsales.models import table_registry
@@ -27,3 +27,10 @@ class Client:
     updated_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now(), onupdate=func.now()
     )
+    # controle otimista de concorrência (ver Product.version); a soma
+    # das versões entra no ETag da listagem
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, init=False, server_default='1'
+    )
+
+    __mapper_args__ = {'version_id_col': version}
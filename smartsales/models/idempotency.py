@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, ForeignKey, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from smartsales.models import table_registry
+
+
+@table_registry.mapped_as_dataclass
+class IdempotencyKey:
+    """
+    Chave `Idempotency-Key` de um POST já processado: a impressão
+    digital do corpo e a resposta devolvida, para que retentativas
+    recebam a mesma resposta sem reexecutar o pedido.
+    """
+
+    __tablename__ = 'idempotency_keys'
+
+    owner_id: Mapped[int] = mapped_column(
+        ForeignKey('auth.id'), primary_key=True
+    )
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    # sha256 do método, rota e corpo da requisição original
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(nullable=False, index=True)
+    order_id: Mapped[int] = mapped_column(
+        ForeignKey('orders.id', ondelete='SET NULL'),
+        nullable=True,
+        init=False,
+        default=None,
+    )
+    status_code: Mapped[int] = mapped_column(
+        Integer, nullable=True, init=False, default=None
+    )
+    response: Mapped[dict] = mapped_column(
+        JSON, nullable=True, init=False, default=None
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        init=False, server_default=func.now()
+    )
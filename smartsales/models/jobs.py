@@ -0,0 +1,49 @@
+from datetime import datetime
+from enum import Enum
+
+from sqlalchemy import JSON, Index, Integer, String, Text, func
+from sqlalchemy import Enum as SqlEnum
+from sqlalchemy.orm import Mapped, mapped_column
+
+from smartsales.models import table_registry
+
+
+class JobStatus(str, Enum):
+    queued = 'queued'  # aguardando (ou esperando a próxima tentativa)
+    running = 'running'
+    succeeded = 'succeeded'
+    failed = 'failed'  # esgotou as tentativas
+
+
+@table_registry.mapped_as_dataclass
+class Job:
+    """
+    Tarefa em background persistida: sobrevive a reinícios e é
+    executada pelo JobRunner de qualquer worker (ver jobs_service).
+    """
+
+    __tablename__ = 'jobs'
+    # busca do runner: tarefas na fila já liberadas para execução
+    __table_args__ = (
+        Index('ix_jobs_status_run_after', 'status', 'run_after'),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, init=False)
+    name: Mapped[str] = mapped_column(String(64), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False)
+    run_after: Mapped[datetime] = mapped_column(nullable=False)
+    owner_id: Mapped[int] = mapped_column(Integer, nullable=True, default=None)
+    status: Mapped[JobStatus] = mapped_column(
+        SqlEnum(JobStatus), nullable=False, default=JobStatus.queued
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_error: Mapped[str] = mapped_column(Text, nullable=True, default=None)
+    started_at: Mapped[datetime] = mapped_column(nullable=True, default=None)
+    finished_at: Mapped[datetime] = mapped_column(nullable=True, default=None)
+    created_at: Mapped[datetime] = mapped_column(
+        init=False, server_default=func.now()
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        init=False, server_default=func.now(), onupdate=func.now()
+    )
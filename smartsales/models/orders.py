@@ -5,6 +5,7 @@ from sqlalchemy import (
     DECIMAL,
     ForeignKey,
     Integer,
+    String,
     func,
 )
 from sqlalchemy import (
@@ -26,6 +27,32 @@ class OrderStatus(str, Enum):
     canceled = 'canceled'
 
 
+# status -> próximos status permitidos; entregue e cancelado são finais
+ORDER_TRANSITIONS: dict[OrderStatus, frozenset[OrderStatus]] = {
+    OrderStatus.pending: frozenset({
+        OrderStatus.confirmed,
+        OrderStatus.canceled,
+    }),
+    OrderStatus.confirmed: frozenset({
+        OrderStatus.shipped,
+        OrderStatus.canceled,
+    }),
+    OrderStatus.shipped: frozenset({OrderStatus.delivered}),
+    OrderStatus.delivered: frozenset(),
+    OrderStatus.canceled: frozenset(),
+}
+
+
+def can_transition(current: OrderStatus, new: OrderStatus) -> bool:
+    """Manter o mesmo status é sempre permitido."""
+    return current == new or new in ORDER_TRANSITIONS[current]
+
+
+def statuses_leading_to(new: OrderStatus) -> set[OrderStatus]:
+    """Status a partir dos quais `new` é uma transição válida."""
+    return {status for status, nxt in ORDER_TRANSITIONS.items() if new in nxt}
+
+
 @table_registry.mapped_as_dataclass
 class Order:
     __tablename__ = 'orders'
@@ -53,6 +80,11 @@ class Order:
         init=False, server_default=func.now(), onupdate=func.now()
     )
 
+    # controle otimista de concorrência (ver Product.version)
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, init=False, server_default='1'
+    )
+
     # relacionamento com itens
     items: Mapped[list['OrderItem']] = relationship(
         'OrderItem',
@@ -62,6 +94,8 @@ class Order:
         lazy='joined',
     )
 
+    __mapper_args__ = {'version_id_col': version}
+
 
 @table_registry.mapped_as_dataclass
 class OrderItem:
@@ -85,6 +119,8 @@ class OrderItem:
     quantity: Mapped[int] = mapped_column(Integer, nullable=False)
     unit_price: Mapped[float] = mapped_column(DECIMAL(10, 2), nullable=False)
     total_price: Mapped[float] = mapped_column(DECIMAL(10, 2), nullable=False)
+    # seção do produto no momento da venda (base dos agregados por seção)
+    section: Mapped[str] = mapped_column(String, nullable=False)
 
     created_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now()
@@ -0,0 +1,92 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, Index, Integer, String, func, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql.functions import FunctionElement
+
+from smartsales.models import table_registry
+
+
+class utc_clock(FunctionElement):  # noqa: N801
+    """
+    Relógio UTC do banco no instante da instrução (não o início da
+    transação, como `now()`), opcionalmente menos `seconds`.
+    """
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utc_clock, 'postgresql')
+def _utc_clock_postgresql(element, compiler, **kw):
+    clock = "(clock_timestamp() AT TIME ZONE 'utc')"
+    if not element.clauses.clauses:
+        return clock
+    seconds = compiler.process(element.clauses, **kw)
+    return f'({clock} - make_interval(secs => {seconds}))'
+
+
+@compiles(utc_clock, 'sqlite')
+def _utc_clock_sqlite(element, compiler, **kw):
+    if not element.clauses.clauses:
+        return "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+    seconds = compiler.process(element.clauses, **kw)
+    return (
+        "strftime('%Y-%m-%d %H:%M:%f', 'now', "
+        f"'-' || ({seconds}) || ' seconds')"
+    )
+
+
+@table_registry.mapped_as_dataclass
+class OutboxEvent:
+    """
+    Evento de mudança (pedido/produto) gravado na mesma transação da
+    mudança. O `id` crescente é o cursor do feed (/api/events); com
+    vários dispatchers, a ordem de entrega entre lotes não é garantida.
+    """
+
+    __tablename__ = 'outbox_events'
+    __table_args__ = (
+        # feed de um usuário: eventos dos seus recursos após o cursor
+        Index('ix_outbox_events_owner_id_id', 'owner_id', 'id'),
+        # fila do dispatcher: só os ainda não entregues nem estacionados
+        Index(
+            'ix_outbox_events_pending',
+            'id',
+            postgresql_where=text(
+                'dispatched_at IS NULL AND failed_at IS NULL'
+            ),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, init=False)
+    # ex.: order.created, order.status_changed, product.deleted
+    event_type: Mapped[str] = mapped_column(String(64), nullable=False)
+    aggregate: Mapped[str] = mapped_column(String(32), nullable=False)
+    aggregate_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    owner_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    # momento do INSERT (pouco antes do commit), pelo relógio do banco:
+    # é com ele que o feed calcula a janela de acomodação
+    created_at: Mapped[datetime] = mapped_column(
+        init=False, insert_default=utc_clock(), server_default=func.now()
+    )
+    dispatched_at: Mapped[datetime] = mapped_column(
+        nullable=True, init=False, default=None
+    )
+    # entrega: lote reservado por um dispatcher (lease), tentativas e
+    # último erro; após OUTBOX_MAX_ATTEMPTS o evento é estacionado
+    # (failed_at) e não bloqueia mais a fila
+    claimed_at: Mapped[datetime] = mapped_column(
+        nullable=True, init=False, default=None
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer, nullable=False, init=False, default=0, server_default='0'
+    )
+    last_error: Mapped[str] = mapped_column(
+        String, nullable=True, init=False, default=None
+    )
+    failed_at: Mapped[datetime] = mapped_column(
+        nullable=True, init=False, default=None
+    )
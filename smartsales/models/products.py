@@ -17,16 +17,34 @@ class Product:
     section: Mapped[str] = mapped_column(String, nullable=False)
     description: Mapped[str] = mapped_column(String, nullable=True)
     barcode: Mapped[str] = mapped_column(String, unique=True, nullable=True)
-    stock: Mapped[int] = mapped_column(Integer, nullable=True)
-    expiry_date: Mapped[date] = mapped_column(Date, nullable=True)
+    # indexados para as consultas de alerta (estoque baixo/validade)
+    stock: Mapped[int] = mapped_column(Integer, nullable=True, index=True)
+    expiry_date: Mapped[date] = mapped_column(Date, nullable=True, index=True)
     images: Mapped[list[str]] = mapped_column(JSON, nullable=True)
     owner_id: Mapped[int] = mapped_column(
         ForeignKey('auth.id'), nullable=False
     )
     owner: Mapped[Auth] = relationship('Auth', init=False, lazy='joined')
+    # original -> {largura: caminho da variante WebP}
+    image_variants: Mapped[dict[str, dict[str, str]]] = mapped_column(
+        JSON, nullable=True, init=False, default=None
+    )
     created_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now()
     )
     updated_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now(), onupdate=func.now()
     )
+    # controle otimista de concorrência: todo UPDATE/DELETE confere e
+    # incrementa a versão (StaleDataError se outra transação mudou antes)
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, init=False, server_default='1'
+    )
+
+    # muda só quando os campos do cadastro (não o estoque) mudam: é a
+    # validade do cache de leitura (ver products_service)
+    content_version: Mapped[int] = mapped_column(
+        Integer, nullable=False, init=False, server_default='1'
+    )
+
+    __mapper_args__ = {'version_id_col': version}
@@ -0,0 +1,74 @@
+from datetime import datetime
+from enum import Enum
+
+from sqlalchemy import Enum as SqlEnum
+from sqlalchemy import ForeignKey, Index, Integer, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from smartsales.models import table_registry
+
+
+class ReservationStatus(str, Enum):
+    active = 'active'
+    consumed = 'consumed'  # virou pedido
+    released = 'released'  # liberada pelo cliente
+    expired = 'expired'  # liberada pelo sweeper
+
+
+@table_registry.mapped_as_dataclass
+class Reservation:
+    """
+    Reserva de estoque com validade: o estoque é baixado na criação e
+    devolvido se a reserva expirar ou for liberada antes de virar
+    pedido.
+    """
+
+    __tablename__ = 'stock_reservations'
+    # busca do sweeper: reservas ativas vencidas
+    __table_args__ = (
+        Index('ix_stock_reservations_status_expires', 'status', 'expires_at'),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, init=False)
+    owner_id: Mapped[int] = mapped_column(
+        ForeignKey('auth.id'), nullable=False
+    )
+    status: Mapped[ReservationStatus] = mapped_column(
+        SqlEnum(ReservationStatus), nullable=False
+    )
+    expires_at: Mapped[datetime] = mapped_column(nullable=False)
+    order_id: Mapped[int] = mapped_column(
+        ForeignKey('orders.id', ondelete='SET NULL'),
+        nullable=True,
+        init=False,
+        default=None,
+    )
+    items: Mapped[list['ReservationItem']] = relationship(
+        'ReservationItem',
+        cascade='all, delete-orphan',
+        init=False,
+        lazy='selectin',
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        init=False, server_default=func.now()
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        init=False, server_default=func.now(), onupdate=func.now()
+    )
+
+
+@table_registry.mapped_as_dataclass
+class ReservationItem:
+    __tablename__ = 'stock_reservation_items'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, init=False)
+    # preenchido ao adicionar o item em Reservation.items
+    reservation_id: Mapped[int] = mapped_column(
+        ForeignKey('stock_reservations.id', ondelete='CASCADE'),
+        nullable=False,
+        init=False,
+    )
+    product_id: Mapped[int] = mapped_column(
+        ForeignKey('products.id'), nullable=False
+    )
+    quantity: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -0,0 +1,51 @@
+from datetime import date
+
+from sqlalchemy import DECIMAL, Date, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from smartsales.models import table_registry
+
+# Agregados diários mantidos pelo orders_service (ver rollups_service).
+# Pedidos cancelados não entram; a seção é a do produto no momento da
+# venda.
+
+
+@table_registry.mapped_as_dataclass
+class DailySales:
+    __tablename__ = 'sales_daily'
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    owner_id: Mapped[int] = mapped_column(
+        ForeignKey('auth.id'), primary_key=True
+    )
+    orders: Mapped[int] = mapped_column(Integer, default=0)
+    items: Mapped[int] = mapped_column(Integer, default=0)
+    revenue: Mapped[float] = mapped_column(DECIMAL(14, 2), default=0)
+
+
+@table_registry.mapped_as_dataclass
+class DailyProductSales:
+    __tablename__ = 'product_sales_daily'
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    owner_id: Mapped[int] = mapped_column(
+        ForeignKey('auth.id'), primary_key=True
+    )
+    product_id: Mapped[int] = mapped_column(
+        ForeignKey('products.id', ondelete='CASCADE'), primary_key=True
+    )
+    quantity: Mapped[int] = mapped_column(Integer, default=0)
+    revenue: Mapped[float] = mapped_column(DECIMAL(14, 2), default=0)
+
+
+@table_registry.mapped_as_dataclass
+class DailySectionSales:
+    __tablename__ = 'section_sales_daily'
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    owner_id: Mapped[int] = mapped_column(
+        ForeignKey('auth.id'), primary_key=True
+    )
+    section: Mapped[str] = mapped_column(String, primary_key=True)
+    quantity: Mapped[int] = mapped_column(Integer, default=0)
+    revenue: Mapped[float] = mapped_column(DECIMAL(14, 2), default=0)
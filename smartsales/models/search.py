@@ -1,15 +1,27 @@
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, String, Text, func
+from sqlalchemy import ForeignKey, Index, String, Text, false, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from smartsales.models import table_registry
 from smartsales.models.auth import Auth
 
+# Expressão usada pelo índice GIN e pela busca textual no histórico;
+# precisa ser idêntica nos dois lugares para o índice ser utilizado.
+SEARCH_TSVECTOR = "to_tsvector('portuguese', query || ' ' || response)"
+
 
 @table_registry.mapped_as_dataclass
 class Search:
     __tablename__ = 'searches'
+    __table_args__ = (
+        Index('ix_searches_owner_id_created_at', 'owner_id', 'created_at'),
+        Index(
+            'ix_searches_fts',
+            text(SEARCH_TSVECTOR),
+            postgresql_using='gin',
+        ).ddl_if(dialect='postgresql'),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, init=False)
     query: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -17,6 +29,8 @@ class Search:
     database: Mapped[bool]
     owner_id: Mapped[int] = mapped_column(ForeignKey('auth.id'), nullable=True)
     owner: Mapped[Auth] = relationship('Auth', init=False, lazy='joined')
+    latency_ms: Mapped[int] = mapped_column(nullable=True, default=None)
+    cached: Mapped[bool] = mapped_column(default=False, server_default=false())
 
     created_at: Mapped[datetime] = mapped_column(
         init=False, server_default=func.now()
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends
+
+from smartsales.controllers.admin_controller import (
+    get_request_profile,
+    profile_process,
+)
+from smartsales.core.security import get_current_admin
+
+router = APIRouter(
+    prefix='/admin',
+    tags=['Admin'],
+    dependencies=[Depends(get_current_admin)],
+)
+
+router.get(
+    '/profile',
+    description='Sampling profile of this worker (speedscope/collapsed)',
+)(profile_process)
+router.get(
+    '/profile/requests/{profile_id}',
+    description='Profile of a request sent with X-Profile: 1',
+)(get_request_profile)
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends
+
+from smartsales.controllers.alerts_controller import list_alerts
+from smartsales.core.security import get_current_user
+from smartsales.schemas.alerts_schema import AlertsResponse
+
+router = APIRouter(
+    prefix='/alerts',
+    tags=['Alerts'],
+    dependencies=[Depends(get_current_user)],
+)
+
+router.get(
+    '/',
+    response_model=AlertsResponse,
+    description='Low-stock and near-expiry products',
+)(list_alerts)
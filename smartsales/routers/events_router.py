@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends
+
+from smartsales.controllers.events_controller import list_events
+from smartsales.core.security import get_current_user
+from smartsales.schemas.events_schema import EventFeedResponse
+
+router = APIRouter(
+    prefix='/events',
+    tags=['Events'],
+    dependencies=[Depends(get_current_user)],
+)
+
+router.get(
+    '/',
+    response_model=EventFeedResponse,
+    description='Change feed of orders and products after a cursor',
+)(list_events)
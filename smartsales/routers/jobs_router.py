@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends
+
+from smartsales.controllers.jobs_controller import retrieve_job
+from smartsales.core.security import get_current_user
+from smartsales.schemas.jobs_schema import JobResponse
+
+router = APIRouter(
+    prefix='/jobs',
+    tags=['Jobs'],
+    dependencies=[Depends(get_current_user)],
+)
+
+router.get(
+    '/{job_id}',
+    response_model=JobResponse,
+    description='Status of a background job',
+)(retrieve_job)
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, status
 
 from smartsales.controllers.orders_controller import (
+    bulk_transition_status,
     create_order,
     delete_order,
     list_orders,
@@ -11,6 +12,7 @@ from smartsales.core.security import get_current_user
 from smartsales.schemas.orders_schema import (
     OrderListResponse,
     OrderResponse,
+    OrderStatusBulkResult,
 )
 
 router = APIRouter(
@@ -32,6 +34,12 @@ router.post(
     description='Create new order',
 )(create_order)
 
+router.patch(
+    '/status',
+    response_model=OrderStatusBulkResult,
+    description='Change the status of many orders (valid transitions only)',
+)(bulk_transition_status)
+
 router.get(
     '/{order_id}',
     response_model=OrderResponse,
@@ -1,14 +1,17 @@
 from fastapi import APIRouter, Depends, status
 
 from smartsales.controllers.products_controller import (
+    confirm_product_image,
     create_product,
     delete_product,
     list_products,
+    presign_product_image,
     retrieve_product,
     update_product,
 )
 from smartsales.core.security import get_current_user
 from smartsales.schemas.products_schema import (
+    PresignedUploadResponse,
     ProductListResponse,
     ProductResponse,
 )
@@ -47,3 +50,15 @@ router.delete(
     status_code=status.HTTP_204_NO_CONTENT,
     description='Deçete products',
 )(delete_product)
+
+router.post(
+    '/{product_id}/images/presign',
+    response_model=PresignedUploadResponse,
+    description='Presigned URL for direct image upload',
+)(presign_product_image)
+
+router.post(
+    '/{product_id}/images/confirm',
+    response_model=ProductResponse,
+    description='Attach a directly uploaded image to the product',
+)(confirm_product_image)
@@ -0,0 +1,55 @@
+from typing import List
+
+from fastapi import APIRouter, Depends
+
+from smartsales.controllers.reports_controller import (
+    average_basket_report,
+    revenue_report,
+    sections_report,
+    top_clients_report,
+    top_products_report,
+)
+from smartsales.core.security import get_current_user
+from smartsales.schemas.reports_schema import (
+    AverageBasketResponse,
+    RevenueSeriesResponse,
+    SectionRevenue,
+    TopClient,
+    TopProduct,
+)
+
+router = APIRouter(
+    prefix='/reports',
+    tags=['Reports'],
+    dependencies=[Depends(get_current_user)],
+)
+
+router.get(
+    '/revenue',
+    response_model=RevenueSeriesResponse,
+    description='Revenue over time (day, week or month)',
+)(revenue_report)
+
+router.get(
+    '/top-products',
+    response_model=List[TopProduct],
+    description='Best selling products by revenue',
+)(top_products_report)
+
+router.get(
+    '/top-clients',
+    response_model=List[TopClient],
+    description='Clients with the highest revenue',
+)(top_clients_report)
+
+router.get(
+    '/sections',
+    response_model=List[SectionRevenue],
+    description='Revenue breakdown by product section',
+)(sections_report)
+
+router.get(
+    '/average-basket',
+    response_model=AverageBasketResponse,
+    description='Average ticket and items per order',
+)(average_basket_report)
@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends, status
+
+from smartsales.controllers.reservations_controller import (
+    create_reservation,
+    release_reservation,
+    retrieve_reservation,
+)
+from smartsales.core.security import get_current_user
+from smartsales.schemas.reservations_schema import ReservationResponse
+
+router = APIRouter(
+    prefix='/reservations',
+    tags=['Reservations'],
+    dependencies=[Depends(get_current_user)],
+)
+
+router.post(
+    '/',
+    response_model=ReservationResponse,
+    status_code=status.HTTP_201_CREATED,
+    description='Hold stock until the reservation expires',
+)(create_reservation)
+
+router.get(
+    '/{reservation_id}',
+    response_model=ReservationResponse,
+    description='Retrieve reservation',
+)(retrieve_reservation)
+
+router.delete(
+    '/{reservation_id}',
+    status_code=status.HTTP_204_NO_CONTENT,
+    description='Release reserved stock',
+)(release_reservation)
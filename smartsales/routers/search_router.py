@@ -1,7 +1,15 @@
 from fastapi import APIRouter
 
-from smartsales.controllers.search_controller import search_query
-from smartsales.schemas.search_schema import SearchOut
+from smartsales.controllers.search_controller import (
+    search_history_controller,
+    search_query,
+    search_stats_controller,
+)
+from smartsales.schemas.search_schema import (
+    SearchHistoryResponse,
+    SearchOut,
+    SearchStatsResponse,
+)
 
 router = APIRouter(prefix='/search', tags=['Search'])
 
@@ -10,3 +18,13 @@ router.get(
     response_model=SearchOut,
     description='Realiza busca usando Groq/Llama no SmartSales',
 )(search_query)
+router.get(
+    '/history',
+    response_model=SearchHistoryResponse,
+    description='Histórico de pesquisas (paginação por cursor)',
+)(search_history_controller)
+router.get(
+    '/stats',
+    response_model=SearchStatsResponse,
+    description='Estatísticas do histórico de pesquisas',
+)(search_stats_controller)
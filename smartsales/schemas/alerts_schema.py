@@ -0,0 +1,19 @@
+from datetime import date
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class AlertProduct(BaseModel):
+    id: int
+    title: str
+    section: str
+    stock: Optional[int]
+    expiry_date: Optional[date]
+
+
+class AlertsResponse(BaseModel):
+    threshold: int
+    days: int
+    low_stock: List[AlertProduct]
+    expiring: List[AlertProduct]
@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import List
+
+from pydantic import BaseModel
+
+
+class EventResponse(BaseModel):
+    id: int
+    event_type: str
+    aggregate: str
+    aggregate_id: int
+    payload: dict
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class EventFeedResponse(BaseModel):
+    events: List[EventResponse]
+    # enviar como `since` na próxima chamada
+    next_cursor: int
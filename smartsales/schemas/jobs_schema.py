@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+from smartsales.models.jobs import JobStatus
+
+
+class JobResponse(BaseModel):
+    id: int
+    name: str
+    status: JobStatus
+    attempts: int
+    max_attempts: int
+    # próxima tentativa (status queued)
+    run_after: datetime
+    last_error: Optional[str]
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -54,6 +54,11 @@ class OrderCreate(BaseModel):
     items: List[OrderItemCreate] = Field(
         ..., description='Lista de itens (product_id e quantity) do pedido'
     )
+    reservation_id: Optional[int] = Field(
+        None,
+        gt=0,
+        description='Reserva de estoque ativa a converter neste pedido',
+    )
 
     @model_validator(mode='after')
     def must_have_at_least_one_item(cls, model):
@@ -65,7 +70,8 @@ class OrderCreate(BaseModel):
 class OrderUpdate(BaseModel):
     client_id: int = Field(..., gt=0)
     status: Optional[OrderStatus] = Field(
-        OrderStatus.pending, description='Status inicial do pedido'
+        None,
+        description='Novo status (transição válida); omitido mantém o atual',
     )
     items: List[OrderItemCreate] = Field(
         ..., description='Lista de itens (product_id e quantity) do pedido'
@@ -96,6 +102,8 @@ class OrderResponse(BaseModel):
     owner: OwnerSchema
     created_at: datetime
     updated_at: datetime
+    # versão atual; o ETag do recurso é "<version>" (usar em If-Match)
+    version: int
 
     class Config:
         from_attributes = True
@@ -118,3 +126,23 @@ class OrderListItem(BaseModel):
 class OrderListResponse(BaseModel):
     total: int
     items: List[OrderListItem]
+
+
+#
+# 4. Schemas para transição de status em lote
+#
+class OrderStatusBulkUpdate(BaseModel):
+    ids: List[PositiveInt] = Field(..., min_length=1, max_length=10_000)
+    status: OrderStatus
+
+
+class OrderStatusFailure(BaseModel):
+    id: int
+    # status atual do pedido (None se não existe ou não é visível)
+    status: Optional[OrderStatus]
+    detail: str
+
+
+class OrderStatusBulkResult(BaseModel):
+    updated: List[int]
+    failed: List[OrderStatusFailure]
@@ -1,8 +1,8 @@
 from datetime import date
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from fastapi import Form
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, computed_field
 
 
 class ProductBase(BaseModel):
@@ -87,7 +87,25 @@ class ProductResponse(ProductBase):
     stock: Optional[int]
     expiry_date: Optional[date]
     images: Optional[List[str]]
+    # original -> {largura: variante WebP}; preenchido após o upload
+    image_variants: Optional[Dict[str, Dict[str, str]]] = None
     owner: OwnerSchema
+    # versão atual; o ETag do recurso é "<version>" (usar em If-Match)
+    version: int
+    # tarefa que gera as variantes das imagens enviadas nesta escrita
+    # (acompanhar em /api/jobs/{id}); None se nada foi enfileirado
+    variants_job_id: Optional[int] = None
+
+    @computed_field
+    @property
+    def thumbnail(self) -> Optional[str]:
+        """Menor variante da primeira imagem (ou o original)."""
+        if not self.images:
+            return None
+        sizes = (self.image_variants or {}).get(self.images[0])
+        if not sizes:
+            return self.images[0]
+        return sizes[min(sizes, key=int)]
 
     class Config:
         from_attributes = True
@@ -96,3 +114,18 @@ class ProductResponse(ProductBase):
 class ProductListResponse(BaseModel):
     total: int
     items: List[ProductResponse]
+
+
+class ImageUploadRequest(BaseModel):
+    content_type: str
+    size: int = Field(..., gt=0)
+
+
+class PresignedUploadResponse(BaseModel):
+    key: str
+    url: str
+    fields: Dict[str, str]
+
+
+class ImageConfirmRequest(BaseModel):
+    key: str
@@ -0,0 +1,43 @@
+from datetime import date
+from decimal import Decimal
+from typing import List, Literal
+
+from pydantic import BaseModel
+
+
+class RevenuePoint(BaseModel):
+    period: date
+    orders: int
+    revenue: Decimal
+
+
+class RevenueSeriesResponse(BaseModel):
+    granularity: Literal['day', 'week', 'month']
+    items: List[RevenuePoint]
+
+
+class TopProduct(BaseModel):
+    product_id: int
+    title: str
+    quantity: int
+    revenue: Decimal
+
+
+class TopClient(BaseModel):
+    client_id: int
+    name: str
+    orders: int
+    revenue: Decimal
+
+
+class SectionRevenue(BaseModel):
+    section: str
+    quantity: int
+    revenue: Decimal
+
+
+class AverageBasketResponse(BaseModel):
+    orders: int
+    revenue: Decimal
+    average_ticket: Decimal
+    average_items: Decimal
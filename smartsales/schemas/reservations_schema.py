@@ -0,0 +1,38 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, PositiveInt
+
+from smartsales.models.reservations import ReservationStatus
+
+
+class ReservationItemIn(BaseModel):
+    product_id: int = Field(..., gt=0)
+    quantity: PositiveInt
+
+
+class ReservationCreate(BaseModel):
+    items: List[ReservationItemIn] = Field(..., min_length=1)
+    ttl_seconds: Optional[int] = Field(
+        None, gt=0, description='Validade da reserva (padrão nas settings)'
+    )
+
+
+class ReservationItemResponse(BaseModel):
+    product_id: int
+    quantity: int
+
+    class Config:
+        from_attributes = True
+
+
+class ReservationResponse(BaseModel):
+    id: int
+    status: ReservationStatus
+    expires_at: datetime
+    order_id: Optional[int]
+    items: List[ReservationItemResponse]
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import List, Optional
 
 from pydantic import BaseModel
 
@@ -13,10 +14,43 @@ class SearchCreate(SearchBase):
 
 
 class SearchOut(SearchBase):
+    # None quando a gravação ainda está na fila (ver SearchHistoryQueue)
+    id: int | None = None
+    response: str
+    owner_id: int | None = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class SearchHistoryItem(SearchBase):
     id: int
     response: str
-    owner_id: int
+    owner_id: int | None = None
+    latency_ms: int | None = None
+    cached: bool = False
     created_at: datetime
 
     class Config:
         from_attributes = True
+
+
+class SearchHistoryResponse(BaseModel):
+    items: List[SearchHistoryItem]
+    # cursor para a próxima página (None quando não há mais itens)
+    next_cursor: Optional[str] = None
+
+
+class FrequentQuestion(BaseModel):
+    query: str
+    total: int
+
+
+class SearchStatsResponse(BaseModel):
+    total: int
+    cache_hit_ratio: float
+    latency_p50_ms: Optional[float] = None
+    latency_p95_ms: Optional[float] = None
+    latency_p99_ms: Optional[float] = None
+    top_questions: List[FrequentQuestion]
@@ -0,0 +1,233 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Optional
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from smartsales.core.settings import Settings
+from smartsales.models.auth import UserRole
+from smartsales.models.products import Product
+from smartsales.utils.whatsapp import send_whatsapp_message
+
+logger = logging.getLogger(__name__)
+settings = Settings()
+
+# chaves em Session.info usadas entre o serviço e os eventos de commit
+_PENDING = 'stock_changes'
+_READY = 'stock_alerts'
+
+AlertHandler = Callable[[dict], None]
+_handlers: list[AlertHandler] = []
+_notifier: ThreadPoolExecutor | None = None
+
+# (owner_id | None, threshold, days, hoje) -> (expira_em, resultado);
+# LRU limitado a ALERT_CACHE_MAX_ENTRIES (threshold/days vêm da query)
+_cache: OrderedDict[tuple, tuple[float, dict]] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def is_low_stock(stock: Optional[int], threshold: int) -> bool:
+    return stock is not None and stock <= threshold
+
+
+#
+# Consultas (usam os índices de products.stock e products.expiry_date)
+#
+def low_stock_products(
+    db: Session,
+    owner_id: Optional[int],
+    threshold: int,
+    limit: int,
+) -> list[dict]:
+    stmt = select(
+        Product.id,
+        Product.title,
+        Product.section,
+        Product.stock,
+        Product.expiry_date,
+    ).where(Product.stock <= threshold)
+    if owner_id is not None:
+        stmt = stmt.where(Product.owner_id == owner_id)
+    stmt = stmt.order_by(Product.stock, Product.id).limit(limit)
+    return [row._asdict() for row in db.execute(stmt)]
+
+
+def expiring_products(
+    db: Session,
+    owner_id: Optional[int],
+    days: int,
+    limit: int,
+    today: Optional[date] = None,
+) -> list[dict]:
+    """Produtos vencidos ou que vencem nos próximos `days` dias."""
+    today = today or date.today()
+    stmt = select(
+        Product.id,
+        Product.title,
+        Product.section,
+        Product.stock,
+        Product.expiry_date,
+    ).where(Product.expiry_date <= today + timedelta(days=days))
+    if owner_id is not None:
+        stmt = stmt.where(Product.owner_id == owner_id)
+    stmt = stmt.order_by(Product.expiry_date, Product.id).limit(limit)
+    return [row._asdict() for row in db.execute(stmt)]
+
+
+def alerts_service(
+    db: Session,
+    current_user,
+    threshold: Optional[int] = None,
+    days: Optional[int] = None,
+) -> dict:
+    """
+    Produtos com estoque baixo e com validade próxima. O resultado fica
+    em cache por ALERT_CACHE_TTL segundos e é invalidado quando um
+    commit altera o estoque de produtos do mesmo dono (no processo
+    atual; em outros workers vale o TTL).
+    """
+    threshold = (
+        settings.ALERT_LOW_STOCK_THRESHOLD if threshold is None else threshold
+    )
+    days = settings.ALERT_EXPIRY_DAYS if days is None else days
+    owner_id = current_user.id if current_user.role == UserRole.USER else None
+    today = date.today()
+    key = (owner_id, threshold, days, today)
+
+    now = time.monotonic()
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            if cached[0] > now:
+                _cache.move_to_end(key)
+                return cached[1]
+            del _cache[key]
+
+    result = {
+        'threshold': threshold,
+        'days': days,
+        'low_stock': low_stock_products(
+            db, owner_id, threshold, settings.ALERT_MAX_ITEMS
+        ),
+        'expiring': expiring_products(
+            db, owner_id, days, settings.ALERT_MAX_ITEMS, today
+        ),
+    }
+    with _cache_lock:
+        _cache[key] = (now + settings.ALERT_CACHE_TTL, result)
+        _cache.move_to_end(key)
+        while len(_cache) > settings.ALERT_CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return result
+
+
+def invalidate_alerts(owner_ids: Iterable[int]) -> None:
+    """Descarta o cache dos donos informados e a visão geral (admin)."""
+    owner_ids = set(owner_ids)
+    with _cache_lock:
+        for key in list(_cache):
+            if key[0] is None or key[0] in owner_ids:
+                del _cache[key]
+
+
+#
+# Avaliação incremental: os serviços informam as mudanças de estoque e
+# os alertas são disparados apenas após o commit.
+#
+def track_stock_change(
+    db: Session, product: Product, previous_stock: Optional[int]
+) -> None:
+    """
+    Registra a alteração de estoque de `product` na transação atual.
+    Vale o estoque anterior à primeira alteração, então reverter e
+    baixar o mesmo produto (update de pedido) não gera alerta falso.
+    """
+    pending = db.info.setdefault(_PENDING, {})
+    pending.setdefault(id(product), (previous_stock, product))
+
+
+def register_alert_handler(handler: AlertHandler) -> AlertHandler:
+    """Adiciona um destino para os alertas (pode ser usado como decorator)."""
+    _handlers.append(handler)
+    return handler
+
+
+def notify_whatsapp(alert: dict) -> None:
+    send_whatsapp_message(
+        f'Estoque baixo: {alert["title"]} (id={alert["product_id"]}) '
+        f'com {alert["stock"]} unidade(s).'
+    )
+
+
+register_alert_handler(notify_whatsapp)
+
+
+def _dispatch(alert: dict) -> None:
+    for handler in list(_handlers):
+        try:
+            handler(alert)
+        except Exception:
+            logger.exception('Falha no handler de alerta %r', handler)
+
+
+def _get_notifier() -> ThreadPoolExecutor:
+    global _notifier  # noqa: PLW0603
+    if _notifier is None:
+        _notifier = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='stock-alerts'
+        )
+    return _notifier
+
+
+def shutdown_alert_notifier() -> None:
+    global _notifier  # noqa: PLW0603
+    if _notifier is not None:
+        _notifier.shutdown(wait=True)
+        _notifier = None
+
+
+@event.listens_for(Session, 'before_commit')
+def _collect_stock_alerts(session: Session) -> None:
+    pending = session.info.pop(_PENDING, None)
+    if not pending:
+        return
+    session.flush()  # garante o id de produtos recém-criados
+    threshold = settings.ALERT_LOW_STOCK_THRESHOLD
+    alerts = [
+        {
+            'product_id': product.id,
+            'title': product.title,
+            'owner_id': product.owner_id,
+            'stock': product.stock,
+            'threshold': threshold,
+        }
+        for previous, product in pending.values()
+        if is_low_stock(product.stock, threshold)
+        and not is_low_stock(previous, threshold)
+    ]
+    owners = {product.owner_id for _, product in pending.values()}
+    session.info[_READY] = (owners, alerts)
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_stock_alerts(session: Session) -> None:
+    ready = session.info.pop(_READY, None)
+    if ready is None:
+        return
+    owners, alerts = ready
+    invalidate_alerts(owners)
+    for alert in alerts:
+        # fora da requisição: o envio pode depender de rede
+        _get_notifier().submit(_dispatch, alert)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_stock_alerts(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+    session.info.pop(_READY, None)
@@ -1,8 +1,9 @@
+from datetime import datetime
 from http import HTTPStatus
 from typing import Optional, Tuple
 
 from fastapi import HTTPException
-from sqlalchemy import func, select
+from sqlalchemy import Select, func, select
 from sqlalchemy.orm import Session
 
 from smartsales.models.auth import UserRole
@@ -10,14 +11,11 @@ from smartsales.models.clients import Client
 from smartsales.schemas.clients_schema import ClientCreate, ClientUpdate
 
 
-def get_clients_service(
-    db: Session,
+def _clients_query(
     current_user,
-    skip: int = 0,
-    limit: int = 10,
     name: Optional[str] = None,
     email: Optional[str] = None,
-) -> Tuple[int, list[Client]]:
+) -> Select:
     query = select(Client)
     # filtro por role
     if current_user.role == UserRole.USER:
@@ -27,12 +25,44 @@ def get_clients_service(
         query = query.where(Client.name.ilike(f'%{name}%'))
     if email:
         query = query.where(Client.email == email)
+    return query
+
+
+def get_clients_service(
+    db: Session,
+    current_user,
+    skip: int = 0,
+    limit: int = 10,
+    name: Optional[str] = None,
+    email: Optional[str] = None,
+) -> Tuple[int, list[Client]]:
+    query = _clients_query(current_user, name, email)
     total_query = query.with_only_columns(func.count()).order_by(None)
     total = db.execute(total_query).scalar()
     results = db.execute(query.offset(skip).limit(limit)).scalars().all()
     return total, results
 
 
+def get_clients_version_service(
+    db: Session,
+    current_user,
+    name: Optional[str] = None,
+    email: Optional[str] = None,
+) -> Tuple[int, Optional[datetime], Optional[int]]:
+    """
+    (total, maior updated_at, soma das versões) da listagem, para o
+    ETag (ver list_orders_version_service).
+    """
+    query = _clients_query(current_user, name, email)
+    return db.execute(
+        query.with_only_columns(
+            func.count(),
+            func.max(Client.updated_at),
+            func.sum(Client.version),
+        )
+    ).one()
+
+
 def get_client_service(db: Session, client_id: int, current_user) -> Client:
     client = db.get(Client, client_id)
     if not client:
@@ -0,0 +1,81 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from typing import Optional
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from smartsales.core.settings import Settings
+from smartsales.models.idempotency import IdempotencyKey
+
+settings = Settings()
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def request_fingerprint(method: str, path: str, payload: BaseModel) -> str:
+    """Impressão digital do corpo validado (independe de espaços/ordem)."""
+    body = payload.model_dump_json()
+    return hashlib.sha256(f'{method} {path}\n{body}'.encode()).hexdigest()
+
+
+def find_idempotency_key(
+    db: Session, current_user, key: str, fingerprint: str
+) -> Optional[IdempotencyKey]:
+    """
+    Registro ainda válido da chave, ou None se é a primeira vez (ou se
+    o anterior expirou). Reusar a chave com outro corpo é erro do
+    cliente (422).
+    """
+    record = db.get(IdempotencyKey, (current_user.id, key))
+    if record is None:
+        return None
+    if record.expires_at <= _utcnow():
+        db.delete(record)
+        db.commit()
+        return None
+    if record.fingerprint != fingerprint:
+        raise HTTPException(
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+            detail='Idempotency-Key já usada com outro corpo de requisição.',
+        )
+    return record
+
+
+def new_idempotency_key(
+    current_user, key: str, fingerprint: str
+) -> IdempotencyKey:
+    """Registro a gravar na mesma transação do recurso criado."""
+    return IdempotencyKey(
+        owner_id=current_user.id,
+        key=key,
+        fingerprint=fingerprint,
+        expires_at=_utcnow()
+        + timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS),
+    )
+
+
+def save_idempotent_response(
+    db: Session, record: IdempotencyKey, status_code: int, body: dict
+) -> None:
+    record.status_code = status_code
+    record.response = body
+    db.commit()
+
+
+def purge_expired_idempotency_keys(
+    db: Session, now: Optional[datetime] = None
+) -> int:
+    """Remove as chaves vencidas; retorna quantas apagou."""
+    result = db.execute(
+        delete(IdempotencyKey).where(
+            IdempotencyKey.expires_at <= (now or _utcnow())
+        )
+    )
+    db.commit()
+    return result.rowcount
@@ -0,0 +1,337 @@
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from pathlib import Path
+from typing import BinaryIO, Dict, List
+
+from fastapi import HTTPException, UploadFile
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+from starlette.concurrency import run_in_threadpool
+
+from smartsales.core.database import engine
+from smartsales.core.settings import Settings
+from smartsales.core.storage import BlobStorage, get_storage
+from smartsales.models.products import Product
+from smartsales.services.jobs_service import register_job
+from smartsales.services.products_service import (
+    VARIANTS_JOB,
+    bump_content_version,
+    invalidate_product,
+)
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow é opcional (extra "images")
+    Image = None
+
+logger = logging.getLogger(__name__)
+settings = Settings()
+
+_variant_pool: ProcessPoolExecutor | None = None
+
+# content-type aceito -> extensão gravada
+ALLOWED_IMAGE_TYPES = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/webp': '.webp',
+    'image/gif': '.gif',
+}
+# tentativas de gravar as variantes em caso de conflito de versão
+VARIANT_SAVE_ATTEMPTS = 3
+
+
+def sniff_image_type(head: bytes) -> str | None:
+    """Identifica o formato pelos primeiros bytes do arquivo."""
+    if head.startswith(b'\xff\xd8\xff'):
+        return 'image/jpeg'
+    if head.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'image/png'
+    if head.startswith((b'GIF87a', b'GIF89a')):
+        return 'image/gif'
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image/webp'
+    return None
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+        f'Image larger than {settings.UPLOAD_MAX_BYTES} bytes',
+    )
+
+
+def _unsupported() -> HTTPException:
+    return HTTPException(
+        HTTPStatus.UNSUPPORTED_MEDIA_TYPE, 'Unsupported image type'
+    )
+
+
+def _copy_chunks(
+    source: BinaryIO,
+    target: BinaryIO | None,
+    max_bytes: int,
+    chunk_size: int,
+) -> tuple[str, str]:
+    """
+    Copia em blocos validando formato e tamanho; retorna (hash, tipo).
+    Sem `target`, apenas lê e valida.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    content_type = None
+    while chunk := source.read(chunk_size):
+        if content_type is None:
+            content_type = sniff_image_type(chunk[:16])
+            if content_type is None:
+                raise _unsupported()
+        size += len(chunk)
+        if size > max_bytes:
+            raise _too_large()
+        digest.update(chunk)
+        if target is not None:
+            target.write(chunk)
+    if content_type is None:
+        raise _unsupported()
+    return digest.hexdigest(), content_type
+
+
+def store_stream(
+    source: BinaryIO,
+    storage: BlobStorage,
+    max_bytes: int,
+    chunk_size: int,
+    prefix: str = 'uploads',
+) -> str:
+    """
+    Copia `source` em blocos de `chunk_size` para um arquivo temporário,
+    calculando o SHA-256 no caminho, e o entrega ao storage com a chave
+    `<prefix>/<sha256><ext>`. Conteúdo repetido gera a mesma chave,
+    então reenvios não duplicam arquivos nem colidem por nome.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=storage.staging_dir, suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            sha256, content_type = _copy_chunks(
+                source, tmp, max_bytes, chunk_size
+            )
+        key = f'{prefix}/{sha256}{ALLOWED_IMAGE_TYPES[content_type]}'
+        return storage.put_path(key, Path(tmp_name), content_type)
+    finally:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+
+
+async def save_image(upload: UploadFile) -> str:
+    """
+    Valida tipo/tamanho declarados antes de ler qualquer byte e grava
+    a imagem fora do event loop. Retorna a ref salva em Product.images.
+    """
+    if upload.content_type not in ALLOWED_IMAGE_TYPES:
+        raise _unsupported()
+    if upload.size is not None and upload.size > settings.UPLOAD_MAX_BYTES:
+        raise _too_large()
+
+    return await run_in_threadpool(
+        store_stream,
+        upload.file,
+        get_storage(),
+        settings.UPLOAD_MAX_BYTES,
+        settings.UPLOAD_CHUNK_SIZE,
+        settings.UPLOAD_PREFIX,
+    )
+
+
+async def save_images(uploads: List[UploadFile]) -> List[str]:
+    """Grava várias imagens em paralelo, preservando a ordem."""
+    return list(await asyncio.gather(*(save_image(u) for u in uploads)))
+
+
+def _staging_key_pattern() -> re.Pattern:
+    extensions = '|'.join(
+        re.escape(ext) for ext in ALLOWED_IMAGE_TYPES.values()
+    )
+    prefix = re.escape(settings.UPLOAD_STAGING_PREFIX)
+    return re.compile(rf'{prefix}/[0-9a-f]{{32}}({extensions})')
+
+
+def presign_image_upload(content_type: str, size: int) -> dict:
+    """
+    Upload direto ao storage (sem passar pelos workers da API): valida
+    tipo e tamanho e devolve uma chave de staging nova, exclusiva deste
+    upload, com os dados do POST pré-assinado. O cliente nunca grava na
+    chave definitiva (por hash): ela só é criada no `confirm`, depois de
+    o conteúdo ser verificado.
+    """
+    if content_type not in ALLOWED_IMAGE_TYPES:
+        raise _unsupported()
+    if size > settings.UPLOAD_MAX_BYTES:
+        raise _too_large()
+    key = (
+        f'{settings.UPLOAD_STAGING_PREFIX}/'
+        f'{uuid.uuid4().hex}{ALLOWED_IMAGE_TYPES[content_type]}'
+    )
+    try:
+        presigned = get_storage().presign_upload(
+            key,
+            content_type,
+            settings.UPLOAD_MAX_BYTES,
+            settings.STORAGE_PRESIGN_EXPIRES,
+        )
+    except NotImplementedError:
+        raise HTTPException(
+            HTTPStatus.NOT_IMPLEMENTED,
+            'Direct uploads are not supported by this storage backend',
+        )
+    return {'key': key, **presigned}
+
+
+def confirm_image_upload(key: str) -> str:
+    """
+    Confere o upload direto na chave de staging: recalcula o SHA-256 e
+    o formato a partir dos bytes enviados, move o objeto para a chave
+    `<prefix>/<sha256><ext>` e retorna a ref. Conteúdo inválido é
+    apagado do staging.
+    """
+    storage = get_storage()
+    if not _staging_key_pattern().fullmatch(key):
+        raise HTTPException(HTTPStatus.BAD_REQUEST, 'Invalid image key')
+    if not storage.exists(key):
+        raise HTTPException(HTTPStatus.NOT_FOUND, 'Image not uploaded')
+    try:
+        with storage.local_copy(key) as path, path.open('rb') as source:
+            sha256, content_type = _copy_chunks(
+                source,
+                None,
+                settings.UPLOAD_MAX_BYTES,
+                settings.UPLOAD_CHUNK_SIZE,
+            )
+    except HTTPException:
+        storage.delete(key)
+        raise
+    target = (
+        f'{settings.UPLOAD_PREFIX}/{sha256}{ALLOWED_IMAGE_TYPES[content_type]}'  # noqa: E501
+    )
+    return storage.promote(key, target, content_type)
+
+
+def generate_variants(
+    path: str, widths: List[int], out_dir: str
+) -> Dict[str, str]:
+    """
+    Gera versões WebP redimensionadas de `path` (uma por largura, sem
+    ampliar) em `out_dir`. Roda em um processo do pool e devolve
+    {largura: arquivo gerado}.
+    """
+    source = Path(path)
+    variants = {}
+    with Image.open(source) as img:
+        for width in sorted(widths):
+            target = Path(out_dir) / f'{source.stem}_w{width}.webp'
+            copy = img.copy()
+            copy.thumbnail((width, width * 10))
+            if copy.mode not in {'RGB', 'RGBA'}:
+                copy = copy.convert('RGBA')
+            copy.save(target, 'WEBP', quality=80, method=4)
+            variants[str(width)] = target.as_posix()
+    return variants
+
+
+def _get_variant_pool() -> ProcessPoolExecutor:
+    global _variant_pool  # noqa: PLW0603
+    if _variant_pool is None:
+        _variant_pool = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_VARIANT_WORKERS
+        )
+    return _variant_pool
+
+
+def shutdown_variant_pool() -> None:
+    global _variant_pool  # noqa: PLW0603
+    if _variant_pool is not None:
+        _variant_pool.shutdown(wait=True, cancel_futures=True)
+        _variant_pool = None
+
+
+def variants_for(storage: BlobStorage, ref: str) -> Dict[str, str]:
+    """
+    Gera (no pool de processos) e grava no storage as variantes de uma
+    imagem: `<hash>_w<largura>.webp`. Como o original é endereçado por
+    conteúdo, variantes já existentes são reaproveitadas.
+    """
+    key = storage.key_from_ref(ref)
+    stem = key.rsplit('.', 1)[0]
+    widths = settings.IMAGE_VARIANT_WIDTHS
+    keys = {str(w): f'{stem}_w{w}.webp' for w in widths}
+    if all(storage.exists(k) for k in keys.values()):
+        return {w: storage.ref(k) for w, k in keys.items()}
+
+    with (
+        storage.local_copy(key) as source,
+        tempfile.TemporaryDirectory(dir=storage.staging_dir) as out_dir,
+    ):
+        generated = (
+            _get_variant_pool()
+            .submit(generate_variants, str(source), widths, out_dir)
+            .result()
+        )
+        return {
+            w: storage.put_path(keys[w], Path(path), 'image/webp')
+            for w, path in generated.items()
+        }
+
+
+def _record_variants(
+    product_id: int, variants: Dict[str, Dict[str, str]]
+) -> None:
+    # o produto pode ser editado enquanto as variantes são geradas: em
+    # conflito de versão, relê e aplica de novo
+    for attempt in range(VARIANT_SAVE_ATTEMPTS):
+        with Session(engine) as session:
+            product = session.get(Product, product_id)
+            if product is None:
+                return
+            current = set(product.images or [])
+            # mantém apenas variantes das imagens ainda associadas ao produto
+            merged = {
+                original: sizes
+                for original, sizes in {
+                    **(product.image_variants or {}),
+                    **variants,
+                }.items()
+                if original in current
+            }
+            product.image_variants = merged
+            bump_content_version(product)
+            try:
+                session.commit()
+                break
+            except StaleDataError:
+                session.rollback()
+                if attempt == VARIANT_SAVE_ATTEMPTS - 1:
+                    raise
+    invalidate_product(product_id)
+
+
+@register_job(VARIANTS_JOB)
+async def generate_product_variants(product_id: int, refs: List[str]) -> None:
+    """
+    Tarefa em background: gera as variantes das imagens e grava o mapa
+    original -> {largura: ref} em Product.image_variants. Uma falha é
+    repetida pelo JobRunner (variantes já geradas são reaproveitadas).
+    """
+    if Image is None or not refs:
+        return
+    storage = get_storage()
+    results = await asyncio.gather(
+        *(run_in_threadpool(variants_for, storage, ref) for ref in refs)
+    )
+    await run_in_threadpool(
+        _record_variants, product_id, dict(zip(refs, results))
+    )
@@ -0,0 +1,439 @@
+"""
+Tarefas em background fora do caminho da requisição. Os serviços
+enfileiram com `enqueue_job` na própria transação (a tarefa só existe
+se a mudança for gravada) e o JobRunner, em cada worker, busca as
+tarefas liberadas no banco, as coloca em uma fila asyncio limitada e as
+executa em N workers, com novas tentativas e backoff exponencial.
+
+Handlers são registrados por nome com `register_job` e recebem o
+payload como argumentos nomeados; funções síncronas rodam em thread.
+
+Cada execução é um lease: `attempts` no momento da busca identifica o
+dono, que renova `started_at` enquanto roda. Renovação e resultado só
+são gravados se a tarefa ainda pertence a quem os envia.
+"""
+
+import asyncio
+import contextlib
+import inspect
+import logging
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import and_, delete, event, or_, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from smartsales.core.database import engine
+from smartsales.core.settings import Settings
+from smartsales.models.auth import UserRole
+from smartsales.models.jobs import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+settings = Settings()
+
+# chave em Session.info: a transação enfileirou tarefas
+_ENQUEUED = 'jobs_enqueued'
+# teto do intervalo entre tentativas
+MAX_RETRY_DELAY = 3600
+
+_handlers: dict[str, tuple[Callable, int]] = {}
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def register_job(name: str, max_attempts: Optional[int] = None):
+    """Decorator: registra `handler(**payload)` como a tarefa `name`."""
+
+    def decorator(handler: Callable) -> Callable:
+        _handlers[name] = (
+            handler,
+            max_attempts or settings.JOB_MAX_ATTEMPTS,
+        )
+        return handler
+
+    return decorator
+
+
+def enqueue_job(
+    db: Session,
+    name: str,
+    payload: Optional[dict] = None,
+    owner_id: Optional[int] = None,
+    delay: float = 0,
+) -> Job:
+    """
+    Adiciona a tarefa à transação atual (quem chama faz o commit). O
+    runner é acordado logo após o commit.
+    """
+    if name not in _handlers:
+        raise ValueError(f'Tarefa desconhecida: {name}')
+    job = Job(
+        name=name,
+        payload=payload or {},
+        max_attempts=_handlers[name][1],
+        run_after=_utcnow() + timedelta(seconds=delay),
+        owner_id=owner_id,
+    )
+    db.add(job)
+    db.info[_ENQUEUED] = True
+    return job
+
+
+@event.listens_for(Session, 'after_commit')
+def _wake_runner(session: Session) -> None:
+    if session.info.pop(_ENQUEUED, None):
+        job_runner.wake()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_enqueued(session: Session) -> None:
+    session.info.pop(_ENQUEUED, None)
+
+
+def get_job_service(db: Session, job_id: int, current_user) -> Job:
+    job = db.get(Job, job_id)
+    if job is None:
+        raise HTTPException(
+            HTTPStatus.NOT_FOUND, detail='Tarefa não encontrada.'
+        )
+    if current_user.role == UserRole.USER and job.owner_id != current_user.id:
+        raise HTTPException(
+            HTTPStatus.FORBIDDEN, detail='Não autorizado para esta tarefa.'
+        )
+    return job
+
+
+#
+# Execução (funções síncronas; o runner as chama em threads)
+#
+def retry_delay(attempts: int) -> float:
+    """Backoff exponencial: base, 2x base, 4x base... até 1 hora."""
+    return min(
+        settings.JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1),
+        MAX_RETRY_DELAY,
+    )
+
+
+def claim_jobs(
+    db: Session,
+    limit: int,
+    lease_seconds: float = 300,
+    now: Optional[datetime] = None,
+) -> list[dict]:
+    """
+    Marca como `running` até `limit` tarefas liberadas e as retorna.
+    Tarefas cujo lease não é renovado há mais de `lease_seconds` (worker
+    que caiu) são retomadas; se já esgotaram as tentativas, viram
+    `failed`. SKIP LOCKED deixa vários workers buscarem tarefas
+    diferentes. `attempts` de cada tarefa é o token do lease.
+    """
+    now = now or _utcnow()
+    stale = and_(
+        Job.status == JobStatus.running,
+        Job.started_at <= now - timedelta(seconds=lease_seconds),
+    )
+    db.execute(
+        update(Job)
+        .where(stale, Job.attempts >= Job.max_attempts)
+        .values(
+            status=JobStatus.failed,
+            finished_at=now,
+            last_error='Tempo de execução esgotado.',
+        )
+        .execution_options(synchronize_session=False)
+    )
+    jobs = db.scalars(
+        select(Job)
+        .where(
+            or_(
+                and_(Job.status == JobStatus.queued, Job.run_after <= now),
+                stale,
+            )
+        )
+        .order_by(Job.run_after, Job.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).all()
+    claimed = []
+    for job in jobs:
+        job.status = JobStatus.running
+        job.attempts += 1
+        job.started_at = now
+        claimed.append({
+            'id': job.id,
+            'name': job.name,
+            'payload': job.payload,
+            'attempts': job.attempts,
+        })
+    db.commit()
+    return claimed
+
+
+def _owned(job_id: int, attempts: int):
+    """Condição do lease: a tarefa ainda roda com o token `attempts`."""
+    return and_(
+        Job.id == job_id,
+        Job.status == JobStatus.running,
+        Job.attempts == attempts,
+    )
+
+
+def renew_lease(
+    db: Session, job_id: int, attempts: int, now: Optional[datetime] = None
+) -> bool:
+    """Adia a expiração do lease; False se a tarefa já não é nossa."""
+    result = db.execute(
+        update(Job)
+        .where(_owned(job_id, attempts))
+        .values(started_at=now or _utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def finish_job(
+    db: Session,
+    job_id: int,
+    attempts: int,
+    error: Optional[str] = None,
+    now: Optional[datetime] = None,
+) -> Optional[JobStatus]:
+    """
+    Grava o resultado; com erro, reagenda até `max_attempts`. Retorna
+    None (sem gravar) se o lease expirou e a tarefa foi retomada.
+    """
+    now = now or _utcnow()
+    job = db.scalars(
+        select(Job).where(_owned(job_id, attempts)).with_for_update()
+    ).one_or_none()
+    if job is None:
+        db.rollback()
+        return None
+    if error is None:
+        job.status = JobStatus.succeeded
+        job.finished_at = now
+    elif job.attempts < job.max_attempts:
+        job.status = JobStatus.queued
+        job.run_after = now + timedelta(seconds=retry_delay(job.attempts))
+        job.last_error = error
+    else:
+        job.status = JobStatus.failed
+        job.finished_at = now
+        job.last_error = error
+    db.commit()
+    return job.status
+
+
+def release_jobs(db: Session, jobs: list[dict]) -> None:
+    """
+    Devolve à fila, sem contar a tentativa, tarefas buscadas que não
+    terminaram (desligamento); só as que ainda são deste lease.
+    """
+    if jobs:
+        db.execute(
+            update(Job)
+            .where(or_(*(_owned(j['id'], j['attempts']) for j in jobs)))
+            .values(status=JobStatus.queued, attempts=Job.attempts - 1)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+
+
+def purge_finished_jobs(db: Session, now: Optional[datetime] = None) -> int:
+    """Apaga tarefas concluídas há mais de JOB_RETENTION_DAYS."""
+    cutoff = (now or _utcnow()) - timedelta(days=settings.JOB_RETENTION_DAYS)
+    result = db.execute(
+        delete(Job).where(
+            Job.status.in_([JobStatus.succeeded, JobStatus.failed]),
+            Job.finished_at <= cutoff,
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+
+async def run_handler(name: str, payload: dict) -> None:
+    if name not in _handlers:
+        raise LookupError(f'Tarefa desconhecida: {name}')
+    handler = _handlers[name][0]
+    if inspect.iscoroutinefunction(handler):
+        await handler(**payload)
+    else:
+        await asyncio.to_thread(handler, **payload)
+
+
+class JobRunner:
+    """
+    Pool de workers asyncio do processo. Um laço busca tarefas no banco
+    só até encher a fila (`queue_size`): o excesso espera no banco, sem
+    crescer a memória. Acorda após commits que enfileiram tarefas, ao
+    liberar espaço na fila e a cada `poll_interval` segundos. Enquanto
+    uma tarefa roda, o lease é renovado a cada `lease_seconds / 3`.
+    """
+
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        engine: Engine,
+        workers: int = 4,
+        queue_size: int = 100,
+        poll_interval: float = 1.0,
+        lease_seconds: float = 300,
+        shutdown_timeout: float = 30,
+    ):
+        self.engine = engine
+        self.workers = workers
+        self.queue_size = queue_size
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.shutdown_timeout = shutdown_timeout
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue | None = None
+        self._wake: asyncio.Event | None = None
+        self._poller: asyncio.Task | None = None
+        self._workers: list[asyncio.Task] = []
+        # execução em andamento -> tarefa (para o desligamento)
+        self._running: dict[asyncio.Task, dict] = {}
+
+    async def start(self) -> None:
+        if self._poller is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(self.queue_size)
+        self._wake = asyncio.Event()
+        self._poller = asyncio.create_task(self._poll())
+        self._workers = [
+            asyncio.create_task(self._work()) for _ in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        """
+        Para de buscar tarefas, devolve ao banco as que estão na fila,
+        espera as em execução por até `shutdown_timeout` segundos e
+        devolve as que não terminaram.
+        """
+        if self._poller is None:
+            return
+        self._poller.cancel()
+        await asyncio.gather(self._poller, return_exceptions=True)
+        self._poller = None
+        pending = []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+            self._queue.task_done()
+        if self._running:
+            await asyncio.wait(
+                list(self._running), timeout=self.shutdown_timeout
+            )
+        pending.extend(self._running.values())
+        for task in [*self._running, *self._workers]:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        try:
+            await asyncio.to_thread(self._with_session, release_jobs, pending)
+        except Exception:
+            logger.exception('Falha ao devolver tarefas à fila')
+        self._loop = None
+
+    def wake(self) -> None:
+        """Pode ser chamado de qualquer thread."""
+        loop, wake = self._loop, self._wake
+        if loop is not None and wake is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(wake.set)
+
+    def _with_session(self, func, *args, **kwargs):
+        with Session(self.engine) as session:
+            return func(session, *args, **kwargs)
+
+    async def _poll(self) -> None:
+        while True:
+            free = self.queue_size - self._queue.qsize()
+            claimed = []
+            if free > 0:
+                try:
+                    claimed = await asyncio.to_thread(
+                        self._with_session,
+                        claim_jobs,
+                        free,
+                        self.lease_seconds,
+                    )
+                except Exception:
+                    logger.exception('Falha ao buscar tarefas')
+            for job in claimed:
+                self._queue.put_nowait(job)
+            if claimed and len(claimed) == free:
+                continue  # pode haver mais tarefas liberadas
+            # asyncio.timeout (e não wait_for): não engole o cancelamento
+            # de stop() quando o evento chega junto com o timeout
+            with contextlib.suppress(TimeoutError):
+                async with asyncio.timeout(self.poll_interval):
+                    await self._wake.wait()
+            self._wake.clear()
+
+    async def _work(self) -> None:
+        while True:
+            job = await self._queue.get()
+            execution = asyncio.create_task(self.execute(job))
+            self._running[execution] = job
+            try:
+                await execution
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # ex.: banco fora ao gravar o resultado; o lease expira
+                # e a tarefa é retomada. O worker segue atendendo a fila.
+                logger.exception('Falha ao finalizar a tarefa %s', job['id'])
+            finally:
+                self._running.pop(execution, None)
+                self._queue.task_done()
+                self._wake.set()  # há espaço na fila
+
+    async def _heartbeat(self, job: dict) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                owned = await asyncio.to_thread(
+                    self._with_session,
+                    renew_lease,
+                    job['id'],
+                    job['attempts'],
+                )
+            except Exception:
+                logger.exception('Falha ao renovar a tarefa %s', job['id'])
+                continue
+            if not owned:
+                logger.warning(
+                    'Tarefa %s retomada por outro worker', job['id']
+                )
+                return
+
+    async def execute(self, job: dict) -> Optional[JobStatus]:
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        error = None
+        try:
+            await run_handler(job['name'], job['payload'])
+        except Exception as exc:
+            logger.exception('Falha na tarefa %s (%s)', job['id'], job['name'])
+            error = f'{type(exc).__name__}: {exc}'
+        finally:
+            heartbeat.cancel()
+        return await asyncio.to_thread(
+            self._with_session, finish_job, job['id'], job['attempts'], error
+        )
+
+
+job_runner = JobRunner(
+    engine,
+    workers=settings.JOB_WORKERS,
+    queue_size=settings.JOB_QUEUE_SIZE,
+    poll_interval=settings.JOB_POLL_SECONDS,
+    lease_seconds=settings.JOB_LEASE_SECONDS,
+    shutdown_timeout=settings.JOB_SHUTDOWN_SECONDS,
+)
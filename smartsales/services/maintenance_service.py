@@ -0,0 +1,87 @@
+import logging
+import threading
+from collections.abc import Callable
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from smartsales.core.database import engine
+from smartsales.core.settings import Settings
+from smartsales.services.idempotency_service import (
+    purge_expired_idempotency_keys,
+)
+from smartsales.services.jobs_service import purge_finished_jobs
+from smartsales.services.outbox_service import purge_dispatched_events
+from smartsales.services.reservations_service import (
+    release_expired_reservations,
+)
+
+logger = logging.getLogger(__name__)
+settings = Settings()
+
+# tarefa: recebe uma sessão nova e retorna quantas linhas tratou
+SweepTask = Callable[[Session], int]
+
+
+class MaintenanceSweeper:
+    """
+    Thread que roda as tarefas de limpeza a cada `interval` segundos
+    (reservas vencidas, chaves de idempotência expiradas...). Cada
+    tarefa usa a própria sessão: a falha de uma não impede as demais.
+    Vários workers podem rodar o sweeper; as tarefas são seguras para
+    execução concorrente (ex.: o UPDATE condicional das reservas).
+    """
+
+    def __init__(
+        self, engine: Engine, tasks: dict[str, SweepTask], interval=30.0
+    ):
+        self.engine = engine
+        self.tasks = tasks
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name='maintenance-sweeper', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def sweep(self) -> dict[str, int]:
+        """Roda cada tarefa uma vez; retorna {tarefa: linhas tratadas}."""
+        done = {}
+        for name, task in self.tasks.items():
+            try:
+                with Session(self.engine) as session:
+                    done[name] = task(session)
+            except Exception:
+                logger.exception('Falha na tarefa de limpeza %s', name)
+                continue
+            if done[name]:
+                logger.info('%s: %d linha(s)', name, done[name])
+        return done
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.sweep()
+
+
+maintenance_sweeper = MaintenanceSweeper(
+    engine,
+    tasks={
+        'reservas vencidas': release_expired_reservations,
+        'chaves de idempotência expiradas': purge_expired_idempotency_keys,
+        'eventos entregues antigos': purge_dispatched_events,
+        'tarefas concluídas antigas': purge_finished_jobs,
+    },
+    interval=settings.MAINTENANCE_SWEEP_SECONDS,
+)
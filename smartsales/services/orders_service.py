@@ -1,28 +1,70 @@
+from collections import Counter
 from datetime import datetime
 from http import HTTPStatus
 from typing import List, Optional, Tuple
 
 from fastapi import HTTPException
-from sqlalchemy import func, select
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import Select, func, select, update
+from sqlalchemy.orm import Session, joinedload, lazyload, selectinload
 
 from smartsales.models.auth import UserRole
 from smartsales.models.clients import Client
-from smartsales.models.orders import Order, OrderItem, OrderStatus
+from smartsales.models.idempotency import IdempotencyKey
+from smartsales.models.orders import (
+    Order,
+    OrderItem,
+    OrderStatus,
+    can_transition,
+    statuses_leading_to,
+)
 from smartsales.models.products import Product
 from smartsales.schemas.orders_schema import (
     OrderCreate,
     OrderItemCreate,
     OrderUpdate,
 )
+from smartsales.services.outbox_service import (
+    order_payload,
+    record_event,
+    record_events,
+)
+from smartsales.services.reservations_service import consume_reservation
+from smartsales.services.rollups_service import apply_order_to_rollups
+from smartsales.services.stock_service import apply_stock_deltas, quantities
+
+
+def _invalid_transition(current: OrderStatus, new: OrderStatus) -> str:
+    return f'Transição de status inválida: {current.value} → {new.value}.'
+
+
+def _load_products(db: Session, product_ids) -> None:
+    """
+    Carrega os produtos do pedido em uma única consulta (sem o dono);
+    os `db.get` seguintes são atendidos pelo identity map da sessão.
+    """
+    db.scalars(
+        select(Product)
+        .where(Product.id.in_(set(product_ids)))
+        .options(lazyload(Product.owner))
+    ).all()
 
 
 #
 # 1. Criar pedido
 #
 def create_order_service(
-    db: Session, data: OrderCreate, current_user
+    db: Session,
+    data: OrderCreate,
+    current_user,
+    idempotency: Optional[IdempotencyKey] = None,
 ) -> Order:
+    if idempotency is not None:
+        # a chave é gravada antes de tudo: uma retentativa concorrente
+        # esbarra na PK (e espera o commit da primeira) antes de tocar
+        # no estoque, e nunca cria um segundo pedido
+        db.add(idempotency)
+        db.flush()
+
     # 1. Verificar cliente
     cliente = db.get(Client, data.client_id)
     if not cliente:
@@ -39,8 +81,9 @@ def create_order_service(
         )
 
     # 2. Verificar itens e calcular preços
+    _load_products(db, [item.product_id for item in data.items])
     total_pedido = 0
-    itens_detalhados: List[Tuple[OrderItemCreate, float, float]] = []
+    itens_detalhados: List[Tuple[OrderItemCreate, str, float, float]] = []
     for item_in in data.items:
         produto = db.get(Product, item_in.product_id)
         if not produto:
@@ -57,17 +100,26 @@ def create_order_service(
         #         HTTPStatus.FORBIDDEN,
         #         detail=f'Não autorizado para acessar o produto id={item_in.product_id}.',  # noqa: E501
         #     )
-        if (produto.stock or 0) < item_in.quantity:
-            raise HTTPException(
-                HTTPStatus.BAD_REQUEST,
-                detail=f'Estoque insuficiente para produto id={item_in.product_id}.',  # noqa: E501
-            )
         unit_price = float(produto.sale_price)
         total_price = round(unit_price * item_in.quantity, 2)
         total_pedido += total_price
-        itens_detalhados.append((item_in, unit_price, total_price))
-
-    # 3. Criar Order
+        itens_detalhados.append((
+            item_in,
+            produto.section,
+            unit_price,
+            total_price,
+        ))
+
+    # 3. Baixar o estoque (atômico); com reserva, baixa só a diferença
+    deltas = Counter()
+    deltas.subtract(quantities(data.items))
+    reserva = None
+    if data.reservation_id is not None:
+        reserva = consume_reservation(db, data.reservation_id, current_user)
+        deltas.update(quantities(reserva.items))
+    apply_stock_deltas(db, deltas)
+
+    # 4. Criar Order
     novo_order = Order(
         client_id=data.client_id,
         status=data.status or OrderStatus.pending,
@@ -76,21 +128,28 @@ def create_order_service(
     )
     db.add(novo_order)
     db.flush()  # para já obter novo_order.id
-
-    # 4. Criar OrderItem e ajustar estoque
-    for item_in, unit_price, total_price in itens_detalhados:
+    if reserva is not None:
+        reserva.order_id = novo_order.id
+    if idempotency is not None:
+        idempotency.order_id = novo_order.id
+
+    # 5. Criar OrderItem
+    novos_itens: List[OrderItem] = []
+    for item_in, section, unit_price, total_price in itens_detalhados:
         oi = OrderItem(
             order_id=novo_order.id,
             product_id=item_in.product_id,
             quantity=item_in.quantity,
             unit_price=unit_price,
             total_price=total_price,
+            section=section,
         )
         db.add(oi)
-        # Ajustar estoque
-        produto = db.get(Product, item_in.product_id)
-        produto.stock = (produto.stock or 0) - item_in.quantity
-        db.add(produto)
+        novos_itens.append(oi)
+
+    # 6. Atualizar os agregados diários na mesma transação
+    apply_order_to_rollups(db, novo_order, novos_itens)
+    record_event(db, 'order.created', novo_order)
 
     db.commit()
     db.refresh(novo_order)
@@ -127,31 +186,15 @@ def get_order_service(db: Session, order_id: int, current_user) -> Order:
 #
 # 3. Listar pedidos com filtros e paginação
 #
-def list_orders_service(
-    db: Session,
+def _orders_query(
     current_user,
-    skip: int = 0,
-    limit: int = 10,
     client_id: Optional[int] = None,
     status: Optional[OrderStatus] = None,
     since: Optional[datetime] = None,
     until: Optional[datetime] = None,
     section: Optional[str] = None,
     id_order: Optional[int] = None,
-) -> Tuple[int, List[Order]]:
-    """
-    Retorna (total, lista de pedidos) com filtros:
-      - client_id
-      - status
-      - período (date_from, date_to)
-      - section de produto (join em OrderItem -> Product)
-      - id_order
-      - skip/limit para paginação
-
-    Usa joinedload(Order.items),
-    por isso precisa de `unique()` antes de `scalars()`.
-    """
-
+) -> Select:
     stmt = select(Order)
 
     # 1) Filtrar por owner (quando for USER)
@@ -180,6 +223,38 @@ def list_orders_service(
             .join(Product, OrderItem.product)
             .where(Product.section.ilike(f'%{section}%'))
         )
+    return stmt
+
+
+def list_orders_service(
+    db: Session,
+    current_user,
+    skip: int = 0,
+    limit: int = 10,
+    client_id: Optional[int] = None,
+    status: Optional[OrderStatus] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    section: Optional[str] = None,
+    id_order: Optional[int] = None,
+) -> Tuple[int, List[Order]]:
+    """
+    Retorna (total, lista de pedidos) com filtros:
+      - client_id
+      - status
+      - período (date_from, date_to)
+      - section de produto (join em OrderItem -> Product)
+      - id_order
+      - skip/limit para paginação
+
+    Usa joinedload(Order.items),
+    por isso precisa de `unique()` antes de `scalars()`.
+    """
+
+    # 1) e 2) Filtrar por owner e aplicar filtros
+    stmt = _orders_query(
+        current_user, client_id, status, since, until, section, id_order
+    )
 
     # 3) Contar total de registros (antes do offset/limit)
     total_q = stmt.with_only_columns(func.count()).order_by(None)
@@ -195,18 +270,58 @@ def list_orders_service(
     return total, pedidos
 
 
+def list_orders_version_service(
+    db: Session,
+    current_user,
+    client_id: Optional[int] = None,
+    status: Optional[OrderStatus] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    section: Optional[str] = None,
+    id_order: Optional[int] = None,
+) -> Tuple[int, Optional[datetime], Optional[int]]:
+    """
+    (total, maior updated_at, soma das versões) da listagem, para o
+    ETag. Toda escrita incrementa `version`, então a soma muda mesmo
+    quando o updated_at editado não é o maior da lista.
+    """
+    stmt = _orders_query(
+        current_user, client_id, status, since, until, section, id_order
+    )
+    return db.execute(
+        stmt.with_only_columns(
+            func.count(), func.max(Order.updated_at), func.sum(Order.version)
+        )
+    ).one()
+
+
 #
 # 4. Atualizar pedido
 #
 def update_order_service(
     db: Session, order_obj: Order, data: OrderUpdate, current_user
 ) -> Order:
-    # 1. Reverter estoque dos itens antigos
-    for item in order_obj.items:
-        produto = db.get(Product, item.product_id)
-        if produto:
-            produto.stock = (produto.stock or 0) + item.quantity
-            db.add(produto)
+    # status omitido mantém o atual; mudanças seguem ORDER_TRANSITIONS
+    novo_status = OrderStatus(data.status or order_obj.status)
+    if not can_transition(order_obj.status, novo_status):
+        raise HTTPException(
+            HTTPStatus.BAD_REQUEST,
+            detail=_invalid_transition(order_obj.status, novo_status),
+        )
+    _load_products(
+        db,
+        [item.product_id for item in order_obj.items]
+        + [item.product_id for item in data.items],
+    )
+
+    # 1. Ajustar o estoque pela diferença entre itens antigos e novos
+    # (um UPDATE por produto) e retirar o estado antigo dos agregados.
+    # Como em todos os caminhos, produtos são travados antes das linhas
+    # de agregados (sem deadlock entre pedidos simultâneos)
+    deltas = quantities(order_obj.items)
+    deltas.subtract(quantities(data.items))
+    apply_stock_deltas(db, deltas)
+    apply_order_to_rollups(db, order_obj, order_obj.items, sign=-1)
 
     # 2. Excluir itens antigos
     order_obj.items.clear()
@@ -214,10 +329,10 @@ def update_order_service(
 
     # 3. Atualizar campos do pedido
     order_obj.client_id = data.client_id
-    order_obj.status = data.status
+    order_obj.status = novo_status
     # vamos recalcular total_value a seguir
     total_novo = 0
-    novos_detalhes: List[tuple[OrderItemCreate, float, float]] = []
+    novos_detalhes: List[tuple[OrderItemCreate, str, float, float]] = []
     for item_in in data.items:
         produto = db.get(Product, item_in.product_id)
         if not produto:
@@ -225,36 +340,37 @@ def update_order_service(
                 HTTPStatus.NOT_FOUND,
                 detail=f'Produto id={item_in.product_id} não encontrado.',
             )
-        if (produto.stock or 0) < item_in.quantity:
-            raise HTTPException(
-                HTTPStatus.BAD_REQUEST,
-                detail=f'Estoque insuficiente para produto id={
-                    item_in.product_id
-                }.',
-            )
         unit_price = float(produto.sale_price)
         total_price = round(unit_price * item_in.quantity, 2)
         total_novo += total_price
-        novos_detalhes.append((item_in, unit_price, total_price))
-
-    # 4. Criar novos OrderItem e ajustar estoque
-    for item_in, unit_price, total_price in novos_detalhes:
+        novos_detalhes.append((
+            item_in,
+            produto.section,
+            unit_price,
+            total_price,
+        ))
+
+    # 4. Criar novos OrderItem
+    novos_itens: List[OrderItem] = []
+    for item_in, section, unit_price, total_price in novos_detalhes:
         oi = OrderItem(
             order_id=order_obj.id,
             product_id=item_in.product_id,
             quantity=item_in.quantity,
             unit_price=unit_price,
             total_price=total_price,
+            section=section,
         )
         db.add(oi)
-        produto = db.get(Product, item_in.product_id)
-        produto.stock = (produto.stock or 0) - item_in.quantity
-        db.add(produto)
+        novos_itens.append(oi)
 
-    # 5. Atualizar total_value e salvar
+    # 5. Atualizar total_value, agregados e salvar
     order_obj.total_value = total_novo
-    order_obj.updated_at = datetime.utcnow()
+    # relógio do banco, como nos demais caminhos (onupdate=func.now())
+    order_obj.updated_at = func.now()
+    apply_order_to_rollups(db, order_obj, novos_itens)
     db.add(order_obj)
+    record_event(db, 'order.updated', order_obj)
     db.commit()
     db.refresh(order_obj)
     return order_obj
@@ -268,13 +384,97 @@ def delete_order_service(db: Session, order_obj: Order, current_user) -> None:
     Devolve o estoque de cada OrderItem, depois exclui o pedido (cascade).
     """
     # 1. Verificar permissão (já garantida no controller antes de passar order_obj)  # noqa: E501
-    # 2. Reverter estoque
-    for item in order_obj.items:
-        produto = db.get(Product, item.product_id)
-        if produto:
-            produto.stock = (produto.stock or 0) + item.quantity
-            db.add(produto)
+    # 2. Devolver o estoque e retirar dos agregados (produtos antes dos
+    # agregados, na mesma ordem de travas da criação)
+    apply_stock_deltas(db, quantities(order_obj.items))
+    apply_order_to_rollups(db, order_obj, order_obj.items, sign=-1)
 
     # 3. Excluir pedido (itens são removidos em cascade)
+    record_event(db, 'order.deleted', order_obj, order_payload(order_obj))
     db.delete(order_obj)
     db.commit()
+
+
+#
+# 6. Transição de status em lote
+#
+def bulk_transition_status_service(
+    db: Session, ids: List[int], status: OrderStatus, current_user
+) -> Tuple[List[int], List[dict]]:
+    """
+    Muda o status de vários pedidos em um único UPDATE, restrito aos
+    pedidos cujo status atual permite a transição (ORDER_TRANSITIONS).
+    Não mexe nos itens nem no estoque. Retorna (ids atualizados, falhas
+    com o status atual de cada pedido recusado).
+    """
+    novo_status = OrderStatus(status)
+    ids = sorted(set(ids))
+    filtros = [
+        Order.id.in_(ids),
+        Order.status.in_(statuses_leading_to(novo_status)),
+    ]
+    if current_user.role == UserRole.USER:
+        filtros.append(Order.owner_id == current_user.id)
+
+    if novo_status == OrderStatus.canceled:
+        # pedido cancelado sai dos agregados: retira com o status antigo,
+        # com as linhas travadas até o UPDATE abaixo
+        pedidos = db.scalars(
+            select(Order)
+            .where(*filtros)
+            .options(
+                selectinload(Order.items),
+                lazyload(Order.client),
+                lazyload(Order.owner),
+            )
+            .with_for_update(of=Order)
+        ).all()
+        for pedido in pedidos:
+            apply_order_to_rollups(db, pedido, pedido.items, sign=-1)
+
+    linhas = db.execute(
+        update(Order)
+        .where(*filtros)
+        .values(status=novo_status, version=Order.version + 1)
+        .returning(Order.id, Order.owner_id, Order.version)
+        .execution_options(synchronize_session='fetch')
+    ).all()
+    record_events(
+        db,
+        [
+            {
+                'event_type': 'order.status_changed',
+                'aggregate': 'order',
+                'aggregate_id': linha.id,
+                'owner_id': linha.owner_id,
+                'payload': {
+                    'id': linha.id,
+                    'status': novo_status.value,
+                    'version': linha.version,
+                },
+            }
+            for linha in linhas
+        ],
+    )
+    db.commit()
+    atualizados = [linha.id for linha in linhas]
+
+    recusados = set(ids) - set(atualizados)
+    falhas = []
+    if recusados:
+        stmt = select(Order.id, Order.status).where(Order.id.in_(recusados))
+        if current_user.role == UserRole.USER:
+            stmt = stmt.where(Order.owner_id == current_user.id)
+        atuais = dict(db.execute(stmt).all())
+        for order_id in sorted(recusados):
+            atual = atuais.get(order_id)
+            falhas.append({
+                'id': order_id,
+                'status': atual,
+                'detail': (
+                    'Pedido não encontrado.'
+                    if atual is None
+                    else _invalid_transition(atual, novo_status)
+                ),
+            })
+    return sorted(atualizados), falhas
@@ -0,0 +1,406 @@
+"""
+Outbox transacional: os serviços registram eventos de mudança na
+mesma transação do pedido/produto (`record_event`) e um dispatcher em
+background entrega os eventos, em lotes, aos destinos registrados
+(`register_event_sink`). Entrega ao menos uma vez e sem ordem global
+garantida (vários workers despacham lotes em paralelo): destinos que
+precisam de ordem usam `version` do payload. Um evento que um destino
+não aceita é reenviado depois, sem travar os demais, e estacionado
+após OUTBOX_MAX_ATTEMPTS tentativas.
+"""
+
+import json
+import logging
+import queue
+import threading
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import delete, event, insert, or_, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from smartsales.core.database import engine
+from smartsales.core.settings import Settings
+from smartsales.models.auth import UserRole
+from smartsales.models.orders import Order
+from smartsales.models.outbox import OutboxEvent, utc_clock
+from smartsales.models.products import Product
+from smartsales.utils.whatsapp import send_whatsapp_message
+
+logger = logging.getLogger(__name__)
+settings = Settings()
+
+# chave em Session.info com os eventos da transação atual
+_PENDING = 'outbox_events'
+
+EventSink = Callable[[list[dict]], None]
+_sinks: list[EventSink] = []
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _money(value) -> str:
+    return str(Decimal(str(value)).quantize(Decimal('0.01')))
+
+
+def order_payload(order: Order) -> dict:
+    return {
+        'id': order.id,
+        'client_id': order.client_id,
+        'status': order.status.value,
+        'total_value': _money(order.total_value),
+        'items': [
+            {'product_id': item.product_id, 'quantity': item.quantity}
+            for item in order.items
+        ],
+        'version': order.version,
+    }
+
+
+def product_payload(product: Product) -> dict:
+    return {
+        'id': product.id,
+        'title': product.title,
+        'sale_price': _money(product.sale_price),
+        'section': product.section,
+        'barcode': product.barcode,
+        'stock': product.stock,
+        'expiry_date': (
+            product.expiry_date.isoformat() if product.expiry_date else None
+        ),
+        'version': product.version,
+    }
+
+
+_PAYLOADS = {Order: order_payload, Product: product_payload}
+
+
+#
+# Registro (na transação do serviço)
+#
+def record_event(
+    db: Session, event_type: str, obj, payload: Optional[dict] = None
+) -> None:
+    """
+    Agenda `event_type` (ex.: 'order.created') sobre `obj` na transação
+    atual. Sem `payload`, o corpo é montado no commit, já com ids e
+    versões finais; exclusões devem passar o payload antes do delete.
+    """
+    db.info.setdefault(_PENDING, []).append((event_type, obj, payload))
+
+
+def record_events(db: Session, rows: list[dict]) -> None:
+    """
+    Grava eventos já montados (aggregate, aggregate_id, owner_id,
+    event_type, payload) em um único INSERT, para operações em lote.
+    """
+    if rows:
+        db.execute(insert(OutboxEvent), rows)
+        db.info.setdefault(_PENDING, [])
+
+
+@event.listens_for(Session, 'before_commit')
+def _write_outbox(session: Session) -> None:
+    pending = session.info.get(_PENDING)
+    if not pending:
+        return
+    session.flush()  # ids e versões finais para os payloads
+    for event_type, obj, payload in pending:
+        session.add(
+            OutboxEvent(
+                event_type=event_type,
+                aggregate=event_type.split('.', 1)[0],
+                aggregate_id=obj.id,
+                owner_id=obj.owner_id,
+                payload=payload or _PAYLOADS[type(obj)](obj),
+            )
+        )
+    pending.clear()
+
+
+@event.listens_for(Session, 'after_commit')
+def _wake_dispatcher(session: Session) -> None:
+    if session.info.pop(_PENDING, None) is not None:
+        outbox_dispatcher.wake()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_outbox(session: Session) -> None:
+    session.info.pop(_PENDING, None)
+
+
+#
+# Destinos da entrega
+#
+def register_event_sink(sink: EventSink) -> EventSink:
+    """Adiciona um destino para os lotes de eventos (ou decorator)."""
+    _sinks.append(sink)
+    return sink
+
+
+class FileSink:
+    """Acrescenta cada evento como uma linha JSON em `path`."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def __call__(self, events: list[dict]) -> None:
+        lines = ''.join(json.dumps(e, default=str) + '\n' for e in events)
+        with self._lock, self.path.open('a', encoding='utf-8') as file:
+            file.write(lines)
+
+
+class QueueSink:
+    """Coloca os eventos em uma `queue.Queue` (consumidor local/testes)."""
+
+    def __init__(self, maxsize: int = 0):
+        self.queue: queue.Queue[dict] = queue.Queue(maxsize)
+
+    def __call__(self, events: list[dict]) -> None:
+        for item in events:
+            self.queue.put(item)
+
+
+def whatsapp_sink(events: list[dict]) -> None:
+    """Avisa pelo WhatsApp os eventos de OUTBOX_WHATSAPP_EVENTS."""
+    wanted = {
+        name.strip() for name in settings.OUTBOX_WHATSAPP_EVENTS.split(',')
+    }
+    for item in events:
+        if item['event_type'] in wanted:
+            status = item['payload'].get('status', '')
+            send_whatsapp_message(
+                f'{item["event_type"]}: {item["aggregate"]} '
+                f'id={item["aggregate_id"]} {status}'.rstrip()
+            )
+
+
+if settings.OUTBOX_FILE_PATH:
+    register_event_sink(FileSink(settings.OUTBOX_FILE_PATH))
+if settings.OUTBOX_WHATSAPP_EVENTS:
+    register_event_sink(whatsapp_sink)
+
+
+#
+# Entrega e feed
+#
+def event_dict(item: OutboxEvent) -> dict:
+    return {
+        'id': item.id,
+        'event_type': item.event_type,
+        'aggregate': item.aggregate,
+        'aggregate_id': item.aggregate_id,
+        'owner_id': item.owner_id,
+        'payload': item.payload,
+        'created_at': item.created_at.isoformat(),
+    }
+
+
+def _deliver(sinks: list[EventSink], events: list[dict]) -> dict[int, str]:
+    """
+    Entrega `events` a cada destino. Se um destino falha com o lote,
+    tenta evento a evento para isolar os que falham; retorna o erro de
+    cada evento não entregue, por id.
+    """
+    errors: dict[int, str] = {}
+    for sink in list(sinks):
+        try:
+            sink(events)
+            continue
+        except Exception:
+            logger.warning('Destino do outbox falhou com o lote; isolando')
+        for item in events:
+            try:
+                sink([item])
+            except Exception as exc:
+                errors.setdefault(item['id'], f'{type(exc).__name__}: {exc}')
+    return errors
+
+
+def dispatch_pending(
+    db: Session,
+    sinks: Optional[list[EventSink]] = None,
+    batch_size: int = 500,
+    now: Optional[datetime] = None,
+) -> int:
+    """
+    Reserva o próximo lote de eventos pendentes (`claimed_at` e
+    `attempts`) e confirma a reserva antes de chamar os destinos: os
+    locks (SKIP LOCKED, para vários workers) não ficam presos durante a
+    entrega. Quem não for entregue volta à fila quando a reserva vence
+    (OUTBOX_LEASE_SECONDS, também o caso de um worker que caiu) e, após
+    OUTBOX_MAX_ATTEMPTS tentativas, é estacionado com `failed_at` e
+    `last_error`. Retorna quantos eventos foram processados.
+    """
+    sinks = _sinks if sinks is None else sinks
+    now = now or _utcnow()
+    expired = now - timedelta(seconds=settings.OUTBOX_LEASE_SECONDS)
+    batch = db.scalars(
+        select(OutboxEvent)
+        .where(
+            OutboxEvent.dispatched_at.is_(None),
+            OutboxEvent.failed_at.is_(None),
+            or_(
+                OutboxEvent.claimed_at.is_(None),
+                OutboxEvent.claimed_at <= expired,
+            ),
+        )
+        .order_by(OutboxEvent.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not batch:
+        db.rollback()
+        return 0
+    for item in batch:
+        item.claimed_at = now
+        item.attempts += 1
+    events = [event_dict(item) for item in batch]
+    exhausted = {
+        item.id
+        for item in batch
+        if item.attempts >= settings.OUTBOX_MAX_ATTEMPTS
+    }
+    db.commit()
+
+    errors = _deliver(sinks, events)
+    delivered = [item['id'] for item in events if item['id'] not in errors]
+    done = _utcnow()
+    if delivered:
+        db.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id.in_(delivered))
+            .values(dispatched_at=done, last_error=None)
+        )
+    for event_id, error in errors.items():
+        # sem `failed_at`, o evento volta quando a reserva vencer
+        parked = done if event_id in exhausted else None
+        db.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id == event_id)
+            .values(last_error=error, failed_at=parked)
+        )
+        if parked:
+            logger.error(
+                'Evento %s do outbox estacionado: %s', event_id, error
+            )
+    db.commit()
+    return len(events)
+
+
+def list_events_service(
+    db: Session,
+    current_user,
+    since: int = 0,
+    limit: int = 100,
+    aggregate: Optional[str] = None,
+    now: Optional[datetime] = None,
+) -> list[OutboxEvent]:
+    """
+    Eventos com id > `since`, por id. Eventos mais novos que
+    OUTBOX_FEED_SETTLE_SECONDS ficam de fora: ids de transações ainda
+    abertas podem ser menores que os já visíveis, e o cursor do cliente
+    pularia esses eventos. O corte usa o mesmo relógio do `created_at`
+    (`utc_clock` do banco, no instante do INSERT); `now` só nos testes.
+    """
+    settle = settings.OUTBOX_FEED_SETTLE_SECONDS
+    settled = (
+        utc_clock(settle) if now is None else now - timedelta(seconds=settle)
+    )
+    stmt = (
+        select(OutboxEvent)
+        .where(OutboxEvent.id > since, OutboxEvent.created_at <= settled)
+        .order_by(OutboxEvent.id)
+        .limit(limit)
+    )
+    if current_user.role == UserRole.USER:
+        stmt = stmt.where(OutboxEvent.owner_id == current_user.id)
+    if aggregate is not None:
+        stmt = stmt.where(OutboxEvent.aggregate == aggregate)
+    return db.scalars(stmt).all()
+
+
+def purge_dispatched_events(
+    db: Session, now: Optional[datetime] = None
+) -> int:
+    """Apaga eventos entregues há mais de OUTBOX_RETENTION_DAYS."""
+    cutoff = (now or _utcnow()) - timedelta(
+        days=settings.OUTBOX_RETENTION_DAYS
+    )
+    result = db.execute(
+        delete(OutboxEvent).where(OutboxEvent.dispatched_at <= cutoff)
+    )
+    db.commit()
+    return result.rowcount
+
+
+class OutboxDispatcher:
+    """
+    Thread que entrega os eventos pendentes. Acorda logo após cada
+    commit com eventos (`wake`) e, para eventos de outros workers, a
+    cada `interval` segundos; esvazia a fila em lotes de `batch_size`.
+    """
+
+    def __init__(
+        self, engine: Engine, interval: float = 1.0, batch_size: int = 500
+    ):
+        self.engine = engine
+        self.interval = interval
+        self.batch_size = batch_size
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name='outbox-dispatcher', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def drain(self) -> int:
+        """Entrega tudo o que está pendente; retorna quantos eventos."""
+        total = 0
+        while True:
+            with Session(self.engine) as session:
+                sent = dispatch_pending(session, batch_size=self.batch_size)
+            total += sent
+            if sent < self.batch_size:
+                return total
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.drain()
+            except Exception:
+                logger.exception('Falha ao entregar eventos do outbox')
+                # evita repetir a falha em laço enquanto o destino volta
+                self._stop.wait(self.interval)
+
+
+outbox_dispatcher = OutboxDispatcher(
+    engine,
+    interval=settings.OUTBOX_DISPATCH_SECONDS,
+    batch_size=settings.OUTBOX_BATCH_SIZE,
+)
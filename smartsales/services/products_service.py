@@ -1,25 +1,32 @@
+from datetime import datetime
 from http import HTTPStatus
 from typing import List, Optional, Tuple
 
 from fastapi import HTTPException
-from sqlalchemy import select
+from sqlalchemy import Select, func, select
 from sqlalchemy.orm import Session
 
+from smartsales.core.cache import get_cache
 from smartsales.models.auth import UserRole
+from smartsales.models.jobs import Job
 from smartsales.models.products import Product
 from smartsales.schemas.products_schema import ProductCreate, ProductUpdate
+from smartsales.services.alerts_service import track_stock_change
+from smartsales.services.jobs_service import enqueue_job
+from smartsales.services.outbox_service import product_payload, record_event
 
+# nome da tarefa em background que gera as variantes das imagens
+# (handler registrado em images_service)
+VARIANTS_JOB = 'images.variants'
 
-def get_products_service(
-    db: Session,
+
+def _products_query(
     current_user,
-    skip: int = 0,
-    limit: int = 10,
     section: Optional[str] = None,
     price_min: Optional[float] = None,
     price_max: Optional[float] = None,
     available: Optional[bool] = None,
-) -> Tuple[int, List[Product]]:
+) -> Select:
     q = select(Product)
     if current_user.role == UserRole.USER:
         q = q.where(Product.owner_id == current_user.id)
@@ -33,12 +40,159 @@ def get_products_service(
         q = q.where(Product.stock > 0)
     elif available is False:
         q = q.where(Product.stock == 0)
+    return q
+
+
+#
+# Cache dos campos que raramente mudam. Estoque, updated_at e versão
+# são sempre lidos do banco; a entrada guarda o `content_version` em
+# que foi montada e só vale enquanto ele for o atual. Movimentos de
+# estoque mudam `version`, mas não `content_version`.
+#
+def _product_cache_key(product_id: int) -> str:
+    return f'product:{product_id}'
+
+
+def _static_fields(product: Product) -> dict:
+    owner = product.owner
+    return {
+        'id': product.id,
+        'title': product.title,
+        'sale_price': float(product.sale_price),
+        'section': product.section,
+        'description': product.description,
+        'barcode': product.barcode,
+        'expiry_date': (
+            product.expiry_date.isoformat() if product.expiry_date else None
+        ),
+        'images': product.images,
+        'image_variants': product.image_variants,
+        'owner_id': product.owner_id,
+        'content_version': product.content_version,
+        'owner': {
+            'name': owner.name,
+            'email': owner.email,
+            'role': getattr(owner.role, 'value', owner.role),
+        },
+    }
+
+
+def bump_content_version(product: Product) -> None:
+    """Marca, na transação atual, que os campos do cadastro mudaram."""
+    product.content_version = Product.content_version + 1
+
+
+def schedule_product_variants(
+    db: Session, product: Product, refs: List[str]
+) -> Optional[Job]:
+    """
+    Enfileira, na transação atual, a geração das variantes de `refs`:
+    a tarefa só existe se o produto for gravado. Retorna a tarefa (o
+    id sai no commit) para o cliente acompanhar em /api/jobs/{id}.
+    """
+    if not refs:
+        return None
+    db.flush()  # id do produto novo
+    return enqueue_job(
+        db,
+        VARIANTS_JOB,
+        {'product_id': product.id, 'refs': list(refs)},
+        owner_id=product.owner_id,
+    )
+
+
+def cache_product(product: Product) -> None:
+    """Write-through: grava no cache o estado recém-commitado."""
+    get_cache().set(_product_cache_key(product.id), _static_fields(product))
+
+
+def invalidate_product(product_id: int) -> None:
+    get_cache().delete(_product_cache_key(product_id))
+
+
+def get_product_view_service(
+    db: Session, product_id: int, current_user
+) -> dict:
+    """
+    Dados do produto para leitura (GET /products/{id}): campos estáveis
+    do cache + estoque, updated_at e versão atuais em uma consulta por
+    chave primária, sem carregar a linha completa nem o dono. Se o
+    cadastro mudou desde que o cache foi montado (escrita em outro
+    worker), o produto é relido e o cache regravado.
+    """
+    cached = get_cache().get(_product_cache_key(product_id))
+    if cached is not None:
+        current = db.execute(
+            select(
+                Product.stock,
+                Product.updated_at,
+                Product.version,
+                Product.content_version,
+            ).where(Product.id == product_id)
+        ).one_or_none()
+        if current is None:
+            invalidate_product(product_id)
+            raise HTTPException(HTTPStatus.NOT_FOUND, 'Product not found')
+        if current.content_version == cached.get('content_version'):
+            if (
+                current_user.role == UserRole.USER
+                and cached['owner_id'] != current_user.id
+            ):  # noqa: E501
+                raise HTTPException(
+                    HTTPStatus.FORBIDDEN,
+                    'Not authorized to access this product',
+                )
+            return {**cached, **current._asdict()}
+
+    product = get_product_service(db, product_id, current_user)
+    cache_product(product)
+    return {
+        **_static_fields(product),
+        'stock': product.stock,
+        'updated_at': product.updated_at,
+        'version': product.version,
+    }
+
+
+def get_products_service(
+    db: Session,
+    current_user,
+    skip: int = 0,
+    limit: int = 10,
+    section: Optional[str] = None,
+    price_min: Optional[float] = None,
+    price_max: Optional[float] = None,
+    available: Optional[bool] = None,
+) -> Tuple[int, List[Product]]:
+    q = _products_query(current_user, section, price_min, price_max, available)
     all_items = db.execute(q).scalars().all()
     total = len(all_items)
     items = all_items[skip : skip + limit]
     return total, items
 
 
+def get_products_version_service(
+    db: Session,
+    current_user,
+    section: Optional[str] = None,
+    price_min: Optional[float] = None,
+    price_max: Optional[float] = None,
+    available: Optional[bool] = None,
+) -> Tuple[int, Optional[datetime], Optional[int]]:
+    """
+    (total, maior updated_at, soma das versões) da listagem, para o
+    ETag (ver list_orders_version_service).
+    """
+    q = _products_query(current_user, section, price_min, price_max, available)
+    return db.execute(
+        q.with_only_columns(
+            func.count(),
+            func.max(Product.updated_at),
+            func.sum(Product.version),
+        )
+    ).one()
+
+
 def get_product_service(db: Session, product_id: int, current_user) -> Product:
     product = db.get(Product, product_id)
     if not product:
@@ -55,7 +209,7 @@ def get_product_service(db: Session, product_id: int, current_user) -> Product:
 
 def create_product_service(
     db: Session, data: ProductCreate, current_user
-) -> Product:
+) -> Tuple[Product, Optional[Job]]:
     exists = (
         db.query(Product).filter(Product.barcode == data.barcode).first()
         if data.barcode
@@ -75,23 +229,55 @@ def create_product_service(
         owner_id=current_user.id,
     )
     db.add(new_p)
+    track_stock_change(db, new_p, None)
+    record_event(db, 'product.created', new_p)
+    job = schedule_product_variants(db, new_p, data.images or [])
     db.commit()
     db.refresh(new_p)
-    return new_p
+    cache_product(new_p)
+    return new_p, job
 
 
 def update_product_service(
     db: Session, product_id: int, data: ProductUpdate, current_user
-) -> Product:
+) -> Tuple[Product, Optional[Job]]:
     product = get_product_service(db, product_id, current_user)
-    for field, value in data.dict(exclude_unset=True).items():
+    track_stock_change(db, product, product.stock)
+    changes = data.dict(exclude_unset=True)
+    for field, value in changes.items():
         setattr(product, field, value)
+    bump_content_version(product)
+    record_event(db, 'product.updated', product)
+    job = None
+    if 'images' in changes:
+        job = schedule_product_variants(db, product, product.images or [])
     db.commit()
     db.refresh(product)
-    return product
+    cache_product(product)
+    return product, job
 
 
 def delete_product_service(db: Session, product_id: int, current_user) -> None:
     product = get_product_service(db, product_id, current_user)
+    track_stock_change(db, product, product.stock)
+    record_event(db, 'product.deleted', product, product_payload(product))
     db.delete(product)
     db.commit()
+    invalidate_product(product_id)
+
+
+def add_product_image_service(
+    db: Session, product_id: int, ref: str, current_user
+) -> Tuple[Product, Optional[Job]]:
+    product = get_product_service(db, product_id, current_user)
+    job = None
+    if ref not in (product.images or []):
+        # nova lista para o SQLAlchemy detectar a mudança no JSON
+        product.images = [*(product.images or []), ref]
+        bump_content_version(product)
+        record_event(db, 'product.updated', product)
+        job = schedule_product_variants(db, product, [ref])
+    db.commit()
+    db.refresh(product)
+    cache_product(product)
+    return product, job
@@ -0,0 +1,187 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Literal, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from smartsales.models.auth import UserRole
+from smartsales.models.clients import Client
+from smartsales.models.orders import Order, OrderStatus
+from smartsales.models.products import Product
+from smartsales.models.rollups import (
+    DailyProductSales,
+    DailySales,
+    DailySectionSales,
+)
+
+Granularity = Literal['day', 'week', 'month']
+
+
+def _period(db: Session, column, granularity: Granularity):
+    """Início do período (dia/semana/mês) de `column`, no dialeto do banco."""
+    if db.get_bind().dialect.name == 'postgresql':
+        return func.date(func.date_trunc(granularity, column))
+    # SQLite (testes/desenvolvimento)
+    if granularity == 'month':
+        return func.date(column, 'start of month')
+    if granularity == 'week':
+        return func.date(column, '-6 days', 'weekday 1')
+    return func.date(column)
+
+
+def _order_filters(
+    current_user,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    include_canceled: bool = False,
+) -> list:
+    """
+    Mesmo escopo de list_orders_service: USER só enxerga os próprios
+    pedidos. Pedidos cancelados ficam fora da receita por padrão.
+    """
+    filters = []
+    if current_user.role == UserRole.USER:
+        filters.append(Order.owner_id == current_user.id)
+    if since is not None:
+        filters.append(Order.created_at >= since)
+    if until is not None:
+        filters.append(Order.created_at <= until)
+    if not include_canceled:
+        filters.append(Order.status != OrderStatus.canceled)
+    return filters
+
+
+def _rollup_filters(
+    model,
+    current_user,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> list:
+    """
+    Equivalente de _order_filters sobre os agregados diários; o período
+    é considerado por dia inteiro.
+    """
+    filters = []
+    if current_user.role == UserRole.USER:
+        filters.append(model.owner_id == current_user.id)
+    if since is not None:
+        filters.append(model.day >= since.date())
+    if until is not None:
+        filters.append(model.day <= until.date())
+    return filters
+
+
+def revenue_over_time_service(
+    db: Session,
+    current_user,
+    granularity: Granularity = 'day',
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> list[dict]:
+    period = _period(db, DailySales.day, granularity).label('period')
+    stmt = (
+        select(
+            period,
+            func.sum(DailySales.orders).label('orders'),
+            func.sum(DailySales.revenue).label('revenue'),
+        )
+        .where(*_rollup_filters(DailySales, current_user, since, until))
+        .group_by(period)
+        .order_by(period)
+    )
+    return [row._asdict() for row in db.execute(stmt)]
+
+
+def top_products_service(
+    db: Session,
+    current_user,
+    limit: int = 10,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> list[dict]:
+    revenue = func.sum(DailyProductSales.revenue).label('revenue')
+    stmt = (
+        select(
+            Product.id.label('product_id'),
+            Product.title,
+            func.sum(DailyProductSales.quantity).label('quantity'),
+            revenue,
+        )
+        .join(DailyProductSales, DailyProductSales.product_id == Product.id)
+        .where(*_rollup_filters(DailyProductSales, current_user, since, until))
+        .group_by(Product.id, Product.title)
+        .order_by(revenue.desc())
+        .limit(limit)
+    )
+    return [row._asdict() for row in db.execute(stmt)]
+
+
+def top_clients_service(
+    db: Session,
+    current_user,
+    limit: int = 10,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> list[dict]:
+    revenue = func.sum(Order.total_value).label('revenue')
+    stmt = (
+        select(
+            Client.id.label('client_id'),
+            Client.name,
+            func.count(Order.id).label('orders'),
+            revenue,
+        )
+        .join(Order, Order.client_id == Client.id)
+        .where(*_order_filters(current_user, since, until))
+        .group_by(Client.id, Client.name)
+        .order_by(revenue.desc())
+        .limit(limit)
+    )
+    return [row._asdict() for row in db.execute(stmt)]
+
+
+def sections_service(
+    db: Session,
+    current_user,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> list[dict]:
+    revenue = func.sum(DailySectionSales.revenue).label('revenue')
+    stmt = (
+        select(
+            DailySectionSales.section,
+            func.sum(DailySectionSales.quantity).label('quantity'),
+            revenue,
+        )
+        .where(*_rollup_filters(DailySectionSales, current_user, since, until))
+        .group_by(DailySectionSales.section)
+        .order_by(revenue.desc())
+    )
+    return [row._asdict() for row in db.execute(stmt)]
+
+
+def average_basket_service(
+    db: Session,
+    current_user,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> dict:
+    stmt = select(
+        func.coalesce(func.sum(DailySales.orders), 0),
+        func.coalesce(func.sum(DailySales.items), 0),
+        func.coalesce(func.sum(DailySales.revenue), 0),
+    ).where(*_rollup_filters(DailySales, current_user, since, until))
+    orders, items, revenue = db.execute(stmt).one()
+    revenue = Decimal(str(revenue))
+    cents = Decimal('0.01')
+    return {
+        'orders': orders,
+        'revenue': revenue,
+        'average_ticket': (
+            (revenue / orders).quantize(cents) if orders else Decimal(0)
+        ),
+        'average_items': (
+            (Decimal(items) / orders).quantize(cents) if orders else Decimal(0)
+        ),
+    }
@@ -0,0 +1,153 @@
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from smartsales.core.settings import Settings
+from smartsales.models.auth import UserRole
+from smartsales.models.reservations import (
+    Reservation,
+    ReservationItem,
+    ReservationStatus,
+)
+from smartsales.schemas.reservations_schema import ReservationCreate
+from smartsales.services.stock_service import apply_stock_deltas, quantities
+
+settings = Settings()
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def create_reservation_service(
+    db: Session, data: ReservationCreate, current_user
+) -> Reservation:
+    """Baixa o estoque agora e guarda a reserva até `expires_at`."""
+    ttl = data.ttl_seconds or settings.RESERVATION_TTL_SECONDS
+    if ttl > settings.RESERVATION_MAX_TTL_SECONDS:
+        raise HTTPException(
+            HTTPStatus.BAD_REQUEST,
+            detail=(
+                'ttl_seconds deve ser no máximo '
+                f'{settings.RESERVATION_MAX_TTL_SECONDS}.'
+            ),
+        )
+    held = quantities(data.items)
+    apply_stock_deltas(db, {pid: -qty for pid, qty in held.items()})
+
+    reservation = Reservation(
+        owner_id=current_user.id,
+        status=ReservationStatus.active,
+        expires_at=_utcnow() + timedelta(seconds=ttl),
+    )
+    reservation.items.extend(
+        ReservationItem(product_id=pid, quantity=qty)
+        for pid, qty in held.items()
+    )
+    db.add(reservation)
+    db.commit()
+    db.refresh(reservation)
+    return reservation
+
+
+def get_reservation_service(
+    db: Session, reservation_id: int, current_user
+) -> Reservation:
+    reservation = db.get(Reservation, reservation_id)
+    if reservation is None:
+        raise HTTPException(
+            HTTPStatus.NOT_FOUND, detail='Reserva não encontrada.'
+        )
+    if (
+        current_user.role == UserRole.USER
+        and reservation.owner_id != current_user.id
+    ):
+        raise HTTPException(
+            HTTPStatus.FORBIDDEN, detail='Não autorizado para esta reserva.'
+        )
+    return reservation
+
+
+def _claim(
+    db: Session,
+    reservation_id: int,
+    status: ReservationStatus,
+    unexpired: bool = False,
+) -> bool:
+    """
+    Troca o status de uma reserva ativa em um UPDATE condicional: entre
+    pedido, liberação e sweeper, só quem mudar a linha devolve ou usa o
+    estoque reservado.
+    """
+    stmt = (
+        update(Reservation)
+        .where(
+            Reservation.id == reservation_id,
+            Reservation.status == ReservationStatus.active,
+        )
+        .values(status=status)
+        .execution_options(synchronize_session='fetch')
+    )
+    if unexpired:
+        stmt = stmt.where(Reservation.expires_at > _utcnow())
+    return db.execute(stmt).rowcount == 1
+
+
+def consume_reservation(
+    db: Session, reservation_id: int, current_user
+) -> Reservation:
+    """
+    Marca a reserva como usada por um pedido (na transação do pedido).
+    Quem chama compensa a diferença entre o reservado e o pedido.
+    """
+    reservation = get_reservation_service(db, reservation_id, current_user)
+    if not _claim(
+        db, reservation_id, ReservationStatus.consumed, unexpired=True
+    ):
+        raise HTTPException(
+            HTTPStatus.CONFLICT, detail='Reserva expirada ou já utilizada.'
+        )
+    return reservation
+
+
+def release_reservation_service(db: Session, reservation: Reservation) -> None:
+    if not _claim(db, reservation.id, ReservationStatus.released):
+        raise HTTPException(
+            HTTPStatus.CONFLICT, detail='Reserva não está mais ativa.'
+        )
+    apply_stock_deltas(db, quantities(reservation.items))
+    db.commit()
+
+
+def release_expired_reservations(
+    db: Session, now: Optional[datetime] = None, limit: int = 500
+) -> int:
+    """
+    Devolve o estoque das reservas vencidas; retorna quantas liberou.
+    As devoluções são somadas e aplicadas em uma única chamada, que
+    trava os produtos em ordem de id (sem deadlock com pedidos).
+    """
+    now = now or _utcnow()
+    expired = db.scalars(
+        select(Reservation)
+        .where(
+            Reservation.status == ReservationStatus.active,
+            Reservation.expires_at <= now,
+        )
+        .order_by(Reservation.expires_at)
+        .limit(limit)
+    ).all()
+    released = 0
+    deltas = Counter()
+    for reservation in expired:
+        if _claim(db, reservation.id, ReservationStatus.expired):
+            deltas.update(quantities(reservation.items))
+            released += 1
+    apply_stock_deltas(db, deltas)
+    db.commit()
+    return released
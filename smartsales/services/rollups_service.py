@@ -0,0 +1,179 @@
+from collections import defaultdict
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from smartsales.models.orders import Order, OrderItem, OrderStatus
+from smartsales.models.rollups import (
+    DailyProductSales,
+    DailySales,
+    DailySectionSales,
+)
+
+_DIALECT_INSERT = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+
+def _upsert(db: Session, model, keys: dict, deltas: dict) -> None:
+    """
+    INSERT ... ON CONFLICT DO UPDATE somando `deltas` à linha de `keys`;
+    atômico mesmo com pedidos simultâneos no mesmo dia.
+    """
+    table = model.__table__
+    stmt = _DIALECT_INSERT[db.get_bind().dialect.name](table).values(
+        **keys, **deltas
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={col: table.c[col] + stmt.excluded[col] for col in deltas},
+    )
+    db.execute(stmt)
+
+
+def apply_order_to_rollups(
+    db: Session, order: Order, items: Iterable[OrderItem], sign: int = 1
+) -> None:
+    """
+    Soma (`sign=1`) ou subtrai (`sign=-1`) a contribuição de um pedido
+    nos agregados do dia em que foi criado. Deve ser chamada na mesma
+    transação que grava o pedido: com o estado novo após criar/alterar e
+    com o estado antigo antes de alterar/excluir.
+    """
+    if order.status == OrderStatus.canceled:
+        return
+    items = list(items)
+    day = order.created_at.date()
+    owner_id = order.owner_id
+
+    per_product = defaultdict(lambda: [0, Decimal(0)])
+    per_section = defaultdict(lambda: [0, Decimal(0)])
+    for item in items:
+        revenue = Decimal(str(item.total_price))
+        # seção gravada no item na venda: mudar o produto de seção depois
+        # não pode desviar a subtração para outra linha
+        for bucket in (
+            per_product[item.product_id],
+            per_section[item.section],
+        ):
+            bucket[0] += item.quantity
+            bucket[1] += revenue
+
+    _upsert(
+        db,
+        DailySales,
+        {'day': day, 'owner_id': owner_id},
+        {
+            'orders': sign,
+            'items': sign * sum(i.quantity for i in items),
+            'revenue': sign * Decimal(str(order.total_value)),
+        },
+    )
+    for product_id, (quantity, revenue) in per_product.items():
+        _upsert(
+            db,
+            DailyProductSales,
+            {'day': day, 'owner_id': owner_id, 'product_id': product_id},
+            {'quantity': sign * quantity, 'revenue': sign * revenue},
+        )
+    for section, (quantity, revenue) in per_section.items():
+        _upsert(
+            db,
+            DailySectionSales,
+            {'day': day, 'owner_id': owner_id, 'section': section},
+            {'quantity': sign * quantity, 'revenue': sign * revenue},
+        )
+
+    if sign < 0:
+        # remove as linhas que ficaram vazias após a subtração
+        db.execute(
+            delete(DailySales).where(
+                DailySales.day == day,
+                DailySales.owner_id == owner_id,
+                DailySales.orders <= 0,
+            )
+        )
+        for model in (DailyProductSales, DailySectionSales):
+            db.execute(
+                delete(model).where(
+                    model.day == day,
+                    model.owner_id == owner_id,
+                    model.quantity <= 0,
+                )
+            )
+
+
+def rebuild_rollups(db: Session, since: Optional[date] = None) -> None:
+    """
+    Recalcula os agregados a partir de `orders`/`order_items` (todos,
+    ou a partir do dia `since`). Usado para a carga inicial e para
+    corrigir divergências; não faz commit.
+    """
+    day = func.date(Order.created_at)
+    filters = [Order.status != OrderStatus.canceled]
+    if since is not None:
+        filters.append(Order.created_at >= datetime.combine(since, time.min))
+        for model in (DailySales, DailyProductSales, DailySectionSales):
+            db.execute(delete(model).where(model.day >= since))
+    else:
+        for model in (DailySales, DailyProductSales, DailySectionSales):
+            db.execute(delete(model))
+
+    items_per_order = (
+        select(
+            OrderItem.order_id,
+            func.sum(OrderItem.quantity).label('item_count'),
+        )
+        .group_by(OrderItem.order_id)
+        .subquery()
+    )
+    db.execute(
+        insert(DailySales).from_select(
+            ['day', 'owner_id', 'orders', 'items', 'revenue'],
+            select(
+                day,
+                Order.owner_id,
+                func.count(Order.id),
+                func.coalesce(func.sum(items_per_order.c.item_count), 0),
+                func.sum(Order.total_value),
+            )
+            .outerjoin(items_per_order, items_per_order.c.order_id == Order.id)
+            .where(*filters)
+            .group_by(day, Order.owner_id),
+        )
+    )
+    db.execute(
+        insert(DailyProductSales).from_select(
+            ['day', 'owner_id', 'product_id', 'quantity', 'revenue'],
+            select(
+                day,
+                Order.owner_id,
+                OrderItem.product_id,
+                func.sum(OrderItem.quantity),
+                func.sum(OrderItem.total_price),
+            )
+            .join(Order, Order.id == OrderItem.order_id)
+            .where(*filters)
+            .group_by(day, Order.owner_id, OrderItem.product_id),
+        )
+    )
+    db.execute(
+        insert(DailySectionSales).from_select(
+            ['day', 'owner_id', 'section', 'quantity', 'revenue'],
+            select(
+                day,
+                Order.owner_id,
+                OrderItem.section,
+                func.sum(OrderItem.quantity),
+                func.sum(OrderItem.total_price),
+            )
+            .join(Order, Order.id == OrderItem.order_id)
+            .where(*filters)
+            .group_by(day, Order.owner_id, OrderItem.section),
+        )
+    )
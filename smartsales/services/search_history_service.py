@@ -0,0 +1,154 @@
+import json
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from smartsales.core.database import engine
+from smartsales.core.settings import Settings
+from smartsales.models.search import Search
+
+logger = logging.getLogger(__name__)
+settings = Settings()
+
+
+class SearchHistoryQueue:
+    """
+    Fila em memória para gravar o histórico de pesquisas fora do
+    caminho da requisição.
+
+    Uma thread agrupa os registros e faz um INSERT em lote a cada
+    `batch_size` itens ou `flush_interval_ms` milissegundos. No
+    desligamento a fila é esvaziada; o que não puder ser gravado no
+    banco vai para `fallback_path` (JSON Lines) e é reaplicado no
+    próximo `start()`.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        batch_size: int = 50,
+        flush_interval_ms: int = 500,
+        fallback_path: str | Path = 'search_history.jsonl',
+    ):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.fallback_path = Path(fallback_path)
+        self._queue: queue.Queue[dict] = queue.Queue()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._replay_fallback()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name='search-history', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self._flush(self._drain())
+
+    def put(self, row: dict) -> None:
+        # sem a thread (ex.: fora do lifespan), grava na hora
+        if not self.running:
+            self._flush([row])
+            return
+        self._queue.put(row)
+
+    def _drain(self) -> list[dict]:
+        rows = []
+        while True:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                return rows
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            batch: list[dict] = []
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0 or self._stop.is_set():
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            if batch:
+                self._flush(batch)
+
+    def _flush(self, rows: list[dict]) -> None:
+        if not rows:
+            return
+        try:
+            with Session(self.engine) as session:
+                session.execute(insert(Search), rows)
+                session.commit()
+        except Exception:
+            logger.exception(
+                'Falha ao gravar %d pesquisas; salvando em %s',
+                len(rows),
+                self.fallback_path,
+            )
+            self._write_fallback(rows)
+
+    def _write_fallback(self, rows: list[dict]) -> None:
+        with self.fallback_path.open('a', encoding='utf-8') as f:
+            for row in rows:
+                f.write(json.dumps(row, default=str) + '\n')
+
+    def _replay_fallback(self) -> None:
+        pending = self.fallback_path.with_suffix('.replay')
+        # `.replay` que sobrou de um início interrompido vem primeiro
+        if pending.exists():
+            self._replay_file(pending)
+        if self.fallback_path.exists():
+            self.fallback_path.replace(pending)
+            self._replay_file(pending)
+
+    def _replay_file(self, path: Path) -> None:
+        rows = []
+        with path.open(encoding='utf-8') as f:
+            for number, line in enumerate(f, start=1):
+                try:
+                    row = json.loads(line)
+                    row['created_at'] = datetime.fromisoformat(
+                        row['created_at']
+                    )
+                except (ValueError, KeyError, TypeError):
+                    # ex.: última linha truncada por um processo morto
+                    logger.warning(
+                        'Linha %d inválida em %s; ignorada', number, path
+                    )
+                    continue
+                rows.append(row)
+        # se falhar de novo, _flush devolve as linhas ao arquivo
+        self._flush(rows)
+        path.unlink()
+
+
+search_history = SearchHistoryQueue(
+    engine,
+    batch_size=settings.SEARCH_HISTORY_BATCH_SIZE,
+    flush_interval_ms=settings.SEARCH_HISTORY_FLUSH_MS,
+    fallback_path=settings.SEARCH_HISTORY_FALLBACK_PATH,
+)
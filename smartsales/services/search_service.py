@@ -1,8 +1,32 @@
 # smartsales/services/search_service.py
-from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+from http import HTTPStatus
+from typing import List, Optional, Tuple
 
-from smartsales.models.search import Search
+from fastapi import HTTPException
+from sqlalchemy import case, func, or_, select, text, tuple_
+from sqlalchemy.orm import Session, lazyload
+
+from smartsales.models.auth import UserRole
+from smartsales.models.search import SEARCH_TSVECTOR, Search
 from smartsales.schemas.search_schema import SearchCreate, SearchOut
+from smartsales.services.search_history_service import search_history
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def encode_cursor(search: Search) -> str:
+    return f'{search.created_at.isoformat()}_{search.id}'
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        created_at, search_id = cursor.rsplit('_', 1)
+        return datetime.fromisoformat(created_at), int(search_id)
+    except ValueError:
+        raise HTTPException(HTTPStatus.BAD_REQUEST, 'Invalid cursor')
 
 
 class SearchService:
@@ -27,3 +51,117 @@ class SearchService:
         db.commit()
         db.refresh(new_search)
         return SearchOut.from_orm(new_search)
+
+    @staticmethod
+    def enqueue_search(
+        search_in: SearchCreate,
+        response: str,
+        owner_id: int | None = None,
+        latency_ms: int | None = None,
+        cached: bool = False,
+    ) -> SearchOut:
+        """
+        1) Envia o Search para a fila de gravação em lote.
+        2) Retorna o SearchOut sem esperar o banco (id ainda indefinido).
+        """
+        row = {
+            'query': search_in.query,
+            'database': search_in.database,
+            'response': response,
+            'owner_id': owner_id,
+            'latency_ms': latency_ms,
+            'cached': cached,
+            'created_at': _utcnow(),
+        }
+        search_history.put(row)
+        return SearchOut(id=None, **row)
+
+    @staticmethod
+    def list_history(
+        db: Session,
+        current_user,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        term: Optional[str] = None,
+    ) -> Tuple[List[Search], Optional[str]]:
+        """
+        Histórico paginado por keyset (created_at, id), do mais recente
+        para o mais antigo, usando o índice (owner_id, created_at).
+        `term` faz busca textual em query/response (GIN no PostgreSQL).
+        """
+        stmt = select(Search).options(lazyload(Search.owner))
+        if current_user.role == UserRole.USER:
+            stmt = stmt.where(Search.owner_id == current_user.id)
+        if cursor:
+            created_at, search_id = decode_cursor(cursor)
+            stmt = stmt.where(
+                tuple_(Search.created_at, Search.id)
+                < tuple_(created_at, search_id)
+            )
+        if term:
+            if db.get_bind().dialect.name == 'postgresql':
+                stmt = stmt.where(
+                    text(
+                        f"{SEARCH_TSVECTOR} @@ plainto_tsquery('portuguese', :term)"  # noqa: E501
+                    ).bindparams(term=term)
+                )
+            else:
+                stmt = stmt.where(
+                    or_(
+                        Search.query.ilike(f'%{term}%'),
+                        Search.response.ilike(f'%{term}%'),
+                    )
+                )
+
+        stmt = stmt.order_by(Search.created_at.desc(), Search.id.desc())
+        items = db.execute(stmt.limit(limit + 1)).scalars().all()
+        next_cursor = (
+            encode_cursor(items[limit - 1]) if len(items) > limit else None
+        )
+        return items[:limit], next_cursor
+
+    @staticmethod
+    def search_stats(db: Session, current_user, top: int = 10) -> dict:
+        """
+        Estatísticas agregadas no banco: total, taxa de respostas
+        reaproveitadas (cached), percentis de latência do LLM e as
+        perguntas mais frequentes.
+        """
+        scope = []
+        if current_user.role == UserRole.USER:
+            scope.append(Search.owner_id == current_user.id)
+
+        columns = [
+            func.count(Search.id),
+            func.avg(case((Search.cached, 1.0), else_=0.0)),
+        ]
+        is_postgres = db.get_bind().dialect.name == 'postgresql'
+        if is_postgres:
+            columns += [
+                func.percentile_cont(p).within_group(Search.latency_ms)
+                for p in (0.5, 0.95, 0.99)
+            ]
+        row = db.execute(select(*columns).where(*scope)).one()
+        # percentile_cont não existe no SQLite; percentis ficam None
+        total, hit_ratio, *percentiles = row
+        p50, p95, p99 = percentiles if is_postgres else (None, None, None)
+
+        question = func.lower(Search.query)
+        top_questions = db.execute(
+            select(question, func.count().label('total'))
+            .where(*scope)
+            .group_by(question)
+            .order_by(func.count().desc())
+            .limit(top)
+        ).all()
+
+        return {
+            'total': total or 0,
+            'cache_hit_ratio': float(hit_ratio or 0),
+            'latency_p50_ms': p50,
+            'latency_p95_ms': p95,
+            'latency_p99_ms': p99,
+            'top_questions': [
+                {'query': q, 'total': n} for q, n in top_questions
+            ],
+        }
@@ -0,0 +1,71 @@
+from collections import Counter
+from collections.abc import Iterable
+from http import HTTPStatus
+
+from fastapi import HTTPException
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session
+
+from smartsales.models.products import Product
+from smartsales.services.alerts_service import track_stock_change
+
+
+def quantities(items: Iterable) -> Counter:
+    """product_id -> quantidade total (itens repetidos são somados)."""
+    totals = Counter()
+    for item in items:
+        totals[item.product_id] += item.quantity
+    return totals
+
+
+def _adjust_stock(db: Session, product_id: int, delta: int) -> int | None:
+    """
+    Soma `delta` ao estoque em um único UPDATE atômico. Para baixas,
+    a condição `stock >= n` no próprio UPDATE substitui o ler-conferir-
+    gravar: a linha fica travada só durante o comando e duas transações
+    nunca vendem a mesma unidade. Incrementa a versão (controle
+    otimista) e devolve o novo estoque, ou None se não foi possível.
+    """
+    current = func.coalesce(Product.stock, 0)
+    stmt = (
+        update(Product)
+        .where(Product.id == product_id)
+        .values(stock=current + delta, version=Product.version + 1)
+        .returning(Product.stock)
+        .execution_options(synchronize_session='fetch')
+    )
+    if delta < 0:
+        stmt = stmt.where(current >= -delta)
+    return db.execute(stmt).scalar_one_or_none()
+
+
+def apply_stock_deltas(db: Session, deltas: dict[int, int]) -> None:
+    """
+    Aplica {product_id: delta} (negativo baixa, positivo devolve) na
+    transação atual. Os produtos são atualizados em ordem de id para
+    que transações concorrentes travem as linhas na mesma ordem (sem
+    deadlock); por isso deve ser chamada uma única vez por transação e
+    antes de qualquer escrita nos agregados (rollups_service), que são
+    travados depois dos produtos em todos os caminhos. Estoque
+    insuficiente aborta com 400; devoluções para produtos já excluídos
+    são ignoradas.
+    """
+    for product_id in sorted(deltas):
+        delta = deltas[product_id]
+        if delta == 0:
+            continue
+        stock = _adjust_stock(db, product_id, delta)
+        product = db.get(Product, product_id)
+        if stock is None:
+            if product is None and delta > 0:
+                continue  # produto excluído: não há para onde devolver
+            if product is None:
+                raise HTTPException(
+                    HTTPStatus.NOT_FOUND,
+                    detail=f'Produto id={product_id} não encontrado.',
+                )
+            raise HTTPException(
+                HTTPStatus.BAD_REQUEST,
+                detail=f'Estoque insuficiente para produto id={product_id}.',
+            )
+        track_stock_change(db, product, stock - delta)
@@ -0,0 +1,310 @@
+"""
+Geração determinística de dados sintéticos (usuários, clientes,
+produtos e pedidos) para benchmarks e testes de escala.
+
+As linhas saem como dicts prontos para `insert()`, com ids explícitos
+(o banco deve estar vazio). A popularidade de produtos e clientes segue
+uma distribuição de Zipf, como em vendas reais: poucos itens concentram
+a maior parte dos pedidos.
+"""
+
+import itertools
+import random
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from enum import Enum
+
+from sqlalchemy import insert, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from smartsales.models.auth import Auth, UserRole
+from smartsales.models.clients import Client
+from smartsales.models.orders import Order, OrderItem, OrderStatus
+from smartsales.models.products import Product
+from smartsales.services.rollups_service import rebuild_rollups
+from smartsales.utils.validators import cpf_check_digit
+
+FIRST_NAMES = (
+    'Ana', 'Bruno', 'Carla', 'Daniel', 'Eduarda', 'Felipe', 'Gabriela',
+    'Heitor', 'Isabela', 'Joao', 'Larissa', 'Marcos', 'Natalia', 'Otavio',
+    'Paula', 'Rafael', 'Sofia', 'Thiago', 'Vitoria', 'Wagner',
+)  # fmt: skip
+LAST_NAMES = (
+    'Silva', 'Santos', 'Oliveira', 'Souza', 'Rodrigues', 'Ferreira',
+    'Alves', 'Pereira', 'Lima', 'Gomes', 'Costa', 'Ribeiro', 'Martins',
+    'Carvalho', 'Almeida', 'Lopes', 'Soares', 'Fernandes', 'Vieira',
+)  # fmt: skip
+SECTIONS = {
+    'Mercearia': ('Arroz', 'Feijao', 'Macarrao', 'Cafe', 'Acucar', 'Oleo'),
+    'Hortifruti': ('Banana', 'Maca', 'Tomate', 'Batata', 'Cebola', 'Alface'),
+    'Laticinios': ('Leite', 'Queijo', 'Iogurte', 'Manteiga', 'Requeijao'),
+    'Limpeza': ('Detergente', 'Sabao', 'Desinfetante', 'Esponja'),
+    'Bebidas': ('Suco', 'Refrigerante', 'Agua', 'Cerveja', 'Cha'),
+    'Padaria': ('Pao', 'Bolo', 'Biscoito', 'Torrada'),
+}
+BRANDS = ('Bom Dia', 'Da Casa', 'Premium', 'Economico', 'Natural', 'Top')
+# (status, peso) dos pedidos gerados
+STATUS_WEIGHTS = (
+    (OrderStatus.delivered, 60), (OrderStatus.confirmed, 15),
+    (OrderStatus.shipped, 10), (OrderStatus.pending, 10),
+    (OrderStatus.canceled, 5),
+)  # fmt: skip
+
+
+@dataclass(frozen=True)
+class Scale:
+    users: int
+    clients: int
+    products: int
+    orders: int
+    max_items: int = 5
+    days: int = 365
+
+
+SCALES = {
+    'tiny': Scale(users=2, clients=50, products=100, orders=500),
+    'small': Scale(users=5, clients=1_000, products=2_000, orders=20_000),
+    'medium': Scale(users=20, clients=20_000, products=20_000, orders=500_000),
+    'large': Scale(
+        users=50, clients=200_000, products=100_000, orders=5_000_000
+    ),
+}
+
+
+def make_cpf(n: int) -> str:
+    """CPF válido e único para cada `n` (até 10^9 - 10^8)."""
+    base = f'{100_000_000 + n:09d}'
+    first = cpf_check_digit(base)
+    return f'{base}{first}{cpf_check_digit(base + str(first))}'
+
+
+def zipf_cum_weights(n: int, s: float = 1.1) -> list[float]:
+    """Pesos acumulados de Zipf para `random.choices` (rank 1 = mais)."""
+    return list(
+        itertools.accumulate(1 / (rank**s) for rank in range(1, n + 1))
+    )
+
+
+def _full_name(rng: random.Random) -> str:
+    # duas palavras, só letras (ver validate_full_name)
+    return f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}'
+
+
+def generate_users(scale: Scale, password_hash: str) -> Iterator[dict]:
+    """O usuário 1 é admin; os demais são donos de clientes/produtos."""
+    rng = random.Random(0)
+    for user_id in range(1, scale.users + 1):
+        yield {
+            'id': user_id,
+            'name': _full_name(rng),
+            'email': f'user{user_id}@example.com',
+            'password': password_hash,
+            'role': UserRole.ADMIN if user_id == 1 else UserRole.USER,
+        }
+
+
+def generate_clients(scale: Scale, rng: random.Random) -> Iterator[dict]:
+    for client_id in range(1, scale.clients + 1):
+        yield {
+            'id': client_id,
+            'name': _full_name(rng),
+            'email': f'cliente{client_id}@example.com',
+            'cpf': make_cpf(client_id),
+            'owner_id': rng.randint(1, scale.users),
+        }
+
+
+def generate_products(
+    scale: Scale, rng: random.Random, today: date
+) -> Iterator[dict]:
+    sections = list(SECTIONS)
+    for product_id in range(1, scale.products + 1):
+        section = rng.choice(sections)
+        perishable = section in {'Hortifruti', 'Laticinios', 'Padaria'}
+        yield {
+            'id': product_id,
+            'title': (
+                f'{rng.choice(SECTIONS[section])} {rng.choice(BRANDS)} '
+                f'{product_id}'
+            ),
+            'sale_price': Decimal(rng.randint(150, 30_000)) / 100,
+            'section': section,
+            'description': None,
+            'barcode': f'789{product_id:010d}',
+            'stock': int(rng.paretovariate(1.5) * 20),
+            'expiry_date': (
+                today + timedelta(days=rng.randint(-5, 120))
+                if perishable
+                else None
+            ),
+            'images': None,
+            'owner_id': rng.randint(1, scale.users),
+        }
+
+
+def generate_orders(
+    scale: Scale,
+    rng: random.Random,
+    clients: list[dict],
+    products: list[dict],
+    end: datetime,
+) -> Iterator[tuple[dict, list[dict]]]:
+    """
+    Pedidos (e seus itens) distribuídos em `scale.days` dias até `end`,
+    com volume crescente no tempo e produtos/clientes em Zipf.
+    """
+    product_weights = zipf_cum_weights(len(products))
+    client_weights = zipf_cum_weights(len(clients), s=0.8)
+    product_ids = range(1, len(products) + 1)
+    statuses, status_weights = zip(*STATUS_WEIGHTS)
+    span = scale.days * 86_400
+    item_id = itertools.count(1)
+
+    for order_id in range(1, scale.orders + 1):
+        client = rng.choices(clients, cum_weights=client_weights)[0]
+        # sqrt: mais pedidos nos dias recentes
+        created_at = end - timedelta(
+            seconds=int(span * (1 - rng.random() ** 0.5))
+        )
+        chosen = set(
+            rng.choices(
+                product_ids,
+                cum_weights=product_weights,
+                k=rng.randint(1, scale.max_items),
+            )
+        )
+        items = []
+        for product_id in sorted(chosen):
+            quantity = rng.choices((1, 2, 3, 5, 10), (50, 25, 12, 8, 5))[0]
+            product = products[product_id - 1]
+            unit_price = product['sale_price']
+            items.append({
+                'id': next(item_id),
+                'order_id': order_id,
+                'product_id': product_id,
+                'quantity': quantity,
+                'unit_price': unit_price,
+                'total_price': unit_price * quantity,
+                'section': product['section'],
+                'created_at': created_at,
+                'updated_at': created_at,
+            })
+        yield (
+            {
+                'id': order_id,
+                'client_id': client['id'],
+                'total_value': sum(i['total_price'] for i in items),
+                'status': rng.choices(statuses, status_weights)[0],
+                'owner_id': client['owner_id'],
+                'created_at': created_at,
+                'updated_at': created_at,
+            },
+            items,
+        )
+
+
+def _insert_batches(conn: Connection, model, rows, batch_size: int) -> int:
+    total = 0
+    for batch in itertools.batched(rows, batch_size):
+        conn.execute(insert(model), list(batch))
+        total += len(batch)
+    return total
+
+
+def _copy_value(value):
+    # colunas Enum guardam o nome do membro (ex.: ADMIN), como no ORM
+    return value.name if isinstance(value, Enum) else value
+
+
+def _copy_rows(conn: Connection, model, rows) -> int:
+    """
+    COPY ... FROM STDIN pelo psycopg 3, na mesma transação da conexão
+    do SQLAlchemy. Bem mais rápido que INSERT em cargas de milhões de
+    linhas; colunas ausentes nos dicts recebem o default do banco.
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return 0
+    columns = list(first)
+    statement = f'COPY {model.__tablename__} ({", ".join(columns)}) FROM STDIN'
+    total = 0
+    cursor = conn.connection.driver_connection.cursor()
+    with cursor.copy(statement) as copy:
+        for row in itertools.chain((first,), rows):
+            copy.write_row([_copy_value(row[column]) for column in columns])
+            total += 1
+    return total
+
+
+def supports_copy(engine: Engine) -> bool:
+    return engine.dialect.name == 'postgresql' and engine.driver == 'psycopg'
+
+
+def reset_sequences(conn: Connection) -> None:
+    """No PostgreSQL, alinha as sequências de id após inserir ids fixos."""
+    if conn.dialect.name != 'postgresql':
+        return
+    for table in ('auth', 'clients', 'products', 'orders', 'order_items'):
+        conn.execute(
+            text(
+                f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                f'coalesce((SELECT max(id) FROM {table}), 1))'
+            )
+        )
+
+
+def seed_database(
+    engine: Engine,
+    scale: Scale,
+    password_hash: str,
+    seed: int = 42,
+    batch_size: int = 5_000,
+    use_copy: bool | None = None,
+) -> dict[str, int]:
+    """
+    Popula um banco vazio com `scale` e recalcula os agregados diários.
+    Usa COPY no PostgreSQL com psycopg (`use_copy=None` detecta) e
+    INSERTs em lote nos demais bancos. Retorna a quantidade de linhas
+    por tabela.
+    """
+    if use_copy is None:
+        use_copy = supports_copy(engine)
+    rng = random.Random(seed)
+    now = datetime.now().replace(microsecond=0)
+    counts = {}
+    with engine.begin() as conn:
+
+        def write(model, rows) -> int:
+            if use_copy:
+                return _copy_rows(conn, model, rows)
+            return _insert_batches(conn, model, rows, batch_size)
+
+        counts['auth'] = write(Auth, generate_users(scale, password_hash))
+        clients = list(generate_clients(scale, rng))
+        counts['clients'] = write(Client, clients)
+        products = list(generate_products(scale, rng, now.date()))
+        counts['products'] = write(Product, products)
+
+        counts['orders'] = counts['order_items'] = 0
+        orders = generate_orders(scale, rng, clients, products, now)
+        # pedidos e itens em blocos: a memória não cresce com a escala
+        for chunk in itertools.batched(orders, batch_size):
+            counts['orders'] += write(Order, (order for order, _ in chunk))
+            counts['order_items'] += write(
+                OrderItem, (item for _, items in chunk for item in items)
+            )
+        reset_sequences(conn)
+
+    with Session(engine) as session:
+        rebuild_rollups(session)
+        session.commit()
+
+    if engine.dialect.name == 'postgresql':
+        # estatísticas do planner atualizadas antes de qualquer medição
+        with engine.begin() as conn:
+            conn.exec_driver_sql('ANALYZE')
+    return counts
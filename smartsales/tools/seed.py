@@ -0,0 +1,109 @@
+"""
+Popula o banco de DATABASE_URL com dados sintéticos para testes de
+escala (índices, paginação, relatórios).
+
+    python -m smartsales.tools.seed --scale medium
+    python -m smartsales.tools.seed --scale small --orders 100000 --truncate
+
+Todos os usuários gerados (user1@example.com é admin) usam a senha
+informada em --password.
+"""
+
+import argparse
+import dataclasses
+import sys
+import time
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.engine import Engine
+
+from smartsales.core.security import get_password_hash
+from smartsales.core.settings import Settings
+from smartsales.models import table_registry
+from smartsales.models.auth import Auth
+from smartsales.tools.datagen import SCALES, seed_database, supports_copy
+
+
+def clear_database(engine: Engine) -> None:
+    """Apaga os dados de todas as tabelas da aplicação."""
+    tables = table_registry.metadata.sorted_tables
+    with engine.begin() as conn:
+        if engine.dialect.name == 'postgresql':
+            names = ', '.join(table.name for table in tables)
+            conn.exec_driver_sql(f'TRUNCATE {names} RESTART IDENTITY CASCADE')
+        else:
+            for table in reversed(tables):
+                conn.execute(table.delete())
+
+
+def _is_empty(engine: Engine) -> bool:
+    with engine.connect() as conn:
+        return not conn.scalar(select(func.count()).select_from(Auth))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Gera dados sintéticos em escala no banco da aplicação.'
+    )
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    for field in ('users', 'clients', 'products', 'orders'):
+        parser.add_argument(
+            f'--{field}', type=int, help=f'sobrescreve {field} da escala'
+        )
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--batch-size', type=int, default=5_000)
+    parser.add_argument('--password', default='benchmark')
+    parser.add_argument(
+        '--database-url', help='padrão: DATABASE_URL das settings'
+    )
+    parser.add_argument(
+        '--truncate',
+        action='store_true',
+        help='apaga os dados existentes antes de gerar',
+    )
+    parser.add_argument(
+        '--no-copy',
+        action='store_true',
+        help='força INSERTs em lote mesmo no PostgreSQL',
+    )
+    args = parser.parse_args(argv)
+
+    overrides = {
+        field: getattr(args, field)
+        for field in ('users', 'clients', 'products', 'orders')
+        if getattr(args, field) is not None
+    }
+    scale = dataclasses.replace(SCALES[args.scale], **overrides)
+    engine = create_engine(args.database_url or Settings().DATABASE_URL)
+
+    if args.truncate:
+        clear_database(engine)
+    elif not _is_empty(engine):
+        sys.stderr.write(
+            'O banco já tem dados; use --truncate para substituí-los.\n'
+        )
+        return 1
+
+    use_copy = supports_copy(engine) and not args.no_copy
+    sys.stdout.write(
+        f'Gerando {scale} via {"COPY" if use_copy else "INSERT"}...\n'
+    )
+    started = time.perf_counter()
+    counts = seed_database(
+        engine,
+        scale,
+        password_hash=get_password_hash(args.password),
+        seed=args.seed,
+        batch_size=args.batch_size,
+        use_copy=use_copy,
+    )
+    elapsed = time.perf_counter() - started
+    for table, total in counts.items():
+        sys.stdout.write(f'  {table:<12} {total:>12,}\n')
+    sys.stdout.write(f'Concluído em {elapsed:.1f}s\n')
+    engine.dispose()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+import asyncio
+import random
+import time
+from collections.abc import Callable, Hashable
+
+HTTP_TOO_MANY_REQUESTS = 429
+
+
+class LLMBusyError(RuntimeError):
+    """Fila de chamadas ao LLM cheia além do tempo de espera."""
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """Identifica o erro de rate limit do provedor (Groq/OpenAI-like)."""
+    status_code = getattr(exc, 'status_code', None)
+    return (
+        status_code == HTTP_TOO_MANY_REQUESTS
+        or type(exc).__name__ == 'RateLimitError'
+    )
+
+
+def call_with_backoff(
+    func: Callable,
+    *args,
+    retries: int = 3,
+    base_delay: float = 0.5,
+    max_delay: float = 8.0,
+):
+    """
+    Executa `func(*args)` repetindo em caso de rate limit, com backoff
+    exponencial e jitter completo (espera aleatória em [0, base * 2^n]).
+    Outros erros são propagados na primeira ocorrência.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return func(*args)
+        except Exception as exc:
+            if attempt == retries or not is_rate_limit_error(exc):
+                raise
+            delay = min(max_delay, base_delay * 2**attempt)
+            time.sleep(random.uniform(0, delay))
+
+
+class LLMGate:
+    """
+    Limita as chamadas ao LLM por processo:
+      - no máximo `max_concurrency` em execução; quem espera mais que
+        `queue_timeout` segundos por uma vaga recebe LLMBusyError;
+      - chamadas idênticas (mesma `key`) em andamento são agrupadas
+        (single-flight): só a primeira executa, as demais aguardam o
+        mesmo resultado.
+
+    A função é síncrona e roda em uma thread, fora do event loop.
+    """
+
+    def __init__(self, max_concurrency: int = 4, queue_timeout: float = 10):
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+
+    async def run(self, key: Hashable, func: Callable, *args):
+        """
+        Retorna (resultado, coalesced), onde `coalesced` indica que o
+        resultado veio de uma chamada já em andamento.
+        """
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight), True
+
+        task = asyncio.ensure_future(self._call(func, *args))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield: se este cliente desconectar, os demais seguem esperando
+        return await asyncio.shield(task), False
+
+    async def _call(self, func: Callable, *args):
+        try:
+            await asyncio.wait_for(
+                self._semaphore.acquire(), timeout=self.queue_timeout
+            )
+        except TimeoutError:
+            raise LLMBusyError('Muitas pesquisas em andamento.')
+        try:
+            return await asyncio.to_thread(func, *args)
+        finally:
+            self._semaphore.release()
@@ -0,0 +1,153 @@
+from collections import Counter, defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+
+from smartsales.utils.sql_sandbox import summarize_rows
+
+# Aproximação usada para converter o orçamento de tokens em caracteres
+CHARS_PER_TOKEN = 4
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float, Decimal)) and not isinstance(
+        value, bool
+    )
+
+
+def _fmt(value) -> str:
+    if isinstance(value, (float, Decimal)):
+        return f'{float(value):.2f}'
+    return str(value)
+
+
+def is_key_column(name: str) -> bool:
+    """Colunas de id/chave estrangeira: somá-las não diz nada."""
+    name = name.lower()
+    return name == 'id' or name.endswith('_id')
+
+
+def column_stats(name: str, values: tuple) -> dict:
+    """
+    Estatísticas de uma coluna: contagem, nulos e, conforme o tipo,
+    min/max/média/soma (numérico), min/max (datas) ou distintos.
+    """
+    present = [v for v in values if v is not None]
+    stats = {
+        'column': name,
+        'count': len(present),
+        'nulls': len(values) - len(present),
+    }
+    if not present:
+        stats['kind'] = 'empty'
+    elif all(_is_number(v) for v in present):
+        total = sum(float(v) for v in present)
+        stats.update(
+            kind='numeric',
+            min=min(present),
+            max=max(present),
+            sum=total,
+            avg=total / len(present),
+        )
+    elif all(isinstance(v, (date, datetime)) for v in present):
+        stats.update(kind='date', min=min(present), max=max(present))
+    else:
+        stats.update(kind='text', distinct=len(set(map(str, present))))
+    return stats
+
+
+def top_groups(
+    keys: tuple, measures: tuple | None = None, top_k: int = 5
+) -> list[tuple[str, int, float | None]]:
+    """
+    Os `top_k` valores mais frequentes de uma coluna categórica, com a
+    soma da coluna numérica `measures` (se houver) para cada grupo.
+    """
+    counts = Counter(map(str, keys))
+    sums: dict[str, float] = defaultdict(float)
+    if measures is not None:
+        for key, measure in zip(keys, measures):
+            if _is_number(measure):
+                sums[str(key)] += float(measure)
+    return [
+        (key, count, sums[key] if measures is not None else None)
+        for key, count in counts.most_common(top_k)
+    ]
+
+
+def compact_result(  # noqa: PLR0913, PLR0917
+    columns: list[str],
+    rows: list[tuple],
+    truncated: bool = False,
+    token_budget: int = 2000,
+    top_k: int = 5,
+    sample_size: int = 20,
+) -> str:
+    """
+    Compacta o resultado de uma consulta para o prompt do LLM.
+
+    Se a tabela completa couber no orçamento, ela é enviada como está.
+    Caso contrário, envia estatísticas por coluna, os grupos mais
+    frequentes das colunas de texto e uma amostra das linhas, sempre
+    limitado a `token_budget` tokens (aprox.).
+    """
+    max_chars = token_budget * CHARS_PER_TOKEN
+    header = f'Total de linhas: {len(rows)}' + (
+        ' (limite de linhas atingido)' if truncated else ''
+    )
+
+    full = summarize_rows(columns, rows, max_chars=max_chars - len(header) - 1)
+    if len(full.splitlines()) == len(rows) + 1:
+        return f'{header}\n{full}'
+
+    # processa coluna a coluna (transposição única das linhas)
+    by_column = list(zip(*rows)) if rows else [() for _ in columns]
+    stats = [
+        column_stats(name, values) for name, values in zip(columns, by_column)
+    ]
+    # medida dos grupos: primeira coluna numérica que não seja chave
+    measure_idx = next(
+        (
+            i
+            for i, s in enumerate(stats)
+            if s['kind'] == 'numeric' and not is_key_column(s['column'])
+        ),
+        None,
+    )
+
+    lines = [header, '', 'Colunas:']
+    for s in stats:
+        if s['kind'] in {'numeric', 'date'}:
+            detail = f'min={_fmt(s["min"])} max={_fmt(s["max"])}'
+            if s['kind'] == 'numeric':
+                detail += f' soma={_fmt(s["sum"])} media={_fmt(s["avg"])}'
+        elif s['kind'] == 'text':
+            detail = f'distintos={s["distinct"]}'
+        else:
+            detail = 'sem valores'
+        lines.append(
+            f'- {s["column"]} ({s["kind"]}, nulos={s["nulls"]}): {detail}'
+        )
+
+    for idx, s in enumerate(stats):
+        if s['kind'] != 'text' or s['distinct'] == len(rows):
+            continue
+        measures = by_column[measure_idx] if measure_idx is not None else None
+        lines.extend(['', f'Top {top_k} por {s["column"]}:'])
+        for key, count, total in top_groups(by_column[idx], measures, top_k):
+            line = f'- {key}: {count} linhas'
+            if total is not None:
+                line += f', soma {columns[measure_idx]}={_fmt(total)}'
+            lines.append(line)
+
+    summary = '\n'.join(lines)
+    remaining = max_chars - len(summary) - len('\n\nAmostra:\n')
+    if remaining <= 0:
+        return summary[:max_chars]
+
+    sample = summarize_rows(
+        columns,
+        rows[:sample_size],
+        truncated=len(rows) > sample_size,
+        max_chars=remaining,
+    )
+    return f'{summary}\n\nAmostra:\n{sample}'
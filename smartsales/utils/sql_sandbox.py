@@ -0,0 +1,118 @@
+import json
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+
+class UnsafeQueryError(ValueError):
+    """Consulta gerada pelo LLM recusada antes ou durante a execução."""
+
+
+def strip_statement(query: str) -> str:
+    """
+    Remove o ';' final e recusa textos com mais de um comando SQL.
+    """
+    statement = query.strip().rstrip(';').strip()
+    if ';' in statement:
+        raise UnsafeQueryError('Apenas um comando SQL é permitido.')
+    if not statement.lower().startswith(('select', 'with')):
+        raise UnsafeQueryError(f'Consulta SQL inválida gerada: {statement}')
+    return statement
+
+
+def enforce_limit(query: str, max_rows: int) -> str:
+    """
+    Envolve a consulta em um SELECT externo com LIMIT, independente
+    do LIMIT que o LLM tenha (ou não) escrito. Busca uma linha a mais
+    para saber se o resultado foi truncado.
+    """
+    statement = strip_statement(query)
+    return (
+        f'SELECT * FROM ({statement}) AS llm_query LIMIT {int(max_rows) + 1}'
+    )
+
+
+def _plan_total_cost(raw_plan) -> float:
+    # psycopg já devolve o JSON decodificado; outros drivers, texto
+    if isinstance(raw_plan, str):
+        raw_plan = json.loads(raw_plan)
+    return float(raw_plan[0]['Plan']['Total Cost'])
+
+
+def execute_sandboxed(
+    engine: Engine,
+    query: str,
+    max_rows: int = 200,
+    statement_timeout_ms: int = 5000,
+    max_cost: float = 100_000,
+) -> tuple[str, list[str], list[tuple], bool]:
+    """
+    Executa a consulta gerada pelo LLM de forma limitada:
+      - conexão própria, em transação somente leitura (PostgreSQL)
+        e sempre desfeita ao final;
+      - statement_timeout no servidor;
+      - custo estimado via EXPLAIN recusado acima de `max_cost`;
+      - LIMIT imposto e leitura em streaming até `max_rows` linhas.
+
+    Retorna (consulta executada, colunas, linhas, truncado).
+    """
+    limited = enforce_limit(query, max_rows)
+    is_postgres = engine.dialect.name == 'postgresql'
+
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            if is_postgres:
+                conn.execute(text('SET TRANSACTION READ ONLY'))
+                conn.execute(
+                    text(
+                        'SET LOCAL statement_timeout = '
+                        f'{int(statement_timeout_ms)}'
+                    )
+                )
+                plan = conn.execute(
+                    text(f'EXPLAIN (FORMAT JSON) {limited}')
+                ).scalar()
+                cost = _plan_total_cost(plan)
+                if cost > max_cost:
+                    raise UnsafeQueryError(
+                        f'Consulta muito custosa (custo estimado {cost:.0f}).'
+                    )
+
+            result = conn.execution_options(
+                stream_results=True, max_row_buffer=max_rows + 1
+            ).execute(text(limited))
+            columns = list(result.keys())
+            rows = [tuple(row) for row in result.fetchmany(max_rows + 1)]
+            result.close()
+        finally:
+            trans.rollback()
+
+    truncated = len(rows) > max_rows
+    return limited, columns, rows[:max_rows], truncated
+
+
+def summarize_rows(
+    columns: list[str],
+    rows: list[tuple],
+    truncated: bool = False,
+    max_chars: int = 8000,
+) -> str:
+    """
+    Serializa as linhas para o prompt sem passar de `max_chars`.
+    """
+    lines = [' | '.join(columns)]
+    size = len(lines[0])
+    shown = 0
+    for row in rows:
+        line = ' | '.join(str(value) for value in row)
+        if size + len(line) + 1 > max_chars:
+            truncated = True
+            break
+        lines.append(line)
+        size += len(line) + 1
+        shown += 1
+
+    if truncated:
+        lines.append(f'... (resultado truncado, {shown} linhas exibidas)')
+    return '\n'.join(lines)
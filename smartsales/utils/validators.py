@@ -14,6 +14,16 @@ def validate_full_name(name: str) -> str:
     return name
 
 
+def cpf_check_digit(digits: str) -> int:
+    """
+    Dígito verificador do CPF para os `digits` anteriores
+    (9 dígitos para o primeiro, 10 para o segundo).
+    """
+    i = len(digits)
+    value = sum((int(digits[num]) * ((i + 1) - num) for num in range(0, i)))
+    return ((value * 10) % 11) % 10
+
+
 def validate_cpf(cpf: str) -> str:
     """
     Valida o CPF tanto na formação quanto nos dígitos verificadores
@@ -29,9 +39,7 @@ def validate_cpf(cpf: str) -> str:
 
     # Cálculo dos dígitos verificadores
     for i in range(9, 11):
-        value = sum((int(cpf[num]) * ((i + 1) - num) for num in range(0, i)))
-        digit = ((value * 10) % 11) % 10
-        if digit != int(cpf[i]):
+        if cpf_check_digit(cpf[:i]) != int(cpf[i]):
             raise ValueError('CPF inválido')
 
     return cpf
@@ -0,0 +1,49 @@
+import logging
+
+import httpx
+
+from smartsales.core.settings import Settings
+
+logger = logging.getLogger(__name__)
+settings = Settings()
+
+GRAPH_API_URL = 'https://graph.facebook.com/v20.0/{phone_number_id}/messages'
+
+
+def whatsapp_enabled() -> bool:
+    return bool(
+        settings.WHATSAPP_TOKEN
+        and settings.WHATSAPP_PHONE_NUMBER_ID
+        and settings.WHATSAPP_ALERT_TO
+    )
+
+
+def send_whatsapp_message(text: str, to: str | None = None) -> bool:
+    """
+    Envia uma mensagem de texto pela WhatsApp Cloud API. Sem as
+    credenciais configuradas apenas registra no log. Retorna se a
+    mensagem foi aceita pela API.
+    """
+    to = to or settings.WHATSAPP_ALERT_TO
+    if not whatsapp_enabled() or not to:
+        logger.info('WhatsApp não configurado; mensagem: %s', text)
+        return False
+    try:
+        response = httpx.post(
+            GRAPH_API_URL.format(
+                phone_number_id=settings.WHATSAPP_PHONE_NUMBER_ID
+            ),
+            headers={'Authorization': f'Bearer {settings.WHATSAPP_TOKEN}'},
+            json={
+                'messaging_product': 'whatsapp',
+                'to': to,
+                'type': 'text',
+                'text': {'body': text},
+            },
+            timeout=10,
+        )
+        response.raise_for_status()
+    except httpx.HTTPError:
+        logger.exception('Falha ao enviar mensagem pelo WhatsApp')
+        return False
+    return True
@@ -0,0 +1,25 @@
+from smartsales.core.cache import MemoryLRUCache
+
+
+def test_lru_descarta_o_menos_usado():
+    cache = MemoryLRUCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.get('c') == 3  # noqa: PLR2004
+
+
+def test_ttl_expira(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr('smartsales.core.cache.time.monotonic', lambda: now[0])
+    cache = MemoryLRUCache(maxsize=10, ttl=5)
+    cache.set('a', 1)
+
+    now[0] += 4
+    assert cache.get('a') == 1
+    now[0] += 2
+    assert cache.get('a') is None
@@ -0,0 +1,55 @@
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from smartsales.core.http_cache import (
+    etag_matches,
+    require_if_match,
+    version_etag,
+    weak_etag,
+)
+
+
+def _request(if_none_match=None, if_match=None):
+    headers = []
+    if if_none_match is not None:
+        headers.append((b'if-none-match', if_none_match.encode()))
+    if if_match is not None:
+        headers.append((b'if-match', if_match.encode()))
+    return Request({'type': 'http', 'headers': headers})
+
+
+def test_etag_muda_com_updated_at():
+    antes = weak_etag('product', 1, datetime(2025, 6, 1, 10))
+    depois = weak_etag('product', 1, datetime(2025, 6, 1, 11))
+
+    assert antes.startswith('W/"')
+    assert antes == weak_etag('product', 1, datetime(2025, 6, 1, 10))
+    assert antes != depois
+
+
+def test_if_none_match_comparacao_fraca():
+    etag = weak_etag('client', 2, None)
+    opaque = etag.removeprefix('W/')
+
+    assert etag_matches(_request(etag), etag)
+    assert etag_matches(_request(f'"outro", {opaque}'), etag)
+    assert etag_matches(_request('*'), etag)
+    assert not etag_matches(_request('"outro"'), etag)
+    assert not etag_matches(_request(), etag)
+
+
+def test_if_match_exige_a_versao_atual():
+    etag = version_etag(3)
+
+    require_if_match(_request(if_match='"3"'), etag)
+    require_if_match(_request(if_match='"2", "3"'), etag)
+    require_if_match(_request(if_match='*'), etag)
+    require_if_match(_request(), etag)
+    for stale in ('"2"', 'W/"3"'):
+        with pytest.raises(HTTPException) as exc:
+            require_if_match(_request(if_match=stale), etag)
+        assert exc.value.status_code == 412  # noqa: PLR2004
+        assert exc.value.headers['etag'] == etag
@@ -0,0 +1,45 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from smartsales.core.metrics import (
+    REQUESTS_TOTAL,
+    Histogram,
+    MetricsMiddleware,
+    registry,
+)
+
+
+def test_histograma_acumula_buckets():
+    hist = Histogram('latency', 'teste', ('route',), buckets=(0.1, 1.0))
+    hist.observe(0.05, '/a')
+    hist.observe(0.5, '/a')
+    hist.observe(3, '/a')
+
+    lines = hist.render()
+
+    assert 'latency_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'latency_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'latency_count{route="/a"} 3' in lines
+
+
+def test_middleware_usa_template_da_rota():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get('/items/{item_id}')
+    def read_item(item_id: int):
+        return {'id': item_id}
+
+    client = TestClient(app)
+    client.get('/items/1')
+    client.get('/items/2')
+    client.get('/nao-existe')
+
+    output = registry.render()
+    assert (
+        'http_requests_total{method="GET",route="/items/{item_id}",'
+        'status="200"} 2' in output
+    )
+    assert REQUESTS_TOTAL._values[('GET', '<unmatched>', 404)] >= 1
+    assert 'http_requests_in_flight 0' in output
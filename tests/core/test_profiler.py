@@ -0,0 +1,98 @@
+import time
+from http import HTTPStatus
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from smartsales.controllers import admin_controller
+from smartsales.core import profiler as profiler_module
+from smartsales.core.profiler import (
+    ProfilerBusyError,
+    RequestProfilerMiddleware,
+    SamplingProfiler,
+    profile_store,
+)
+from smartsales.core.security import get_current_admin
+from smartsales.routers.admin_router import router as admin_router
+
+
+def _busy_hot_path(seconds):
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(100))
+    return total
+
+
+def test_amostragem_encontra_funcao_quente():
+    with SamplingProfiler(interval=0.001) as profiler:
+        _busy_hot_path(0.2)
+
+    assert profiler.total_samples > 0
+    assert '_busy_hot_path' in profiler.collapsed()
+
+
+def test_speedscope_referencia_quadros_validos():
+    with SamplingProfiler(interval=0.001) as profiler:
+        _busy_hot_path(0.05)
+
+    data = profiler.speedscope('teste')
+    profile = data['profiles'][0]
+    frames = data['shared']['frames']
+
+    assert profile['type'] == 'sampled'
+    assert len(profile['samples']) == len(profile['weights'])
+    assert all(
+        0 <= index < len(frames)
+        for sample in profile['samples']
+        for index in sample
+    )
+
+
+def test_uma_amostragem_por_vez():
+    with SamplingProfiler():
+        with pytest.raises(ProfilerBusyError):
+            SamplingProfiler().start()
+
+    SamplingProfiler().start().stop()
+
+
+def test_cabecalho_x_profile_somente_para_admin(monkeypatch):
+    monkeypatch.setattr(
+        profiler_module, '_is_admin_token', lambda engine, token: token == 'a'
+    )
+    app = FastAPI()
+    app.add_middleware(RequestProfilerMiddleware, engine=None, interval=0.001)
+
+    @app.get('/hot')
+    def hot():
+        return {'total': _busy_hot_path(0.05)}
+
+    client = TestClient(app)
+    response = client.get(
+        '/hot', headers={'X-Profile': '1', 'Authorization': 'Bearer a'}
+    )
+    other = client.get(
+        '/hot', headers={'X-Profile': '1', 'Authorization': 'Bearer u'}
+    )
+
+    profile = profile_store.get(response.headers['x-profile-id'])
+    assert profile['profiles'][0]['name'] == 'GET /hot'
+    assert 'x-profile-id' not in other.headers
+
+
+def test_endpoint_de_profile_devolve_speedscope(monkeypatch):
+    monkeypatch.setattr(admin_controller.settings, 'PROFILING_ENABLED', True)
+    app = FastAPI()
+    app.include_router(admin_router, prefix='/api')
+    app.dependency_overrides[get_current_admin] = lambda: None
+    client = TestClient(app)
+
+    response = client.get('/api/admin/profile', params={'seconds': 0.05})
+    too_long = client.get('/api/admin/profile', params={'seconds': 3600})
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['profiles'][0]['type'] == 'sampled'
+    assert 'speedscope.json' in response.headers['content-disposition']
+    assert too_long.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,51 @@
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from smartsales.core import query_stats
+from smartsales.core.query_stats import QueryStatsMiddleware, instrument_engine
+
+
+def _app(engine):
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware)
+
+    @app.get('/items')
+    def list_items():
+        with engine.connect() as conn:
+            for _ in range(3):
+                conn.execute(text('SELECT 1')).scalar()
+        return []
+
+    return app
+
+
+def test_server_timing_conta_as_consultas():
+    engine = create_engine('sqlite://', poolclass=StaticPool)
+    instrument_engine(engine, slow_query_ms=10_000)
+
+    response = TestClient(_app(engine)).get('/items')
+
+    assert response.headers['server-timing'].endswith('desc="3 queries"')
+    assert response.headers['server-timing'].startswith('db;dur=')
+
+
+def test_consulta_lenta_gera_log_e_explain(caplog):
+    engine = create_engine(
+        'sqlite://',
+        poolclass=StaticPool,
+        connect_args={'check_same_thread': False},
+    )
+    instrument_engine(engine, slow_query_ms=0)
+
+    with caplog.at_level(logging.WARNING, logger=query_stats.__name__):
+        TestClient(_app(engine)).get('/items')
+        query_stats._get_explainer().shutdown(wait=True)
+        query_stats._explainer = None
+
+    messages = [r.getMessage() for r in caplog.records]
+    assert any(m.startswith('Consulta lenta') for m in messages)
+    assert any(m.startswith('Plano da consulta lenta') for m in messages)
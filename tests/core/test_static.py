@@ -0,0 +1,56 @@
+import gzip
+from http import HTTPStatus
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from smartsales.core.static import IMMUTABLE, CachedStaticFiles
+
+DIGEST = 'a' * 64
+
+
+def _client(tmp_path) -> TestClient:
+    (tmp_path / f'{DIGEST}.png').write_bytes(b'0123456789')
+    (tmp_path / 'logo.svg').write_text('<svg/>')
+    (tmp_path / 'logo.svg.gz').write_bytes(gzip.compress(b'<svg/>'))
+    app = FastAPI()
+    app.mount('/static', CachedStaticFiles(directory=tmp_path))
+    return TestClient(app)
+
+
+def test_arquivo_com_hash_e_imutavel_com_etag_forte(tmp_path):
+    client = _client(tmp_path)
+
+    response = client.get(f'/static/{DIGEST}.png')
+    cached = client.get(
+        f'/static/{DIGEST}.png',
+        headers={'If-None-Match': response.headers['etag']},
+    )
+
+    assert response.headers['cache-control'] == IMMUTABLE
+    assert response.headers['etag'] == f'"{DIGEST}.png"'
+    assert cached.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_range_request(tmp_path):
+    client = _client(tmp_path)
+
+    response = client.get(
+        f'/static/{DIGEST}.png', headers={'Range': 'bytes=2-4'}
+    )
+
+    assert response.status_code == HTTPStatus.PARTIAL_CONTENT
+    assert response.content == b'234'
+
+
+def test_serve_variante_pre_comprimida(tmp_path):
+    client = _client(tmp_path)
+
+    response = client.get(
+        '/static/logo.svg', headers={'Accept-Encoding': 'gzip'}
+    )
+
+    assert response.headers['content-encoding'] == 'gzip'
+    assert response.headers['content-type'].startswith('image/svg+xml')
+    assert response.text == '<svg/>'
+    assert 'immutable' not in response.headers['cache-control']
@@ -0,0 +1,81 @@
+from io import BytesIO
+
+from smartsales.core.storage import S3Storage
+from smartsales.services.images_service import store_stream
+
+PNG = b'\x89PNG\r\n\x1a\n' + b'\x00' * 100
+
+
+class NotFound(Exception):
+    response = {'Error': {'Code': '404'}}
+
+
+class FakeS3Client:
+    """Substituto em memória do cliente boto3 (subconjunto usado)."""
+
+    def __init__(self):
+        self.objects = {}
+        self.uploads = 0
+
+    def head_object(self, Bucket, Key):  # noqa: N803
+        if (Bucket, Key) not in self.objects:
+            raise NotFound()
+
+    def upload_file(self, filename, bucket, key, ExtraArgs):  # noqa: N803
+        self.uploads += 1
+        with open(filename, 'rb') as f:
+            self.objects[bucket, key] = (f.read(), ExtraArgs)
+
+    def copy_object(self, Bucket, Key, CopySource, **extra):  # noqa: N803
+        data = self.objects[CopySource['Bucket'], CopySource['Key']][0]
+        self.objects[Bucket, Key] = (data, extra)
+
+    def delete_object(self, Bucket, Key):  # noqa: N803
+        self.objects.pop((Bucket, Key), None)
+
+    def download_fileobj(self, bucket, key, fileobj):
+        fileobj.write(self.objects[bucket, key][0])
+
+    @staticmethod
+    def generate_presigned_post(**kwargs):
+        return {'url': 'http://minio/bucket', 'fields': {'key': kwargs['Key']}}
+
+
+def test_s3_storage_envia_uma_vez_por_conteudo():
+    client = FakeS3Client()
+    storage = S3Storage(client, 'bucket', 'http://cdn/bucket/')
+
+    first = store_stream(BytesIO(PNG), storage, 1024, 16)
+    second = store_stream(BytesIO(PNG), storage, 1024, 16)
+
+    key = storage.key_from_ref(first)
+    assert first == second == f'http://cdn/bucket/{key}'
+    assert client.uploads == 1
+    data, extra = client.objects['bucket', key]
+    assert data == PNG
+    assert extra['ContentType'] == 'image/png'
+
+
+def test_s3_storage_local_copy_e_presign():
+    client = FakeS3Client()
+    storage = S3Storage(client, 'bucket', 'http://cdn/bucket')
+    client.objects['bucket', 'uploads/a.png'] = (PNG, {})
+
+    with storage.local_copy('uploads/a.png') as path:
+        assert path.read_bytes() == PNG
+    assert not path.exists()
+
+    presigned = storage.presign_upload('uploads/a.png', 'image/png', 10, 60)
+    assert presigned['fields'] == {'key': 'uploads/a.png'}
+
+
+def test_s3_storage_promote_nao_sobrescreve_chave_existente():
+    client = FakeS3Client()
+    storage = S3Storage(client, 'bucket', 'http://cdn/bucket')
+    client.objects['bucket', 'uploads/a.png'] = (PNG, {})
+    client.objects['bucket', 'staging/x.png'] = (b'outro', {})
+
+    ref = storage.promote('staging/x.png', 'uploads/a.png', 'image/png')
+
+    assert ref == 'http://cdn/bucket/uploads/a.png'
+    assert client.objects == {('bucket', 'uploads/a.png'): (PNG, {})}
@@ -0,0 +1,109 @@
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from smartsales.models import table_registry
+from smartsales.models.auth import Auth, UserRole
+from smartsales.models.products import Product
+from smartsales.services import alerts_service
+from smartsales.services.alerts_service import (
+    alerts_service as get_alerts,
+)
+from smartsales.services.alerts_service import (
+    register_alert_handler,
+    shutdown_alert_notifier,
+    track_stock_change,
+)
+
+ADMIN = SimpleNamespace(id=1, role=UserRole.ADMIN)
+
+
+def _product(title, stock, expiry_date=None, owner_id=1):
+    return Product(
+        title=title, sale_price=1, section='Geral', description=None,
+        barcode=None, stock=stock, expiry_date=expiry_date, images=None,
+        owner_id=owner_id,
+    )  # fmt: skip
+
+
+@pytest.fixture
+def db():
+    engine = create_engine('sqlite://')
+    table_registry.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(
+            Auth(
+                name='Admin Root', email='a@a.com', password='x', role='admin'
+            )
+        )
+        session.flush()
+        today = date.today()
+        session.add_all([
+            _product('Leite', 2, today + timedelta(days=3)),
+            _product('Arroz', 50, today + timedelta(days=300)),
+            _product('Pão', 0, today - timedelta(days=1)),
+        ])
+        session.commit()
+        yield session
+    alerts_service._cache.clear()
+
+
+@pytest.fixture
+def received():
+    alerts = []
+    handler = register_alert_handler(alerts.append)
+    yield alerts
+    alerts_service._handlers.remove(handler)
+
+
+def test_lista_estoque_baixo_e_validade(db):
+    data = get_alerts(db, ADMIN, threshold=5, days=7)
+
+    assert [p['title'] for p in data['low_stock']] == ['Pão', 'Leite']
+    assert [p['title'] for p in data['expiring']] == ['Pão', 'Leite']
+
+
+def test_alerta_somente_ao_cruzar_o_limite(db, received):
+    arroz, leite = db.get(Product, 2), db.get(Product, 1)
+    track_stock_change(db, arroz, arroz.stock)
+    arroz.stock = 4
+    track_stock_change(db, leite, leite.stock)
+    leite.stock = 1  # já estava abaixo do limite
+    db.commit()
+    shutdown_alert_notifier()
+
+    assert [(a['title'], a['stock']) for a in received] == [('Arroz', 4)]
+
+
+def test_rollback_descarta_alertas(db, received):
+    arroz = db.get(Product, 2)
+    track_stock_change(db, arroz, arroz.stock)
+    arroz.stock = 1
+    db.rollback()
+    db.commit()
+    shutdown_alert_notifier()
+
+    assert received == []
+
+
+def test_commit_invalida_cache(db):
+    assert len(get_alerts(db, ADMIN, threshold=5)['low_stock']) == 2  # noqa: PLR2004
+
+    arroz = db.get(Product, 2)
+    track_stock_change(db, arroz, arroz.stock)
+    arroz.stock = 3
+    db.commit()
+
+    assert len(get_alerts(db, ADMIN, threshold=5)['low_stock']) == 3  # noqa: PLR2004
+
+
+def test_cache_limitado_por_entradas(db, monkeypatch):
+    monkeypatch.setattr(alerts_service.settings, 'ALERT_CACHE_MAX_ENTRIES', 2)
+
+    for threshold in range(5):
+        get_alerts(db, ADMIN, threshold=threshold)
+
+    assert [key[1] for key in alerts_service._cache] == [3, 4]
@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from smartsales.models import table_registry
+from smartsales.models.auth import Auth, UserRole
+from smartsales.schemas.clients_schema import ClientCreate, ClientUpdate
+from smartsales.services.clients_service import (
+    create_client_service,
+    get_clients_version_service,
+    update_client_service,
+)
+
+ADMIN = SimpleNamespace(id=1, role=UserRole.ADMIN)
+
+
+def test_versao_da_lista_muda_ao_editar_cliente_antigo():
+    engine = create_engine('sqlite://')
+    table_registry.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(
+            Auth(
+                name='Admin Root', email='a@a.com', password='x', role='admin'
+            )
+        )
+        db.commit()
+        first = create_client_service(
+            db,
+            ClientCreate(
+                name='Ana Silva', email='ana@a.com', cpf='52998224725'
+            ),
+            ADMIN,
+        )
+        create_client_service(
+            db,
+            ClientCreate(
+                name='Rui Costa', email='rui@a.com', cpf='11144477735'
+            ),
+            ADMIN,
+        )
+        before = get_clients_version_service(db, ADMIN)
+
+        update_client_service(
+            db, first.id, ClientUpdate(name='Ana Souza'), ADMIN
+        )
+
+        assert get_clients_version_service(db, ADMIN) != before
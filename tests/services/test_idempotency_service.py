@@ -0,0 +1,116 @@
+import asyncio
+from datetime import datetime, timedelta
+from http import HTTPStatus
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException, Request
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from smartsales.controllers.orders_controller import create_order
+from smartsales.models import table_registry
+from smartsales.models.auth import Auth, UserRole
+from smartsales.models.clients import Client
+from smartsales.models.idempotency import IdempotencyKey
+from smartsales.models.orders import Order
+from smartsales.models.products import Product
+from smartsales.schemas.orders_schema import OrderCreate
+from smartsales.services.idempotency_service import (
+    new_idempotency_key,
+    purge_expired_idempotency_keys,
+)
+from smartsales.services.orders_service import create_order_service
+
+ADMIN = SimpleNamespace(id=1, role=UserRole.ADMIN)
+REQUEST = Request({
+    'type': 'http', 'method': 'POST', 'path': '/api/orders/', 'headers': [],
+})  # fmt: skip
+
+
+@pytest.fixture
+def db():
+    engine = create_engine('sqlite://')
+    table_registry.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(
+            Auth(
+                name='Admin Root', email='a@a.com', password='x', role='admin'
+            )
+        )
+        session.flush()
+        session.add_all([
+            Client(name='Ana Silva', email='c@c.com', cpf='1', owner_id=1),
+            Product(
+                title='Café', sale_price=10, section='Mercearia',
+                description=None, barcode=None, stock=10, expiry_date=None,
+                images=None, owner_id=1,
+            ),
+        ])  # fmt: skip
+        session.commit()
+        yield session
+
+
+def _post(db, quantity, key='k1'):
+    payload = OrderCreate(
+        client_id=1, items=[{'product_id': 1, 'quantity': quantity}]
+    )
+    return asyncio.run(
+        create_order(
+            payload, REQUEST, idempotency_key=key, db=db, current_user=ADMIN
+        )
+    )
+
+
+def _count_orders(db):
+    return db.scalar(select(func.count()).select_from(Order))
+
+
+def test_retentativa_devolve_resposta_guardada_sem_novo_pedido(db):
+    first = _post(db, 2)
+    replay = _post(db, 2)
+
+    assert replay.status_code == HTTPStatus.CREATED
+    assert replay.headers['idempotent-replayed'] == 'true'
+    assert replay.body.decode() == first.model_dump_json()
+    assert _count_orders(db) == 1
+    db.expire_all()
+    # estoque baixado uma única vez
+    assert db.get(Product, 1).stock == 8  # noqa: PLR2004
+
+
+def test_mesma_chave_com_outro_corpo_retorna_422(db):
+    _post(db, 2)
+
+    with pytest.raises(HTTPException) as exc:
+        _post(db, 3)
+
+    assert exc.value.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert _count_orders(db) == 1
+
+
+def test_chave_concorrente_falha_na_pk_antes_do_estoque(db):
+    _post(db, 10)  # a primeira requisição levou todo o estoque
+    payload = OrderCreate(
+        client_id=1, items=[{'product_id': 1, 'quantity': 10}]
+    )
+    record = new_idempotency_key(ADMIN, 'k1', 'outra-requisicao')
+
+    # sem passar pelo find: como uma retentativa que chegou junto
+    with pytest.raises(IntegrityError):
+        create_order_service(db, payload, ADMIN, idempotency=record)
+
+
+def test_chave_expirada_permite_novo_pedido_e_e_purgada(db):
+    _post(db, 1)
+    db.get(IdempotencyKey, (1, 'k1')).expires_at = datetime(2000, 1, 1)
+    db.commit()
+
+    _post(db, 1)
+    _post(db, 1, key='k2')
+    assert _count_orders(db) == 3  # noqa: PLR2004
+
+    later = datetime.now() + timedelta(days=2)
+    assert purge_expired_idempotency_keys(db, now=later) == 2  # noqa: PLR2004
+    assert db.scalar(select(func.count()).select_from(IdempotencyKey)) == 0
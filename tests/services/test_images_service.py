@@ -0,0 +1,102 @@
+import hashlib
+from http import HTTPStatus
+from io import BytesIO
+
+import pytest
+from fastapi import HTTPException
+
+from smartsales.core.storage import LocalStorage
+from smartsales.services import images_service
+from smartsales.services.images_service import (
+    confirm_image_upload,
+    generate_variants,
+    presign_image_upload,
+    store_stream,
+)
+
+PNG = b'\x89PNG\r\n\x1a\n' + b'\x00' * 100
+
+
+def test_store_stream_grava_por_hash_e_deduplica(tmp_path):
+    storage = LocalStorage(tmp_path)
+
+    first = store_stream(BytesIO(PNG), storage, 1024, 16)
+    second = store_stream(BytesIO(PNG), storage, 1024, 16)
+
+    assert first == second
+    assert first.endswith('.png')
+    assert (tmp_path / storage.key_from_ref(first)).read_bytes() == PNG
+    assert [p.name for p in tmp_path.rglob('*') if p.is_file()] == [
+        first.rsplit('/', 1)[1]
+    ]
+
+
+def test_store_stream_recusa_arquivo_grande_sem_deixar_temporario(tmp_path):
+    with pytest.raises(HTTPException) as exc:
+        store_stream(BytesIO(PNG), LocalStorage(tmp_path), 50, 16)
+
+    assert exc.value.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_store_stream_recusa_conteudo_que_nao_e_imagem(tmp_path):
+    with pytest.raises(HTTPException) as exc:
+        store_stream(BytesIO(b'<?php ?>'), LocalStorage(tmp_path), 1024, 16)
+
+    assert exc.value.status_code == HTTPStatus.UNSUPPORTED_MEDIA_TYPE
+
+
+def test_confirm_move_upload_direto_para_chave_do_conteudo(
+    tmp_path, monkeypatch
+):
+    storage = LocalStorage(tmp_path)
+    monkeypatch.setattr(images_service, 'get_storage', lambda: storage)
+    monkeypatch.setattr(
+        storage, 'presign_upload', lambda key, *args: {'url': '', 'fields': {}}
+    )
+    key = presign_image_upload('image/png', len(PNG))['key']
+    assert key.startswith('staging/')
+    (tmp_path / 'staging').mkdir()
+    (tmp_path / key).write_bytes(PNG)
+
+    ref = confirm_image_upload(key)
+
+    sha256 = hashlib.sha256(PNG).hexdigest()
+    assert storage.key_from_ref(ref) == f'uploads/{sha256}.png'
+    assert not (tmp_path / key).exists()
+
+
+def test_confirm_recusa_conteudo_invalido_e_chave_fora_do_staging(
+    tmp_path, monkeypatch
+):
+    storage = LocalStorage(tmp_path)
+    monkeypatch.setattr(images_service, 'get_storage', lambda: storage)
+    (tmp_path / 'staging').mkdir()
+    key = f'staging/{"0" * 32}.png'
+    (tmp_path / key).write_bytes(b'<?php ?>')
+
+    with pytest.raises(HTTPException) as exc:
+        confirm_image_upload(key)
+    assert exc.value.status_code == HTTPStatus.UNSUPPORTED_MEDIA_TYPE
+    assert not (tmp_path / key).exists()
+
+    with pytest.raises(HTTPException) as exc:
+        confirm_image_upload(f'uploads/{"0" * 64}.png')
+    assert exc.value.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_generate_variants_cria_webp_sem_ampliar(tmp_path):
+    image = pytest.importorskip('PIL.Image')
+    original = tmp_path / 'abc.png'
+    image.new('RGB', (600, 300), 'red').save(original)
+
+    variants = generate_variants(str(original), [160, 960], str(tmp_path))
+
+    assert variants == {
+        '160': (tmp_path / 'abc_w160.webp').as_posix(),
+        '960': (tmp_path / 'abc_w960.webp').as_posix(),
+    }
+    with image.open(variants['160']) as small:
+        assert small.size == (160, 80)
+    with image.open(variants['960']) as large:
+        assert large.size == (600, 300)
@@ -0,0 +1,192 @@
+import asyncio
+from datetime import datetime, timedelta
+from http import HTTPStatus
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from smartsales.models import table_registry
+from smartsales.models.auth import UserRole
+from smartsales.models.jobs import Job, JobStatus
+from smartsales.services import jobs_service
+from smartsales.services.jobs_service import (
+    JobRunner,
+    claim_jobs,
+    enqueue_job,
+    finish_job,
+    get_job_service,
+    purge_finished_jobs,
+    register_job,
+    renew_lease,
+)
+
+USER = SimpleNamespace(id=1, role=UserRole.USER)
+OTHER = SimpleNamespace(id=2, role=UserRole.USER)
+calls = []
+
+
+@register_job('test.sync')
+def _sync_job(value):
+    calls.append(value)
+
+
+@register_job('test.flaky', max_attempts=2)
+async def _flaky_job():
+    raise RuntimeError('falhou')
+
+
+@register_job('test.slow')
+async def _slow_job():
+    await asyncio.sleep(10)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    # arquivo: o runner usa conexões próprias, em outras threads
+    engine = create_engine(f'sqlite:///{tmp_path / "jobs.db"}')
+    table_registry.metadata.create_all(engine)
+    calls.clear()
+    return engine
+
+
+@pytest.fixture
+def db(engine):
+    with Session(engine) as session:
+        yield session
+
+
+def _enqueue(db, name, payload=None):
+    job = enqueue_job(db, name, payload, owner_id=USER.id)
+    db.commit()
+    return job.id
+
+
+def test_tarefa_desconhecida_nao_e_enfileirada(db):
+    with pytest.raises(ValueError, match='desconhecida'):
+        enqueue_job(db, 'nao.existe')
+
+
+def test_falha_reagenda_com_backoff_e_depois_falha(db):
+    job_id = _enqueue(db, 'test.flaky')
+    now = datetime.now()
+
+    assert [j['id'] for j in claim_jobs(db, 10, now=now)] == [job_id]
+    assert claim_jobs(db, 10, now=now) == []  # já em execução
+    assert finish_job(db, job_id, 1, 'erro', now=now) == JobStatus.queued
+    job = db.get(Job, job_id)
+    assert job.run_after > now
+    assert claim_jobs(db, 10, now=now) == []  # aguardando o backoff
+
+    later = now + timedelta(hours=2)
+    assert len(claim_jobs(db, 10, now=later)) == 1
+    assert finish_job(db, job_id, 2, 'erro', now=later) == JobStatus.failed
+
+
+def test_tarefa_de_worker_que_caiu_e_retomada(db):
+    job_id = _enqueue(db, 'test.sync', {'value': 1})
+    now = datetime.now()
+    claim_jobs(db, 10, now=now)
+
+    assert claim_jobs(db, 10, lease_seconds=60, now=now) == []
+    retaken = claim_jobs(
+        db, 10, lease_seconds=60, now=now + timedelta(minutes=5)
+    )
+    assert [j['id'] for j in retaken] == [job_id]
+    assert db.get(Job, job_id).attempts == 2  # noqa: PLR2004
+
+
+def test_lease_renovado_e_resultado_so_do_dono_atual(db):
+    job_id = _enqueue(db, 'test.sync', {'value': 1})
+    now = datetime.now()
+    claim_jobs(db, 10, now=now)
+
+    # o dono renova o lease: a tarefa não é retomada
+    later = now + timedelta(minutes=5)
+    assert renew_lease(db, job_id, 1, now=later)
+    assert claim_jobs(db, 10, lease_seconds=60, now=later) == []
+
+    # sem renovação, outro worker retoma; o dono antigo não grava mais
+    much_later = later + timedelta(minutes=5)
+    assert len(claim_jobs(db, 10, lease_seconds=60, now=much_later)) == 1
+    assert not renew_lease(db, job_id, 1)
+    assert finish_job(db, job_id, 1) is None
+    assert finish_job(db, job_id, 2) == JobStatus.succeeded
+
+
+def _states(engine, *job_ids):
+    with Session(engine) as session:
+        jobs = [session.get(Job, job_id) for job_id in job_ids]
+        return [(job.status, job.attempts) for job in jobs]
+
+
+def test_runner_executa_e_reagenda_falhas(engine, db):
+    ok = _enqueue(db, 'test.sync', {'value': 'a'})
+    flaky = _enqueue(db, 'test.flaky')
+    runner = JobRunner(engine, workers=2, queue_size=1, poll_interval=0.01)
+    # a tarefa com falha volta para a fila, aguardando o backoff
+    done = [(JobStatus.succeeded, 1), (JobStatus.queued, 1)]
+
+    async def run():
+        await runner.start()
+        for _ in range(500):
+            await asyncio.sleep(0.01)
+            if await asyncio.to_thread(_states, engine, ok, flaky) == done:
+                break
+        await runner.stop()
+
+    asyncio.run(run())
+    assert calls == ['a']
+    assert _states(engine, ok, flaky) == done
+
+
+def test_worker_sobrevive_a_erro_e_stop_devolve_em_execucao(
+    engine, db, monkeypatch
+):
+    broken = _enqueue(db, 'test.sync', {'value': 'a'})
+    runner = JobRunner(engine, workers=1, poll_interval=0.01)
+
+    def fail_once(*args, **kwargs):
+        monkeypatch.undo()
+        raise RuntimeError('banco fora')
+
+    monkeypatch.setattr(jobs_service, 'finish_job', fail_once)
+
+    async def run():
+        await runner.start()
+        for _ in range(500):
+            await asyncio.sleep(0.01)
+            if calls:
+                break
+        slow = await asyncio.to_thread(_enqueue, db, 'test.slow')
+        for _ in range(500):
+            await asyncio.sleep(0.01)
+            if runner._running:
+                break
+        runner.shutdown_timeout = 0.05
+        await runner.stop()
+        return slow
+
+    slow = asyncio.run(run())
+    # o erro ao gravar não matou o worker: a tarefa lenta foi buscada
+    # e, no desligamento, devolvida à fila sem contar a tentativa
+    assert calls == ['a']
+    assert _states(engine, broken, slow) == [
+        (JobStatus.running, 1),
+        (JobStatus.queued, 0),
+    ]
+
+
+def test_status_so_para_o_dono_e_purge(db):
+    job_id = _enqueue(db, 'test.sync', {'value': 1})
+    assert get_job_service(db, job_id, USER).name == 'test.sync'
+    with pytest.raises(HTTPException) as exc:
+        get_job_service(db, job_id, OTHER)
+    assert exc.value.status_code == HTTPStatus.FORBIDDEN
+
+    claim_jobs(db, 10)
+    finish_job(db, job_id, 1)
+    assert purge_finished_jobs(db, now=datetime.now() + timedelta(days=30))
+    assert db.get(Job, job_id) is None
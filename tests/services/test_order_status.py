@@ -0,0 +1,112 @@
+from http import HTTPStatus
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from smartsales.models import table_registry
+from smartsales.models.auth import Auth, UserRole
+from smartsales.models.clients import Client
+from smartsales.models.orders import Order, OrderStatus
+from smartsales.models.products import Product
+from smartsales.models.rollups import DailySales
+from smartsales.schemas.orders_schema import OrderCreate, OrderUpdate
+from smartsales.services.orders_service import (
+    bulk_transition_status_service,
+    create_order_service,
+    list_orders_version_service,
+    update_order_service,
+)
+
+ADMIN = SimpleNamespace(id=1, role=UserRole.ADMIN)
+ITEMS = [{'product_id': 1, 'quantity': 1}]
+
+
+@pytest.fixture
+def db():
+    engine = create_engine('sqlite://')
+    table_registry.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(
+            Auth(
+                name='Admin Root', email='a@a.com', password='x', role='admin'
+            )
+        )
+        session.flush()
+        session.add_all([
+            Client(name='Ana Silva', email='c@c.com', cpf='1', owner_id=1),
+            Product(
+                title='Café', sale_price=10, section='Mercearia',
+                description=None, barcode=None, stock=100, expiry_date=None,
+                images=None, owner_id=1,
+            ),
+        ])  # fmt: skip
+        session.commit()
+        yield session
+
+
+def _order(db, status):
+    payload = OrderCreate(client_id=1, status=status, items=ITEMS)
+    return create_order_service(db, payload, ADMIN).id
+
+
+def test_lote_atualiza_so_transicoes_validas(db):
+    pending = _order(db, 'pending')
+    confirmed = _order(db, 'confirmed')
+    delivered = _order(db, 'delivered')
+
+    updated, failed = bulk_transition_status_service(
+        db, [confirmed, pending, delivered, 999], 'shipped', ADMIN
+    )
+
+    assert updated == [confirmed]
+    assert [(f['id'], f['status']) for f in failed] == [
+        (pending, OrderStatus.pending),
+        (delivered, OrderStatus.delivered),
+        (999, None),
+    ]
+    assert failed[-1]['detail'] == 'Pedido não encontrado.'
+
+
+def test_cancelamento_em_lote_sai_dos_agregados(db):
+    ids = [_order(db, 'pending'), _order(db, 'confirmed')]
+    assert db.scalar(select(DailySales.orders)) == len(ids)
+
+    updated, failed = bulk_transition_status_service(
+        db, ids, 'canceled', ADMIN
+    )
+
+    assert (updated, failed) == (ids, [])
+    db.expire_all()
+    assert not db.scalar(select(DailySales.orders))
+
+
+def test_put_recusa_transicao_invalida_e_mantem_status_omitido(db):
+    order_id = _order(db, 'delivered')
+    pedido = db.get(Order, order_id)
+    volta = OrderUpdate(client_id=1, status='pending', items=ITEMS)
+    with pytest.raises(HTTPException) as exc:
+        update_order_service(db, pedido, volta, ADMIN)
+    assert exc.value.status_code == HTTPStatus.BAD_REQUEST
+    db.rollback()
+
+    pedido = db.get(Order, order_id)
+    pedido = update_order_service(
+        db, pedido, OrderUpdate(client_id=1, items=ITEMS), ADMIN
+    )
+    assert pedido.status == OrderStatus.delivered
+
+
+def test_versao_da_lista_muda_ao_editar_pedido_antigo(db):
+    first = _order(db, 'pending')
+    _order(db, 'pending')
+    before = list_orders_version_service(db, ADMIN)
+
+    order = db.get(Order, first)
+    update_order_service(
+        db, order, OrderUpdate(client_id=1, items=ITEMS), ADMIN
+    )
+
+    assert list_orders_version_service(db, ADMIN) != before
@@ -0,0 +1,161 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from smartsales.models import table_registry
+from smartsales.models.auth import Auth, UserRole
+from smartsales.models.clients import Client
+from smartsales.models.outbox import OutboxEvent
+from smartsales.models.products import Product
+from smartsales.schemas.orders_schema import OrderCreate
+from smartsales.services import outbox_service
+from smartsales.services.orders_service import (
+    bulk_transition_status_service,
+    create_order_service,
+    delete_order_service,
+)
+from smartsales.services.outbox_service import (
+    QueueSink,
+    dispatch_pending,
+    list_events_service,
+    purge_dispatched_events,
+    record_event,
+)
+
+ADMIN = SimpleNamespace(id=1, role=UserRole.ADMIN)
+OTHER = SimpleNamespace(id=2, role=UserRole.USER)
+LATER = datetime.now() + timedelta(hours=1)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine('sqlite://')
+    table_registry.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(
+            Auth(
+                name='Admin Root', email='a@a.com', password='x', role='admin'
+            )
+        )
+        session.flush()
+        session.add_all([
+            Client(name='Ana Silva', email='c@c.com', cpf='1', owner_id=1),
+            Product(
+                title='Café', sale_price=10, section='Mercearia',
+                description=None, barcode=None, stock=10, expiry_date=None,
+                images=None, owner_id=1,
+            ),
+        ])  # fmt: skip
+        session.commit()
+        yield session
+
+
+def _create(db):
+    payload = OrderCreate(
+        client_id=1, items=[{'product_id': 1, 'quantity': 2}]
+    )
+    return create_order_service(db, payload, ADMIN)
+
+
+def _types(db):
+    return db.scalars(select(OutboxEvent.event_type).order_by(OutboxEvent.id))
+
+
+def test_eventos_gravados_na_transacao_do_pedido(db):
+    order = _create(db)
+    bulk_transition_status_service(db, [order.id], 'confirmed', ADMIN)
+    delete_order_service(db, db.get(type(order), order.id), ADMIN)
+
+    assert list(_types(db)) == [
+        'order.created',
+        'order.status_changed',
+        'order.deleted',
+    ]
+    created = db.scalar(select(OutboxEvent).order_by(OutboxEvent.id))
+    assert created.payload['items'] == [{'product_id': 1, 'quantity': 2}]
+    assert created.payload['total_value'] == '20.00'
+
+
+def test_rollback_descarta_eventos_da_transacao(db):
+    order = _create(db)
+
+    record_event(db, 'order.updated', order)
+    db.rollback()
+    db.commit()
+
+    assert list(_types(db)) == ['order.created']
+
+
+def test_dispatch_entrega_em_ordem_uma_vez(db):
+    _create(db)
+    _create(db)
+    sink = QueueSink()
+
+    assert dispatch_pending(db, [sink], batch_size=10) == 2  # noqa: PLR2004
+    assert dispatch_pending(db, [sink], batch_size=10) == 0
+
+    delivered = [sink.queue.get_nowait() for _ in range(sink.queue.qsize())]
+    assert [e['event_type'] for e in delivered] == ['order.created'] * 2
+    assert delivered[0]['id'] < delivered[1]['id']
+
+
+def test_evento_com_falha_nao_trava_os_demais(db, monkeypatch):
+    monkeypatch.setattr(outbox_service.settings, 'OUTBOX_MAX_ATTEMPTS', 2)
+    first, second = _create(db), _create(db)
+    sink = QueueSink()
+
+    def picky(events):
+        if any(e['aggregate_id'] == first.id for e in events):
+            raise RuntimeError('fora do ar')
+        sink(events)
+
+    assert dispatch_pending(db, [picky]) == 2  # noqa: PLR2004
+    assert sink.queue.get_nowait()['aggregate_id'] == second.id
+    # reservado até a lease vencer; depois, segunda e última tentativa
+    assert dispatch_pending(db, [picky]) == 0
+    assert dispatch_pending(db, [picky], now=LATER) == 1
+    assert dispatch_pending(db, [picky], now=LATER) == 0
+
+    parked = db.scalars(
+        select(OutboxEvent).where(OutboxEvent.aggregate_id == first.id)
+    ).one()
+    assert parked.attempts == 2  # noqa: PLR2004
+    assert parked.failed_at is not None
+    assert parked.dispatched_at is None
+    assert parked.last_error == 'RuntimeError: fora do ar'
+    assert dispatch_pending(db, [sink], now=LATER + timedelta(days=1)) == 0
+
+
+def test_feed_por_cursor_e_por_dono(db):
+    first, second = _create(db), _create(db)
+    events = list_events_service(db, ADMIN, now=LATER)
+    assert [e.aggregate_id for e in events] == [first.id, second.id]
+
+    after = list_events_service(db, ADMIN, since=events[0].id, now=LATER)
+    assert [e.aggregate_id for e in after] == [second.id]
+    assert list_events_service(db, OTHER, now=LATER) == []
+    # eventos recém-gravados ainda não aparecem (janela de acomodação)
+    assert list_events_service(db, ADMIN, now=datetime(2000, 1, 1)) == []
+
+
+def test_janela_do_feed_usa_relogio_do_banco(db, monkeypatch):
+    order = _create(db)
+
+    assert list_events_service(db, ADMIN) == []
+    monkeypatch.setattr(
+        outbox_service.settings, 'OUTBOX_FEED_SETTLE_SECONDS', 0
+    )
+    events = list_events_service(db, ADMIN)
+    assert [e.aggregate_id for e in events] == [order.id]
+
+
+def test_purge_remove_so_entregues_antigos(db):
+    _create(db)
+    dispatch_pending(db, [])
+    _create(db)
+
+    assert purge_dispatched_events(db, now=LATER + timedelta(days=30)) == 1
+    assert list(_types(db)) == ['order.created']
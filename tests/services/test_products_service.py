@@ -0,0 +1,149 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+from smartsales.core.cache import get_cache
+from smartsales.models import table_registry
+from smartsales.models.auth import Auth, UserRole
+from smartsales.models.jobs import Job
+from smartsales.models.products import Product
+from smartsales.schemas.products_schema import ProductUpdate
+from smartsales.services import images_service  # noqa: F401
+from smartsales.services.products_service import (
+    VARIANTS_JOB,
+    add_product_image_service,
+    get_product_view_service,
+    update_product_service,
+)
+
+ADMIN = SimpleNamespace(id=1, role=UserRole.ADMIN)
+OTHER = SimpleNamespace(id=2, role=UserRole.USER)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine('sqlite://')
+    table_registry.metadata.create_all(engine)
+    get_cache().clear()
+    with Session(engine) as session:
+        session.add(
+            Auth(
+                name='Admin Root', email='a@a.com', password='x', role='admin'
+            )
+        )
+        session.flush()
+        session.add(
+            Product(
+                title='Café',
+                sale_price=12,
+                section='Mercearia',
+                description=None,
+                barcode=None,
+                stock=8,
+                expiry_date=None,
+                images=None,
+                owner_id=1,
+            )  # fmt: skip
+        )
+        session.commit()
+        yield session
+    get_cache().clear()
+
+
+def test_estoque_vem_sempre_do_banco(db):
+    get_product_view_service(db, 1, ADMIN)  # popula o cache
+    db.get(Product, 1).stock = 3
+    db.commit()
+
+    data = get_product_view_service(db, 1, ADMIN)
+
+    assert data['title'] == 'Café'
+    assert data['stock'] == 3  # noqa: PLR2004
+
+
+def test_update_atualiza_o_cache(db):
+    get_product_view_service(db, 1, ADMIN)
+    update_product_service(
+        db,
+        1,
+        ProductUpdate(title='Café', section='Mercearia', sale_price=15),
+        ADMIN,
+    )
+
+    assert get_product_view_service(db, 1, ADMIN)['sale_price'] == 15  # noqa: PLR2004
+
+
+def test_escrita_de_outro_worker_invalida_o_cache(db):
+    get_product_view_service(db, 1, ADMIN)
+    # outro worker grava sem passar pelo cache deste processo
+    db.execute(
+        update(Product)
+        .where(Product.id == 1)
+        .values(
+            title='Café Especial',
+            version=Product.version + 1,
+            content_version=Product.content_version + 1,
+        )
+    )
+    db.commit()
+
+    data = get_product_view_service(db, 1, ADMIN)
+
+    assert (data['title'], data['version']) == ('Café Especial', 2)
+
+
+def test_movimento_de_estoque_mantem_o_cache(db):
+    get_product_view_service(db, 1, ADMIN)
+    # venda: muda estoque e versão, mas não o cadastro
+    db.execute(
+        update(Product)
+        .where(Product.id == 1)
+        .values(stock=5, title='fora do cache', version=Product.version + 1)
+    )
+    db.commit()
+
+    data = get_product_view_service(db, 1, ADMIN)
+
+    assert (data['title'], data['stock'], data['version']) == ('Café', 5, 2)
+
+
+def test_cache_respeita_o_dono(db):
+    get_product_view_service(db, 1, ADMIN)
+
+    with pytest.raises(HTTPException) as exc:
+        get_product_view_service(db, 1, OTHER)
+    assert exc.value.status_code == 403  # noqa: PLR2004
+
+
+def test_escrita_com_versao_antiga_gera_conflito(db):
+    with Session(db.get_bind()) as other:
+        stale = other.get(Product, 1)
+        update_product_service(
+            db,
+            1,
+            ProductUpdate(title='Café', section='Mercearia', sale_price=15),
+            ADMIN,
+        )
+
+        stale.sale_price = 20
+        with pytest.raises(StaleDataError):
+            other.commit()
+
+    assert get_product_view_service(db, 1, ADMIN)['version'] == 2  # noqa: PLR2004
+
+
+def test_imagem_nova_enfileira_variantes_na_mesma_transacao(db):
+    product, job = add_product_image_service(db, 1, 'a.jpg', ADMIN)
+
+    saved = db.get(Job, job.id)
+    assert (saved.name, saved.payload) == (
+        VARIANTS_JOB,
+        {'product_id': 1, 'refs': ['a.jpg']},
+    )
+    assert product.images == ['a.jpg']
+    # imagem já associada: nada novo a gerar
+    assert add_product_image_service(db, 1, 'a.jpg', ADMIN)[1] is None
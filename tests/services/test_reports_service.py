@@ -0,0 +1,200 @@
+from datetime import date, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import Session
+
+from smartsales.models import table_registry
+from smartsales.models.auth import Auth, UserRole
+from smartsales.models.clients import Client
+from smartsales.models.orders import Order, OrderItem, OrderStatus
+from smartsales.models.products import Product
+from smartsales.models.rollups import (
+    DailyProductSales,
+    DailySales,
+    DailySectionSales,
+)
+from smartsales.services.reports_service import (
+    average_basket_service,
+    revenue_over_time_service,
+    sections_service,
+    top_products_service,
+)
+from smartsales.services.rollups_service import (
+    apply_order_to_rollups,
+    rebuild_rollups,
+)
+
+ADMIN = SimpleNamespace(id=1, role=UserRole.ADMIN)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine('sqlite://')
+    table_registry.metadata.create_all(engine)
+    with Session(engine) as session:
+        owner = Auth(
+            name='Admin Root', email='a@a.com', password='x', role='admin'
+        )
+        session.add(owner)
+        session.flush()
+        client = Client(
+            name='Ana Silva', email='c@c.com', cpf='1', owner_id=owner.id
+        )
+        apple = Product(
+            title='Maçã', sale_price=2, section='Frutas', description=None,
+            barcode=None, stock=10, expiry_date=None, images=None,
+            owner_id=owner.id,
+        )  # fmt: skip
+        soap = Product(
+            title='Sabão', sale_price=5, section='Limpeza', description=None,
+            barcode=None, stock=10, expiry_date=None, images=None,
+            owner_id=owner.id,
+        )  # fmt: skip
+        session.add_all([client, apple, soap])
+        session.flush()
+
+        orders = [
+            (datetime(2025, 6, 1, 10), OrderStatus.confirmed, [(apple, 3)]),
+            (datetime(2025, 6, 1, 15), OrderStatus.pending, [(soap, 1)]),
+            (datetime(2025, 6, 2, 9), OrderStatus.delivered, [(apple, 1)]),
+            (datetime(2025, 6, 2, 9), OrderStatus.canceled, [(soap, 9)]),
+        ]
+        for created_at, status, items in orders:
+            total = sum(p.sale_price * q for p, q in items)
+            order = Order(
+                client_id=client.id,
+                total_value=total,
+                status=status,
+                owner_id=owner.id,
+            )
+            session.add(order)
+            session.flush()
+            for product, quantity in items:
+                session.add(
+                    OrderItem(
+                        order_id=order.id,
+                        product_id=product.id,
+                        quantity=quantity,
+                        unit_price=product.sale_price,
+                        total_price=product.sale_price * quantity,
+                        section=product.section,
+                    )
+                )
+            session.execute(
+                update(Order)
+                .where(Order.id == order.id)
+                .values(created_at=created_at)
+            )
+        rebuild_rollups(session)
+        session.commit()
+        yield session
+
+
+def test_receita_por_dia_ignora_cancelados(db):
+    rows = revenue_over_time_service(db, ADMIN, 'day')
+
+    assert [(r['period'], r['orders'], r['revenue']) for r in rows] == [
+        ('2025-06-01', 2, Decimal('11.00')),
+        ('2025-06-02', 1, Decimal('2.00')),
+    ]
+
+
+def test_receita_por_mes(db):
+    rows = revenue_over_time_service(db, ADMIN, 'month')
+
+    assert [r['period'] for r in rows] == ['2025-06-01']
+
+
+def test_top_produtos_e_secoes(db):
+    top = top_products_service(db, ADMIN, limit=1)
+    sections = sections_service(db, ADMIN)
+
+    assert top == [
+        {
+            'product_id': 1,
+            'title': 'Maçã',
+            'quantity': 4,
+            'revenue': Decimal('8.00'),
+        }
+    ]
+    assert [s['section'] for s in sections] == ['Frutas', 'Limpeza']
+
+
+def test_ticket_medio(db):
+    basket = average_basket_service(db, ADMIN, since=datetime(2025, 6, 1))
+
+    assert basket['orders'] == 3  # noqa: PLR2004
+    assert float(basket['average_ticket']) == pytest.approx(13 / 3, 0.01)
+    assert float(basket['average_items']) == pytest.approx(5 / 3, 0.01)
+
+
+def _snapshot(session):
+    return {
+        model: sorted(
+            tuple(getattr(row, c.key) for c in model.__table__.columns)
+            for row in session.scalars(select(model))
+        )
+        for model in (DailySales, DailyProductSales, DailySectionSales)
+    }
+
+
+def test_rebuild_agrega_por_dia(db):
+    rows = db.scalars(select(DailySales).order_by(DailySales.day)).all()
+
+    assert [(r.day, r.orders, r.items, r.revenue) for r in rows] == [
+        (date(2025, 6, 1), 2, 4, Decimal('11.00')),
+        (date(2025, 6, 2), 1, 1, Decimal('2.00')),
+    ]
+
+
+def test_incremental_igual_ao_rebuild(db):
+    order = db.scalars(
+        select(Order).where(Order.status == OrderStatus.pending)
+    ).first()
+
+    # remove o pedido dos agregados e o cancela
+    apply_order_to_rollups(db, order, order.items, sign=-1)
+    order.status = OrderStatus.canceled
+    db.flush()
+    incremental = _snapshot(db)
+
+    rebuild_rollups(db)
+    assert incremental == _snapshot(db)
+
+    # reativar devolve a contribuição
+    order.status = OrderStatus.confirmed
+    apply_order_to_rollups(db, order, order.items)
+    db.flush()
+    incremental = _snapshot(db)
+
+    rebuild_rollups(db, since=date(2025, 6, 1))
+    assert incremental == _snapshot(db)
+
+
+def test_mudar_secao_do_produto_nao_desvia_agregados(db):
+    order = db.scalars(
+        select(Order).where(Order.status == OrderStatus.confirmed)
+    ).first()
+    apple = db.get(Product, order.items[0].product_id)
+
+    # a maçã muda de seção depois da venda e o pedido é excluído
+    apple.section = 'Limpeza'
+    db.flush()
+    apply_order_to_rollups(db, order, order.items, sign=-1)
+    db.delete(order)
+    db.flush()
+    incremental = _snapshot(db)
+
+    rebuild_rollups(db)
+    assert incremental == _snapshot(db)
+    sections = {
+        (r.day, r.section): r.quantity
+        for r in db.scalars(select(DailySectionSales))
+    }
+    assert sections == {
+        (date(2025, 6, 1), 'Limpeza'): 1,
+        (date(2025, 6, 2), 'Frutas'): 1,
+    }
@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta
+from http import HTTPStatus
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from smartsales.models import table_registry
+from smartsales.models.auth import Auth, UserRole
+from smartsales.models.clients import Client
+from smartsales.models.products import Product
+from smartsales.models.reservations import ReservationStatus
+from smartsales.schemas.orders_schema import OrderCreate, OrderUpdate
+from smartsales.schemas.reservations_schema import ReservationCreate
+from smartsales.services.orders_service import (
+    create_order_service,
+    delete_order_service,
+    update_order_service,
+)
+from smartsales.services.reservations_service import (
+    create_reservation_service,
+    release_expired_reservations,
+    release_reservation_service,
+)
+
+ADMIN = SimpleNamespace(id=1, role=UserRole.ADMIN)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine('sqlite://')
+    table_registry.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(
+            Auth(
+                name='Admin Root', email='a@a.com', password='x', role='admin'
+            )
+        )
+        session.flush()
+        session.add_all([
+            Client(name='Ana Silva', email='c@c.com', cpf='1', owner_id=1),
+            Product(
+                title='Café', sale_price=10, section='Mercearia',
+                description=None, barcode=None, stock=10, expiry_date=None,
+                images=None, owner_id=1,
+            ),
+        ])  # fmt: skip
+        session.commit()
+        yield session
+
+
+def _stock(db):
+    db.expire_all()
+    return db.get(Product, 1).stock
+
+
+def _hold(db, quantity, ttl=None):
+    return create_reservation_service(
+        db,
+        ReservationCreate(
+            items=[{'product_id': 1, 'quantity': quantity}], ttl_seconds=ttl
+        ),
+        ADMIN,
+    )
+
+
+def test_reserva_baixa_estoque_e_sweeper_devolve(db):
+    reserva = _hold(db, 4, ttl=60)
+    assert _stock(db) == 6  # noqa: PLR2004
+
+    assert release_expired_reservations(db) == 0
+    later = datetime.utcnow() + timedelta(seconds=120)
+    assert release_expired_reservations(db, now=later) == 1
+
+    db.refresh(reserva)
+    assert reserva.status == ReservationStatus.expired
+    assert _stock(db) == 10  # noqa: PLR2004
+
+
+def test_estoque_insuficiente_nao_altera_nada(db):
+    with pytest.raises(HTTPException) as exc:
+        _hold(db, 11)
+    db.rollback()
+
+    assert exc.value.status_code == HTTPStatus.BAD_REQUEST
+    assert _stock(db) == 10  # noqa: PLR2004
+
+
+def test_pedido_consome_reserva_e_baixa_so_a_diferenca(db):
+    reserva = _hold(db, 3)
+    payload = OrderCreate(
+        client_id=1,
+        items=[{'product_id': 1, 'quantity': 5}],
+        reservation_id=reserva.id,
+    )
+
+    order = create_order_service(db, payload, ADMIN)
+
+    db.refresh(reserva)
+    assert reserva.status == ReservationStatus.consumed
+    assert reserva.order_id == order.id
+    assert _stock(db) == 5  # noqa: PLR2004
+    with pytest.raises(HTTPException) as exc:
+        create_order_service(db, payload, ADMIN)
+    assert exc.value.status_code == HTTPStatus.CONFLICT
+
+
+def test_reserva_liberada_nao_pode_ser_usada(db):
+    reserva = _hold(db, 2)
+    release_reservation_service(db, reserva)
+
+    assert _stock(db) == 10  # noqa: PLR2004
+    with pytest.raises(HTTPException) as exc:
+        release_reservation_service(db, reserva)
+    assert exc.value.status_code == HTTPStatus.CONFLICT
+
+
+def test_update_e_delete_de_pedido_ajustam_pela_diferenca(db):
+    order = create_order_service(
+        db,
+        OrderCreate(client_id=1, items=[{'product_id': 1, 'quantity': 2}]),
+        ADMIN,
+    )
+    update_order_service(
+        db,
+        order,
+        OrderUpdate(client_id=1, items=[{'product_id': 1, 'quantity': 7}]),
+        ADMIN,
+    )
+    assert _stock(db) == 3  # noqa: PLR2004
+
+    delete_order_service(db, order, ADMIN)
+    assert _stock(db) == 10  # noqa: PLR2004
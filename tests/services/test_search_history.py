@@ -0,0 +1,82 @@
+import json
+from datetime import datetime
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.pool import StaticPool
+
+from smartsales.models import table_registry
+from smartsales.models.search import Search
+from smartsales.services.search_history_service import SearchHistoryQueue
+
+
+def _row(query: str) -> dict:
+    return {
+        'query': query,
+        'database': False,
+        'response': 'resposta',
+        'owner_id': None,
+        'created_at': datetime(2025, 6, 1, 12, 0),
+    }
+
+
+def _engine():
+    # a thread de gravação precisa enxergar o mesmo banco em memória
+    return create_engine(
+        'sqlite://',
+        connect_args={'check_same_thread': False},
+        poolclass=StaticPool,
+    )
+
+
+def _count(engine) -> int:
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(Search)).scalar()
+
+
+def test_fila_grava_em_lote_ao_parar(tmp_path):
+    engine = _engine()
+    table_registry.metadata.create_all(engine)
+    history = SearchHistoryQueue(
+        engine, batch_size=10, fallback_path=tmp_path / 'fallback.jsonl'
+    )
+
+    history.start()
+    for i in range(25):
+        history.put(_row(f'pergunta {i}'))
+    history.stop()
+
+    assert _count(engine) == 25  # noqa: PLR2004
+
+
+def test_fila_usa_arquivo_quando_banco_falha_e_reaplica(tmp_path):
+    fallback = tmp_path / 'fallback.jsonl'
+    engine = _engine()
+    history = SearchHistoryQueue(engine, fallback_path=fallback)
+
+    history.put(_row('sem tabela'))  # tabela ainda não existe
+
+    assert fallback.read_text().count('\n') == 1
+
+    table_registry.metadata.create_all(engine)
+    history.start()
+    history.stop()
+
+    assert _count(engine) == 1
+    assert not fallback.exists()
+
+
+def test_reaplica_replay_orfao_e_ignora_linha_truncada(tmp_path):
+    fallback = tmp_path / 'fallback.jsonl'
+    engine = _engine()
+    table_registry.metadata.create_all(engine)
+    row = json.dumps(_row('órfã'), default=str)
+    # .replay de um início interrompido + fallback com linha truncada
+    fallback.with_suffix('.replay').write_text(row + '\n')
+    fallback.write_text(row + '\n' + row[:10])
+    history = SearchHistoryQueue(engine, fallback_path=fallback)
+
+    history.start()
+    history.stop()
+
+    assert _count(engine) == 2  # noqa: PLR2004
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from smartsales.models import table_registry
+from smartsales.models.auth import UserRole
+from smartsales.models.search import Search
+from smartsales.services.search_service import SearchService
+
+USER = SimpleNamespace(id=1, role=UserRole.USER)
+ADMIN = SimpleNamespace(id=2, role=UserRole.ADMIN)
+
+
+def _session() -> Session:
+    engine = create_engine('sqlite://')
+    table_registry.metadata.create_all(engine)
+    session = Session(engine)
+    start = datetime(2025, 6, 1)
+    session.execute(
+        insert(Search),
+        [
+            {
+                'query': 'Quantos pedidos?' if i < 3 else 'Estoque baixo?',  # noqa: PLR2004
+                'response': f'resposta {i}',
+                'database': False,
+                'owner_id': 1 if i < 5 else 2,  # noqa: PLR2004
+                'latency_ms': 100 * i,
+                'cached': i % 3 == 0,
+                'created_at': start + timedelta(minutes=i),
+            }
+            for i in range(8)
+        ],
+    )
+    session.commit()
+    return session
+
+
+def test_list_history_pagina_por_cursor_somente_do_dono():
+    db = _session()
+
+    first, cursor = SearchService.list_history(db, USER, limit=3)
+    second, last_cursor = SearchService.list_history(
+        db, USER, limit=3, cursor=cursor
+    )
+
+    assert [s.response for s in first] == [
+        'resposta 4',
+        'resposta 3',
+        'resposta 2',
+    ]
+    assert [s.response for s in second] == ['resposta 1', 'resposta 0']
+    assert last_cursor is None
+
+
+def test_list_history_busca_textual():
+    db = _session()
+
+    items, _ = SearchService.list_history(db, ADMIN, term='resposta 7')
+
+    assert [s.response for s in items] == ['resposta 7']
+
+
+def test_search_stats_agrega_no_banco():
+    db = _session()
+
+    stats = SearchService.search_stats(db, ADMIN, top=1)
+
+    assert stats['total'] == 8  # noqa: PLR2004
+    assert stats['cache_hit_ratio'] == 3 / 8
+    assert stats['top_questions'] == [{'query': 'estoque baixo?', 'total': 5}]
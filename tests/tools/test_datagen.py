@@ -0,0 +1,29 @@
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from smartsales.models import table_registry
+from smartsales.models.orders import Order
+from smartsales.models.rollups import DailySales
+from smartsales.tools.datagen import SCALES, make_cpf, seed_database
+from smartsales.utils.validators import validate_cpf
+
+
+def test_make_cpf_gera_cpfs_validos_e_unicos():
+    cpfs = [make_cpf(n) for n in range(1, 500)]
+
+    assert all(validate_cpf(cpf) for cpf in cpfs)
+    assert len(set(cpfs)) == len(cpfs)
+
+
+def test_seed_database_popula_tabelas_e_agregados():
+    engine = create_engine('sqlite://')
+    table_registry.metadata.create_all(engine)
+    scale = SCALES['tiny']
+
+    counts = seed_database(engine, scale, password_hash='x', batch_size=100)
+
+    assert counts['orders'] == scale.orders
+    assert counts['clients'] == scale.clients
+    with Session(engine) as session:
+        assert session.scalar(select(func.count(Order.id))) == scale.orders
+        assert session.scalar(select(func.sum(DailySales.orders))) > 0
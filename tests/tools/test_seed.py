@@ -0,0 +1,20 @@
+from sqlalchemy import create_engine, func, select
+
+from smartsales.models import table_registry
+from smartsales.models.orders import Order
+from smartsales.tools.seed import main
+
+
+def test_seed_recusa_banco_com_dados_sem_truncate(tmp_path, capsys):
+    url = f'sqlite:///{tmp_path / "seed.db"}'
+    engine = create_engine(url)
+    table_registry.metadata.create_all(engine)
+    args = ['--scale', 'tiny', '--orders', '50', '--database-url', url]
+
+    assert main(args) == 0
+    assert main(args) == 1
+    assert '--truncate' in capsys.readouterr().err
+
+    assert main([*args[:3], '80', *args[4:], '--truncate']) == 0
+    with engine.connect() as conn:
+        assert conn.scalar(select(func.count(Order.id))) == 80  # noqa: PLR2004
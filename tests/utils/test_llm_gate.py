@@ -0,0 +1,65 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from smartsales.utils.llm_gate import LLMBusyError, LLMGate, call_with_backoff
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+def test_gate_agrupa_chamadas_identicas_em_andamento():
+    calls = []
+
+    def slow_answer(q):
+        calls.append(q)
+        time.sleep(0.05)
+        return f'resposta {q}'
+
+    async def scenario():
+        gate = LLMGate(max_concurrency=2)
+        return await asyncio.gather(*[
+            gate.run('mesma', slow_answer, 'mesma') for _ in range(5)
+        ])
+
+    results = asyncio.run(scenario())
+
+    assert calls == ['mesma']
+    assert [coalesced for _, coalesced in results].count(False) == 1
+    assert {answer for answer, _ in results} == {'resposta mesma'}
+
+
+def test_gate_recusa_quando_fila_excede_timeout():
+    release = threading.Event()
+
+    async def scenario():
+        gate = LLMGate(max_concurrency=1, queue_timeout=0.01)
+        first = asyncio.ensure_future(gate.run('a', release.wait, 1))
+        await asyncio.sleep(0.01)
+        try:
+            with pytest.raises(LLMBusyError):
+                await gate.run('b', str, 'b')
+        finally:
+            release.set()
+            await first
+
+    asyncio.run(scenario())
+
+
+def test_call_with_backoff_repete_somente_rate_limit():
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:  # noqa: PLR2004
+            raise RateLimitError()
+        return 'ok'
+
+    assert call_with_backoff(flaky, retries=3, base_delay=0.001) == 'ok'
+    assert len(attempts) == 3  # noqa: PLR2004
+
+    with pytest.raises(ValueError, match='invalid literal'):
+        call_with_backoff(int, 'x', retries=3, base_delay=0.001)
@@ -0,0 +1,49 @@
+from decimal import Decimal
+
+from smartsales.utils.result_summary import compact_result, top_groups
+
+
+def test_compact_result_envia_tabela_completa_quando_cabe():
+    rows = [('Ana Silva', Decimal('10.00')), ('Rui Costa', Decimal('5.50'))]
+
+    result = compact_result(['name', 'total'], rows)
+
+    assert result.splitlines() == [
+        'Total de linhas: 2',
+        'name | total',
+        'Ana Silva | 10.00',
+        'Rui Costa | 5.50',
+    ]
+
+
+def test_compact_result_resume_resultado_grande_dentro_do_orcamento():
+    rows = [
+        (f'secao-{i % 3}', Decimal(i), f'produto {i}') for i in range(5000)
+    ]
+
+    result = compact_result(
+        ['section', 'price', 'title'], rows, token_budget=300
+    )
+
+    assert len(result) <= 300 * 4
+    assert 'Total de linhas: 5000' in result
+    assert '- price (numeric, nulos=0): min=0.00 max=4999.00' in result
+    assert 'Top 5 por section:' in result
+
+
+def test_top_groups_soma_medida_por_grupo():
+    keys = ('a', 'b', 'a', 'a')
+    measures = (1, 2, 3, Decimal('0.5'))
+
+    assert top_groups(keys, measures, top_k=1) == [('a', 3, 4.5)]
+
+
+def test_compact_result_nao_usa_id_como_medida():
+    rows = [(i, f'secao-{i % 3}', i % 7, Decimal(2)) for i in range(5000)]
+
+    result = compact_result(
+        ['id', 'section', 'client_id', 'price'], rows, token_budget=300
+    )
+
+    assert 'soma price=' in result
+    assert 'soma id=' not in result
@@ -0,0 +1,36 @@
+import pytest
+
+from smartsales.utils.sql_sandbox import (
+    UnsafeQueryError,
+    enforce_limit,
+    summarize_rows,
+)
+
+
+def test_enforce_limit_envolve_consulta_e_busca_uma_linha_a_mais():
+    query = enforce_limit('SELECT name FROM clients LIMIT 1000000;', 50)
+
+    assert query == (
+        'SELECT * FROM (SELECT name FROM clients LIMIT 1000000) '
+        'AS llm_query LIMIT 51'
+    )
+
+
+def test_enforce_limit_recusa_multiplos_comandos():
+    with pytest.raises(UnsafeQueryError):
+        enforce_limit('SELECT 1; DROP TABLE clients', 10)
+
+
+def test_enforce_limit_recusa_comando_que_nao_e_select():
+    with pytest.raises(UnsafeQueryError):
+        enforce_limit('DELETE FROM clients', 10)
+
+
+def test_summarize_rows_respeita_limite_de_caracteres():
+    rows = [(i, 'x' * 20) for i in range(100)]
+
+    result = summarize_rows(['id', 'name'], rows, max_chars=200)
+
+    assert len(result) < 260  # noqa: PLR2004
+    assert result.splitlines()[0] == 'id | name'
+    assert 'resultado truncado' in result